@@ -0,0 +1,141 @@
+"""add search_documents unified search index
+
+Revision ID: a7c3e9f1b2d4
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+One row per searchable entity (accounts, tickets, contacts, wiki articles,
+assets, projects, milestones, products) so global search runs one indexed
+query instead of eight. Rows are kept current by the ORM flush hook in
+app/services/search_index.py; this migration backfills them with plain SQL
+(mirroring the document builders there) so search works straight after the
+upgrade. ``python scripts/rebuild_search_index.py`` rebuilds from the ORM.
+
+``search_vector`` is filled by a trigger from title + identifier (weight A)
+and body (weight B) using the 'simple' configuration — names, ticket numbers
+and identifiers must not be stemmed.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1b2d4'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL = [
+    # client
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, link, account_id, brand_affinity, staff_only)
+    SELECT 'client', a.id::text, COALESCE(a.name, ''), a.type, '/clients/' || a.id, a.id, a.brand_affinity, false
+    FROM accounts a
+    """,
+    # ticket
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, body, identifier, link, account_id, staff_only)
+    SELECT 'ticket', t.id::text, COALESCE(t.subject, ''), t.status,
+           NULLIF(CONCAT_WS(' ', t.description, t.resolution), ''), t.id::text,
+           '/tickets/' || t.id, t.account_id, false
+    FROM tickets t
+    """,
+    # contact
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, body, link, account_id, staff_only)
+    SELECT 'contact', c.id::text, CONCAT(c.first_name, ' ', c.last_name), c.email, c.email,
+           '/clients/' || COALESCE(c.account_id::text, 'None'), c.account_id, true
+    FROM contacts c
+    """,
+    # wiki
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, body, identifier, link, staff_only)
+    SELECT 'wiki', w.id::text, COALESCE(w.title, ''), w.identifier, w.content, w.identifier,
+           '/wiki/' || COALESCE(w.slug, 'None'), true
+    FROM articles w
+    """,
+    # asset
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, body, link, account_id, staff_only)
+    SELECT 'asset', a.id::text, COALESCE(a.name, ''), COALESCE(a.ip_address, a.asset_type),
+           NULLIF(CONCAT_WS(' ', a.ip_address, a.serial_number), ''), '/assets/' || a.id, a.account_id, true
+    FROM assets a
+    """,
+    # project
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, link, account_id, staff_only)
+    SELECT 'project', p.id::text, COALESCE(p.name, ''), p.status, '/projects/' || p.id, p.account_id, false
+    FROM projects p
+    WHERE p.is_deleted IS NOT TRUE
+    """,
+    # milestone
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, link, account_id, staff_only)
+    SELECT 'milestone', m.id::text, COALESCE(m.name, ''), m.status, '/projects/' || m.project_id, p.account_id, false
+    FROM milestones m JOIN projects p ON p.id = m.project_id
+    WHERE m.is_deleted IS NOT TRUE AND p.is_deleted IS NOT TRUE
+    """,
+    # product
+    """
+    INSERT INTO search_documents (entity_type, entity_id, title, subtitle, body, link, staff_only)
+    SELECT 'product', p.id::text, COALESCE(p.name, ''), p.type, p.description, '/catalog/' || p.id, true
+    FROM products p
+    WHERE p.is_active IS NOT FALSE
+    """,
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_table(
+        'search_documents',
+        sa.Column('entity_type', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.String(length=64), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('subtitle', sa.String(), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('identifier', sa.String(length=64), nullable=True),
+        sa.Column('link', sa.String(), nullable=False),
+        sa.Column('account_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('brand_affinity', sa.String(length=8), nullable=True),
+        sa.Column('staff_only', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('entity_type', 'entity_id'),
+    )
+    op.create_index('ix_search_documents_account', 'search_documents', ['account_id'])
+    op.create_index('ix_search_documents_vector', 'search_documents', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_trgm_search_documents_title', 'search_documents', ['title'],
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_trgm_search_documents_body', 'search_documents', ['body'],
+                    postgresql_using='gin', postgresql_ops={'body': 'gin_trgm_ops'})
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_documents_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', COALESCE(NEW.title, '') || ' ' || COALESCE(NEW.identifier, '')), 'A') ||
+                setweight(to_tsvector('simple', COALESCE(NEW.body, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER search_documents_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, identifier, body ON search_documents
+        FOR EACH ROW EXECUTE FUNCTION search_documents_vector_update()
+    """)
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS search_documents_vector_trigger ON search_documents')
+    op.execute('DROP FUNCTION IF EXISTS search_documents_vector_update()')
+    op.drop_index('ix_trgm_search_documents_body', table_name='search_documents')
+    op.drop_index('ix_trgm_search_documents_title', table_name='search_documents')
+    op.drop_index('ix_search_documents_vector', table_name='search_documents')
+    op.drop_index('ix_search_documents_account', table_name='search_documents')
+    op.drop_table('search_documents')
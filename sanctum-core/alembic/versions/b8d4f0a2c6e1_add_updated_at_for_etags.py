@@ -0,0 +1,37 @@
+"""add updated_at to tables behind detail ETags
+
+Revision ID: b8d4f0a2c6e1
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-17
+
+Ticket, project and article detail responses carry ETags built from
+updated_at high-water marks (app/services/etag.py). These tables feed those
+responses but had no updated_at, so edits to them would not change the tag.
+Existing rows stay NULL; the version queries fall back to created_at.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f0a2c6e1'
+down_revision: Union[str, None] = 'a7c3e9f1b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    'projects', 'milestones', 'comments', 'contacts',
+    'ticket_time_entries', 'ticket_materials', 'invoices',
+)
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
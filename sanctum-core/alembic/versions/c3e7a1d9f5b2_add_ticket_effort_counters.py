@@ -0,0 +1,45 @@
+"""add denormalised effort counters to tickets
+
+Revision ID: c3e7a1d9f5b2
+Revises: b8d4f0a2c6e1
+Create Date: 2026-10-17
+
+comment_count, time_entry_count, material_count and total_minutes mirror the
+ticket's child rows (maintained by app/services/ticket_counters.py) so lists
+and summaries stop counting or loading them. Backfilled here; re-check later
+with scripts/ticket_counters.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a1d9f5b2'
+down_revision: Union[str, None] = 'b8d4f0a2c6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('comment_count', 'time_entry_count', 'material_count', 'total_minutes')
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.add_column('tickets', sa.Column(column, sa.Integer(), nullable=False, server_default=sa.text('0')))
+
+    op.execute("""
+        UPDATE tickets t SET
+            comment_count = (SELECT count(*) FROM comments c WHERE c.ticket_id = t.id),
+            time_entry_count = (SELECT count(*) FROM ticket_time_entries e WHERE e.ticket_id = t.id),
+            material_count = (SELECT count(*) FROM ticket_materials m WHERE m.ticket_id = t.id),
+            total_minutes = (
+                SELECT COALESCE(SUM(CAST(TRUNC(EXTRACT(EPOCH FROM (e.end_time - e.start_time)) / 60) AS INTEGER)), 0)
+                FROM ticket_time_entries e WHERE e.ticket_id = t.id
+            )
+    """)
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.drop_column('tickets', column)
@@ -1,20 +1,27 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from .database import get_async_db
 from . import models
 from .principals import (
     Principal,
     ServicePrincipal,
+    UserSnapshot,
     principal_audit_label,
     principal_type_of,
     service_principal_from_claims,
 )
 from datetime import datetime, timedelta, timezone  # Added timezone
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import hashlib
 import os
+from .utils.ttl_cache import TTLCache
+from .services.token_usage import token_usage_buffer
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,6 +34,74 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 720
 # Hashing Context (retained for API token verification)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified-PAT cache: sha256(raw token) -> (token_id, token_hash, user_id). A hit lets
+# _resolve_principal skip bcrypt; the prefix lookup still runs, so a token
+# revoked or deleted by another worker stops resolving immediately.
+API_TOKEN_CACHE_SIZE = int(os.getenv("API_TOKEN_CACHE_SIZE", "1024"))
+API_TOKEN_CACHE_TTL = int(os.getenv("API_TOKEN_CACHE_TTL", "300"))
+verified_token_cache = TTLCache("api_tokens.verified", maxsize=API_TOKEN_CACHE_SIZE, ttl=API_TOKEN_CACHE_TTL)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _verify_api_token(token: str, api_token) -> bool:
+    """bcrypt-verify ``token`` against ``api_token``, memoising successes."""
+    digest = _token_digest(token)
+    cached = verified_token_cache.get(digest)
+    if cached is not None and cached[:2] == (api_token.id, api_token.token_hash):
+        return True
+    if not pwd_context.verify(token, api_token.token_hash):
+        return False
+    ttl = None
+    if api_token.expires_at:
+        # Never let a cache entry outlive the token itself.
+        ttl = (api_token.expires_at - datetime.now(timezone.utc)).total_seconds()
+    if ttl is None or ttl > 0:
+        verified_token_cache.set(digest, (api_token.id, api_token.token_hash, api_token.user_id), ttl=ttl)
+    return True
+
+
+def invalidate_api_token(token_id=None, user_id=None) -> int:
+    """Evict cached verifications for a revoked token or a deleted user's tokens."""
+    if token_id is None and user_id is None:
+        return 0
+    token_id = str(token_id) if token_id is not None else None
+    user_id = str(user_id) if user_id is not None else None
+    return verified_token_cache.discard_where(
+        lambda _k, v: (token_id is not None and str(v[0]) == token_id)
+        or (user_id is not None and str(v[2]) == user_id)
+    )
+
+
+# JWT principal cache: ("hs256", email) / ("rs256", sub-or-email) -> UserSnapshot.
+# Signature and expiry are still checked on every request; a hit only skips
+# the users-table lookup. Entries never outlive the presenting token's exp.
+# Admin user edits / deletes call invalidate_principal().
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "2048"))
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+principal_cache = TTLCache("auth.principals", maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+
+def _remember_principal(key: tuple, user, exp) -> None:
+    ttl = None
+    if exp is not None:
+        try:
+            ttl = float(exp) - datetime.now(timezone.utc).timestamp()
+        except (TypeError, ValueError):
+            return
+        if ttl <= 0:
+            return
+    principal_cache.set(key, UserSnapshot.from_user(user), ttl=ttl)
+
+
+def invalidate_principal(user_id) -> int:
+    """Evict cached JWT principals for ``user_id`` after an admin edit or delete."""
+    user_id = str(user_id)
+    return principal_cache.discard_where(lambda _k, v: str(v.id) == user_id)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -41,8 +116,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 http_bearer = HTTPBearer()
 
+# Principal resolution accepts either session flavour so sync callers (worker,
+# tests, not-yet-migrated code) and the async request path share one decoder.
+AnySession = Union[Session, AsyncSession]
+
 
-async def _resolve_principal(token: str, db: Session) -> Principal:
+async def _first(db: AnySession, model, *criteria, options=()):
+    """Return the first ``model`` row matching ``criteria`` on a sync or async session.
+
+    ``options`` only apply on the async path, where relationships the caller
+    touches afterwards must be loaded up front (no lazy loads without a
+    greenlet). The sync path keeps the plain ``query().filter().first()`` chain.
+    """
+    if isinstance(db, AsyncSession):
+        result = await db.execute(select(model).options(*options).filter(*criteria).limit(1))
+        return result.scalars().first()
+    return db.query(model).filter(*criteria).first()
+
+
+def _as_uuid(value) -> Optional[UUID]:
+    try:
+        return value if isinstance(value, UUID) else UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _resolve_principal(token: str, db: AnySession) -> Principal:
     """Resolve a Bearer token to a ``User`` or a ``ServicePrincipal``.
 
     Principal-type dispatch lives here so ``get_current_principal`` and the
@@ -59,22 +158,25 @@ async def _resolve_principal(token: str, db: Session) -> Principal:
     # API Token path (Personal Access Tokens) — untouched (#2793 non-negotiable).
     if token.startswith("sntm_"):
         prefix = token[:12]
-        api_token = db.query(models.ApiToken).filter(
+        api_token = await _first(
+            db, models.ApiToken,
             models.ApiToken.token_prefix == prefix,
-            models.ApiToken.is_active == True
-        ).first()
+            models.ApiToken.is_active == True,
+            options=(selectinload(models.ApiToken.user),),
+        )
         if not api_token:
             raise credentials_exception
-        if not pwd_context.verify(token, api_token.token_hash):
+        if not _verify_api_token(token, api_token):
             raise credentials_exception
         if api_token.expires_at and api_token.expires_at < datetime.now(timezone.utc):
+            invalidate_api_token(token_id=api_token.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="API token has expired",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        api_token.last_used_at = datetime.now(timezone.utc)
-        db.commit()
+        # Write-behind: no per-request write transaction for bookkeeping.
+        token_usage_buffer.record(api_token.id)
         return api_token.user
 
     # JWT path — detect algorithm from token header
@@ -119,16 +221,22 @@ async def _resolve_principal(token: str, db: Session) -> Principal:
         except Exception:
             raise credentials_exception
 
-        sub = claims.get("sub")
+        cache_key = ("rs256", claims.get("sub") or claims.get("email"))
+        cached = principal_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        sub = _as_uuid(claims.get("sub"))
         user = None
         if sub:
-            user = db.query(models.User).filter(models.User.id == sub).first()
+            user = await _first(db, models.User, models.User.id == sub)
         if not user:
             email = claims.get("email")
             if email:
-                user = db.query(models.User).filter(models.User.email == email).first()
+                user = await _first(db, models.User, models.User.email == email)
         if user is None:
             raise credentials_exception
+        _remember_principal(cache_key, user, claims.get("exp"))
         return user
 
     # HS256 path (existing Core JWT) — untouched (#2793 non-negotiable).
@@ -140,28 +248,39 @@ async def _resolve_principal(token: str, db: Session) -> Principal:
     except JWTError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    cache_key = ("hs256", email)
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    user = await _first(db, models.User, models.User.email == email)
     if user is None:
         raise credentials_exception
+    _remember_principal(cache_key, user, payload.get("exp"))
     return user
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Principal:
     """Resolve the Bearer token to a ``User`` or ``ServicePrincipal``.
 
     Existing handlers use ``get_current_active_user`` which continues to
     return ``User`` (raising 403 for service principals), so the return-type
     widening here is strictly additive for opt-in callers.
+
+    Resolution runs on the async session so token lookups never block the
+    event loop. The returned ``User`` is detached from the handler's sync
+    ``get_db`` session — re-load it there before mutating it. JWT callers
+    served from the principal cache get a read-only ``UserSnapshot``.
     """
     return await _resolve_principal(credentials.credentials, db)
 
 
 async def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Principal:
     """Opt-in dependency for routes that accept either a user or an M2M service
     principal. Identical resolution to :func:`get_current_user`; exists as a
@@ -239,10 +358,13 @@ def require_scope(*required: str) -> Callable:
 __all__ = [
     "Principal",
     "ServicePrincipal",
+    "UserSnapshot",
     "create_access_token",
     "get_current_active_user",
     "get_current_principal",
     "get_current_user",
+    "invalidate_api_token",
+    "invalidate_principal",
     "principal_audit_label",
     "principal_type_of",
     "require_scope",
@@ -1,8 +1,13 @@
+import asyncio
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base # Updated Import
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 import os
 from dotenv import load_dotenv
+from .db_pool import PoolSettings
+from .db_replica import REPLICA_URL, ReplicaRouter
 
 # 1. Load the secrets
 load_dotenv()
@@ -11,7 +16,10 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
 # 2. Create the Engine
 # check_same_thread=False is needed only for SQLite. Postgres handles threading natively.
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pool sizing / pre-ping / recycle / statement_timeout come from DB_POOL_* env
+# vars — see app/db_pool.py. SQLite keeps SQLAlchemy's default pool.
+pool_settings = PoolSettings.from_env()
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_settings.engine_kwargs(SQLALCHEMY_DATABASE_URL))
 
 # 3. Create the Session Local
 # Each request will get its own database session.
@@ -28,3 +36,126 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 6. Async Engine (runs side by side with the sync engine above)
+# `async def` dependencies (auth, soft-auth) and migrated read routers use
+# get_async_db so their queries no longer block the event loop. Routers move
+# over one at a time; everything else keeps using get_db.
+def async_database_url(url: str | None) -> str | None:
+    """Map a sync DATABASE_URL onto its async driver (asyncpg / aiosqlite).
+
+    ASYNC_DATABASE_URL, when set, wins outright.
+    """
+    override = os.getenv("ASYNC_DATABASE_URL")
+    if override:
+        return override
+    if not url:
+        return url
+    scheme, sep, rest = url.partition("://")
+    driverless = scheme.split("+", 1)[0]
+    if driverless in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if driverless == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Built on first use so processes that never touch the async path (worker,
+# seeders, alembic) don't need the async driver installed.
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_SQLALCHEMY_DATABASE_URL,
+            **pool_settings.engine_kwargs(ASYNC_SQLALCHEMY_DATABASE_URL, async_engine=True),
+        )
+    return _async_engine
+
+
+def get_async_engine_if_created() -> AsyncEngine | None:
+    """The async engine if something has already built it (no side effects)."""
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Async counterpart of SessionLocal.
+
+    expire_on_commit=False: principals loaded here outlive the session and are
+    read by handlers after it closes — expired attributes would try to lazy
+    load without a greenlet and raise.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False,
+        )
+    return _async_session_factory()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# 7. Read replica (optional) — see app/db_replica.py
+# GET handlers for heavy read-only workloads depend on get_read_db /
+# get_async_read_db. Without DATABASE_REPLICA_URL both are the primary.
+replica_engine = (
+    create_engine(REPLICA_URL, **pool_settings.engine_kwargs(REPLICA_URL, engine_name="replica"))
+    if REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
+replica_router = ReplicaRouter(replica_engine)
+
+ASYNC_REPLICA_URL = async_database_url(REPLICA_URL) if REPLICA_URL else None
+_async_replica_session_factory: async_sessionmaker | None = None
+
+
+def _async_replica_session() -> AsyncSession:
+    global _async_replica_session_factory
+    if _async_replica_session_factory is None:
+        _async_replica_session_factory = async_sessionmaker(
+            bind=create_async_engine(
+                ASYNC_REPLICA_URL,
+                **pool_settings.engine_kwargs(ASYNC_REPLICA_URL, async_engine=True,
+                                              engine_name="async_replica"),
+            ),
+            autoflush=False, expire_on_commit=False,
+        )
+    return _async_replica_session_factory()
+
+
+def get_read_db(request: Request):
+    """Session for read-only handlers: the replica when it is safe, else the primary."""
+    target, _ = replica_router.choose(request.headers)
+    db = ReplicaSessionLocal() if target == "replica" else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db. The lag probe runs off the event loop."""
+    lag = None
+    if replica_router.configured and replica_router.lag_is_stale():
+        lag = await asyncio.to_thread(replica_router.refresh_lag)
+    target, _ = replica_router.choose(request.headers, lag=lag)
+    db = _async_replica_session() if target == "replica" else AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,299 @@
+"""Connection-pool configuration and instrumentation for the core engine.
+
+Pool sizing used to be whatever ``create_engine`` defaulted to, which gave no
+way to tune for bursty MCP traffic and no visibility into checkout waits when
+the pool ran dry. This module keeps both concerns out of ``app.database``:
+
+* :class:`PoolSettings` reads the ``DB_POOL_*`` / ``DB_STATEMENT_TIMEOUT_MS``
+  environment variables and turns them into ``create_engine`` kwargs.
+* :class:`InstrumentedQueuePool` (and :class:`InstrumentedAsyncQueuePool` for
+  ``create_async_engine``) time every checkout and count pool timeouts into
+  a :class:`PoolMetrics` instance. Each engine gets its own instance, keyed
+  by engine name, so the primary, async and replica pools never share
+  counters.
+
+SQLite (used by the test suite) keeps SQLAlchemy's default pool — its
+single-threaded pool classes do not accept overflow / timeout arguments.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkout-wait histogram bucket upper bounds, in milliseconds.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Timeouts older than this no longer count towards ``timeouts_recent``.
+RECENT_WINDOW_S = 300
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Engine pool settings resolved from the environment.
+
+    ``statement_timeout_ms`` of ``0`` leaves Postgres' server default in place.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_timeout_ms: int = 0
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            pool_size=_env_int("DB_POOL_SIZE", cls.pool_size),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", cls.pool_timeout),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", cls.statement_timeout_ms),
+        )
+
+    def engine_kwargs(self, url: str | None, *, async_engine: bool = False,
+                      engine_name: str | None = None) -> dict:
+        """Return ``create_engine`` kwargs appropriate for ``url``'s dialect.
+
+        ``engine_name`` selects the :class:`PoolMetrics` the pool reports into
+        (default ``"async"`` or ``"sync"``). ``async_engine=True`` targets
+        ``create_async_engine``: the pool is the async-adapted variant and
+        asyncpg takes ``statement_timeout`` via ``server_settings`` rather
+        than a libpq ``options`` string.
+        """
+        if not url or url.startswith("sqlite"):
+            return {}
+
+        kwargs = {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "poolclass": instrumented_pool_class(
+                engine_name or ("async" if async_engine else "sync"), async_engine=async_engine,
+            ),
+        }
+        if self.statement_timeout_ms > 0 and url.startswith("postgresql"):
+            if async_engine:
+                kwargs["connect_args"] = {
+                    "server_settings": {"statement_timeout": str(self.statement_timeout_ms)},
+                }
+            else:
+                # libpq startup option — applied to every session on connect.
+                kwargs["connect_args"] = {
+                    "options": f"-c statement_timeout={self.statement_timeout_ms}",
+                }
+        return kwargs
+
+
+class PoolMetrics:
+    """Thread-safe counters for pool checkouts, waits and timeouts."""
+
+    def __init__(self, buckets_ms: tuple[int, ...] = WAIT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets_ms = buckets_ms
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+            self._timeout_times: deque[float] = deque()
+            # One slot per bucket plus the +Inf overflow slot (non-cumulative).
+            self._bucket_counts = [0] * (len(self.buckets_ms) + 1)
+
+    def _record_wait(self, wait_ms: float) -> None:
+        # Caller holds the lock.
+        self.wait_count += 1
+        self.wait_sum_ms += wait_ms
+        if wait_ms > self.wait_max_ms:
+            self.wait_max_ms = wait_ms
+        for i, bound in enumerate(self.buckets_ms):
+            if wait_ms <= bound:
+                self._bucket_counts[i] += 1
+                return
+        self._bucket_counts[-1] += 1
+
+    def observe_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._record_wait(wait_ms)
+
+    def observe_timeout(self, wait_ms: float) -> None:
+        # A timed-out checkout still waited — record it so the tail is visible.
+        with self._lock:
+            self.timeouts += 1
+            self._timeout_times.append(time.monotonic())
+            self._record_wait(wait_ms)
+
+    def recent_timeouts(self, window_s: float = RECENT_WINDOW_S) -> int:
+        """Timeouts in the last ``window_s`` seconds (older ones are dropped)."""
+        cutoff = time.monotonic() - window_s
+        with self._lock:
+            while self._timeout_times and self._timeout_times[0] < cutoff:
+                self._timeout_times.popleft()
+            return len(self._timeout_times)
+
+    def wait_histogram(self) -> dict[str, int]:
+        """Cumulative histogram keyed by bucket label (``"le_10ms"``, ``"le_inf"``)."""
+        with self._lock:
+            counts = list(self._bucket_counts)
+        histogram: dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.buckets_ms, counts):
+            running += count
+            histogram[f"le_{bound}ms"] = running
+        histogram["le_inf"] = running + counts[-1]
+        return histogram
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            checkouts = self.checkouts
+            timeouts = self.timeouts
+            wait_count = self.wait_count
+            wait_sum_ms = self.wait_sum_ms
+            wait_max_ms = self.wait_max_ms
+        return {
+            "checkouts_total": checkouts,
+            "timeouts_total": timeouts,
+            "timeouts_recent": self.recent_timeouts(),
+            "recent_window_s": RECENT_WINDOW_S,
+            "wait_ms": {
+                "count": wait_count,
+                "sum": round(wait_sum_ms, 3),
+                "max": round(wait_max_ms, 3),
+                "avg": round(wait_sum_ms / wait_count, 3) if wait_count else 0.0,
+                "histogram": self.wait_histogram(),
+            },
+        }
+
+
+_engine_metrics: dict[str, PoolMetrics] = {}
+_engine_metrics_lock = threading.Lock()
+
+
+def metrics_for(engine_name: str) -> PoolMetrics:
+    """The :class:`PoolMetrics` for ``engine_name``, created on first use."""
+    with _engine_metrics_lock:
+        metrics = _engine_metrics.get(engine_name)
+        if metrics is None:
+            metrics = _engine_metrics[engine_name] = PoolMetrics()
+        return metrics
+
+
+def engine_metrics() -> dict[str, PoolMetrics]:
+    """Every registered engine's metrics, keyed by engine name."""
+    with _engine_metrics_lock:
+        return dict(_engine_metrics)
+
+
+# The primary sync engine's metrics.
+pool_metrics = metrics_for("sync")
+
+
+class _InstrumentedPool:
+    """Checkout timing shared by the sync and async pool classes.
+
+    ``metrics`` is bound per engine by :func:`instrumented_pool_class`.
+    """
+
+    metrics: PoolMetrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout((time.perf_counter() - start) * 1000)
+            raise
+        self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """``QueuePool`` that records checkout wait time and timeouts.
+
+    Reports into :data:`pool_metrics` (the primary sync engine); other
+    engines use the subclasses built by :func:`instrumented_pool_class`.
+    """
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` counterpart of :class:`InstrumentedQueuePool`."""
+
+
+_pool_classes: dict[tuple[str, bool], type] = {
+    ("sync", False): InstrumentedQueuePool,
+}
+
+
+def instrumented_pool_class(engine_name: str, *, async_engine: bool = False) -> type:
+    """Pool class whose instances report into ``metrics_for(engine_name)``."""
+    key = (engine_name, async_engine)
+    with _engine_metrics_lock:
+        cls = _pool_classes.get(key)
+    if cls is None:
+        base = InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool
+        cls = type(f"{base.__name__}_{engine_name}", (base,), {"metrics": metrics_for(engine_name)})
+        with _engine_metrics_lock:
+            cls = _pool_classes.setdefault(key, cls)
+    return cls
+
+
+def pool_status(engine) -> dict:
+    """Live pool gauges plus wait/timeout metrics for ``engine``.
+
+    The metrics are those of the engine's own instrumented pool; pools that
+    are not instrumented (SQLite) report zeros.
+    """
+    pool = engine.pool
+    report = {
+        "pool_class": type(pool).__name__,
+        "size": None,
+        "checked_out": None,
+        "checked_in": None,
+        "overflow": None,
+        "max_overflow": None,
+        "timeout_s": None,
+    }
+    if isinstance(pool, QueuePool):
+        report.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    metrics = pool.metrics if isinstance(pool, _InstrumentedPool) else PoolMetrics()
+    report.update(metrics.snapshot())
+    return report
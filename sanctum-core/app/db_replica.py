@@ -0,0 +1,186 @@
+"""Read-replica routing for read-only endpoints.
+
+Every session used to bind to the primary, so analytics, search, workbench
+and MCP telemetry reads competed with ticket writes. When
+``DATABASE_REPLICA_URL`` is set, ``app.database`` builds a second engine and
+the ``get_read_db`` / ``get_async_read_db`` dependencies hand GET handlers a
+session on it. They fall back to the primary when:
+
+* no replica is configured;
+* the request asks for it — ``X-Read-Your-Writes: 1`` — or the same caller
+  (keyed by a digest of its ``Authorization`` header) made a write within the
+  last ``DATABASE_REPLICA_STICKY_SECONDS``, so a client never reads a replica
+  that hasn't replayed its own change yet;
+* the replica is lagging more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` or the
+  lag probe fails.
+
+The lag probe is one query, cached for ``DATABASE_REPLICA_LAG_CHECK_SECONDS``
+so routing costs nothing per request. Non-Postgres replicas (SQLite in tests)
+report zero lag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from . import metrics
+from .utils.ttl_cache import TTLCache
+
+log = logging.getLogger("sanctum.db")
+
+REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "10"))
+LAG_CHECK_SECONDS = float(os.getenv("DATABASE_REPLICA_LAG_CHECK_SECONDS", "5"))
+STICKY_SECONDS = int(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+# Replica replay lag in seconds. A standby that has replayed everything it
+# received reports 0 even if the primary has been idle (replay timestamp is old).
+# Not a standby (NULL) also reports 0.
+_PG_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+read_routing_total = metrics.counter(
+    "sanctum_db_read_routing_total",
+    "Read-only sessions by target database and routing reason.",
+    ("target", "reason"),
+)
+
+
+def caller_key(authorization: Optional[str]) -> Optional[str]:
+    """Stable, non-reversible key for the caller behind an Authorization header."""
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+class ReplicaRouter:
+    """Decides per request whether a read-only session may use the replica."""
+
+    def __init__(self, engine=None, max_lag_seconds: float = MAX_LAG_SECONDS,
+                 lag_check_seconds: float = LAG_CHECK_SECONDS,
+                 sticky_seconds: int = STICKY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self.recent_writers = TTLCache("db.read_your_writes", maxsize=10_000,
+                                       ttl=sticky_seconds, clock=clock)
+
+    @property
+    def configured(self) -> bool:
+        return self.engine is not None
+
+    # -- lag -------------------------------------------------------------------
+
+    def _probe(self) -> Optional[float]:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with self.engine.connect() as conn:
+                return float(conn.execute(_PG_LAG_SQL).scalar() or 0)
+        except Exception as e:
+            log.warning("replica lag probe failed: %s", e)
+            return None
+
+    def lag_is_stale(self) -> bool:
+        return self._checked_at is None or self._clock() - self._checked_at >= self.lag_check_seconds
+
+    def refresh_lag(self) -> Optional[float]:
+        """Re-probe replica lag (blocking). ``None`` means the replica is unreachable."""
+        lag = self._probe()
+        with self._lock:
+            self._lag = lag
+            self._checked_at = self._clock()
+        return lag
+
+    def lag_seconds(self) -> Optional[float]:
+        if self.lag_is_stale():
+            return self.refresh_lag()
+        return self._lag
+
+    # -- read-your-writes ------------------------------------------------------
+
+    def record_write(self, key: Optional[str]) -> None:
+        if key and self.recent_writers.enabled:
+            self.recent_writers.set(key, True)
+
+    def wrote_recently(self, key: Optional[str]) -> bool:
+        return bool(key) and self.recent_writers.get(key) is not None
+
+    # -- routing ---------------------------------------------------------------
+
+    def choose(self, headers, lag: Optional[float] = None) -> tuple[str, str]:
+        """Return ``(target, reason)`` for a request with ``headers``.
+
+        ``lag`` lets async callers pass a value they refreshed off the event
+        loop; otherwise the cached probe is used (and refreshed if stale).
+        """
+        if not self.configured:
+            target, reason = "primary", "no_replica"
+        elif headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes"):
+            target, reason = "primary", "requested"
+        elif self.wrote_recently(caller_key(headers.get("authorization"))):
+            target, reason = "primary", "recent_write"
+        else:
+            lag = self.lag_seconds() if lag is None else lag
+            if lag is None:
+                target, reason = "primary", "replica_unavailable"
+            elif lag > self.max_lag_seconds:
+                target, reason = "primary", "replica_lagging"
+            else:
+                target, reason = "replica", "ok"
+        read_routing_total.inc(target=target, reason=reason)
+        return target, reason
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.configured,
+            "lag_seconds": self._lag,
+            "max_lag_seconds": self.max_lag_seconds,
+            "sticky_callers": len(self.recent_writers),
+        }
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware: remember callers that just made a successful write.
+
+    Installed only when a replica is configured. Subsequent GETs from the same
+    caller read the primary for ``DATABASE_REPLICA_STICKY_SECONDS``.
+    """
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") not in _UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                auth = dict(scope.get("headers") or ()).get(b"authorization")
+                self.router.record_write(caller_key(auth.decode("latin-1") if auth else None))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
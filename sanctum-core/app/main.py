@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,15 +8,50 @@ from .cors import CORS_ORIGIN_REGEX
 # UPDATED IMPORTS: Added 'analytics'
 from .routers import auth, system, tickets, crm, invoices, projects, campaigns, wiki, portal, comments, admin, search, sentinel, assets, automations, timesheets, analytics, notifications, vendors, ingest, api_tokens, templates, artefacts, mcp_telemetry, sso, workbench
 
-app = FastAPI(title="Sanctum Core", version="1.9.1", root_path=os.getenv("ROOT_PATH", ""))
+from .services.token_usage import token_usage_buffer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Write-behind flush of ApiToken.last_used_at (see services/token_usage.py)
+    flusher = asyncio.create_task(token_usage_buffer.run())
+    try:
+        yield
+    finally:
+        flusher.cancel()
+        await asyncio.to_thread(token_usage_buffer.flush)
+
+
+app = FastAPI(title="Sanctum Core", version="1.9.1", root_path=os.getenv("ROOT_PATH", ""), lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+# Opt-in per-request DB statement counting (X-DB-Queries / X-DB-Time-Ms)
+from .query_stats import QUERY_STATS_ENABLED, QueryStatsMiddleware, install_query_hooks
+if QUERY_STATS_ENABLED:
+    install_query_hooks()
+    app.add_middleware(QueryStatsMiddleware)
+
+# Prometheus metrics (GET /metrics) — per-route counts, latency, in-flight
+from .metrics import METRICS_ENABLED, MetricsMiddleware, register_runtime_collectors
+if METRICS_ENABLED:
+    register_runtime_collectors()
+    app.add_middleware(MetricsMiddleware)
+
+# Read replica: callers that just wrote read the primary for a few seconds
+from .database import replica_router
+from .db_replica import ReadYourWritesMiddleware
+if replica_router.configured:
+    app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let cross-origin callers read headers listed here
+    # (cursor pagination reads X-Next-Cursor / X-Total-Count*).
+    expose_headers=["X-Search-Partial", "ETag", "X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated"],
 )
 
 # REGISTER ROUTERS
@@ -58,6 +95,18 @@ from .services.workbench_subscriber import handle_workbench_ticket_event
 event_bus.subscribe("ticket_status_change", handle_workbench_ticket_event)
 event_bus.subscribe("ticket_comment", handle_workbench_ticket_event)
 
+# SEARCH INDEX — keep search_documents in step with every ORM flush
+from .services import search_index
+search_index.install()
+
+# TICKET COUNTERS — comment / time / material totals maintained on every flush
+from .services import ticket_counters
+ticket_counters.install()
+
+# TICKET DETAIL CACHE — commits invalidate the tickets they touch
+from .services import ticket_cache
+ticket_cache.install()
+
 # ROOT HEALTH CHECK
 @app.get("/")
 def read_root():
@@ -0,0 +1,389 @@
+"""Prometheus text-format metrics for Core (no client library required).
+
+Core already exposes ``/health``, ``/system/health`` and ``/system/pool`` as
+JSON, but nothing a scraper can graph over time. This module keeps a small
+in-process registry of counters, gauges and histograms, a pure ASGI
+:class:`MetricsMiddleware` that records per-route HTTP traffic, and
+:func:`render` which produces the ``text/plain; version=0.0.4`` exposition
+served at ``GET /metrics``.
+
+Label cardinality is bounded: HTTP series are labelled with the matched
+route *template* (``/tickets/{ticket_id}``), never the raw path; requests
+that match no route share the ``<unmatched>`` label.
+
+Starlette runs ``BackgroundTasks`` after the response body is sent but inside
+the same ASGI call, so the middleware stops the latency clock at the final
+body message and attributes the remainder to
+``sanctum_http_background_seconds``.
+
+Metrics are per process — with several uvicorn workers each worker reports
+its own series (scrape each worker, or aggregate with ``sum by``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[n] for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter. Pass ``callback`` to read a running total kept
+    elsewhere at scrape time (same return shapes as :class:`Gauge`).
+    """
+
+    kind = "counter"
+
+    def __init__(self, *args, callback: Optional[Callable] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        if self._callback is not None:
+            current = self._callback()
+            items = sorted(current.items()) if isinstance(current, dict) else [((), current)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Settable gauge. Pass ``callback`` for a gauge read at scrape time.
+
+    A callback returns either a number (unlabelled gauge) or a mapping of
+    label-value tuples to numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        if self._callback is not None:
+            current = self._callback()
+            items = sorted(current.items()) if isinstance(current, dict) else [((), current)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items if v is not None
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last, non-cumulative), sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total, n) in items:
+            running = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                running += c
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {running}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def has(self, name: str) -> bool:
+        with self._lock:
+            return name in self._metrics
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception:
+                # A broken scrape-time callback must not take down /metrics.
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = (),
+            callback: Optional[Callable] = None) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames, callback=callback))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = (),
+          callback: Optional[Callable] = None) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames, callback=callback))
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (),
+              buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+
+def render() -> str:
+    return registry.render()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+http_requests_total = counter(
+    "sanctum_http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+http_request_duration = histogram(
+    "sanctum_http_request_duration_seconds", "Time to send the full HTTP response.",
+    ("method", "route"),
+)
+http_requests_in_flight = gauge(
+    "sanctum_http_requests_in_flight", "HTTP requests currently being handled.",
+)
+http_background_duration = histogram(
+    "sanctum_http_background_seconds",
+    "Time spent in BackgroundTasks after the response was sent.",
+    ("method", "route"),
+)
+
+# ---------------------------------------------------------------------------
+# Background work outside the request cycle
+# ---------------------------------------------------------------------------
+
+background_task_duration = histogram(
+    "sanctum_background_task_duration_seconds", "Duration of background jobs by task.",
+    ("task",),
+)
+background_task_failures = counter(
+    "sanctum_background_task_failures_total", "Background jobs that raised, by task.",
+    ("task",),
+)
+
+
+class track_task:
+    """Context manager timing one background job into the task metrics."""
+
+    def __init__(self, task: str):
+        self.task = task
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        background_task_duration.observe(time.perf_counter() - self._start, task=self.task)
+        if exc_type is not None:
+            background_task_failures.inc(task=self.task)
+        return False
+
+
+def register_runtime_collectors() -> None:
+    """Register scrape-time gauges for the DB pools, event bus and write-behind buffer.
+
+    Called once from ``app.main``; imports are deferred so this module stays
+    importable without a configured database. Idempotent.
+    """
+    if registry.has("sanctum_db_pool_connections"):
+        return
+    from .database import engine, get_async_engine_if_created, replica_engine, replica_router
+    from .db_pool import engine_metrics, pool_status
+    from .services.event_bus import event_bus
+    from .services.token_usage import token_usage_buffer
+
+    def _pools():
+        engines = {"sync": engine}
+        async_engine = get_async_engine_if_created()
+        if async_engine is not None:
+            engines["async"] = async_engine.sync_engine
+        if replica_engine is not None:
+            engines["replica"] = replica_engine
+        values = {}
+        for name, eng in engines.items():
+            status = pool_status(eng)
+            for state in ("size", "checked_out", "checked_in", "overflow"):
+                if status[state] is not None:
+                    values[(name, state)] = status[state]
+        return values
+
+    gauge("sanctum_db_pool_connections", "Connection pool gauges by engine and state.",
+          ("engine", "state"), callback=_pools)
+    counter("sanctum_db_pool_checkout_timeouts_total",
+            "Pool checkouts that timed out, by engine.", ("engine",),
+            callback=lambda: {(name,): m.snapshot()["timeouts_total"] for name, m in engine_metrics().items()})
+    gauge("sanctum_db_replica_lag_seconds",
+          "Last probed replica replay lag (absent when no replica or unreachable).",
+          callback=lambda: replica_router.stats()["lag_seconds"])
+    gauge("sanctum_event_bus_tasks_in_flight",
+          "Dynamic-rule background jobs currently running.",
+          callback=lambda: event_bus.in_flight)
+    gauge("sanctum_token_usage_pending",
+          "API token last_used_at updates waiting for the write-behind flush.",
+          callback=lambda: token_usage_buffer.stats()["pending"])
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count, latency and in-flight gauge."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        sent_at: Optional[float] = None
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code, sent_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                sent_at = time.perf_counter()
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            finished = time.perf_counter()
+            method = scope.get("method", "")
+            route = _route_template(scope)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            http_request_duration.observe((sent_at or finished) - start, method=method, route=route)
+            if sent_at is not None:
+                http_background_duration.observe(finished - sent_at, method=method, route=route)
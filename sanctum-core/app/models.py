@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, TIMESTAMP, ForeignKey, Table, Numeric, Float, Date, func, ARRAY, DateTime, Index, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.types import JSON
 from sqlalchemy import Enum as SAEnum
@@ -103,6 +103,7 @@ class Contact(Base):
 
     # NEW: Preference store for non-users (External Contacts)
     notification_preferences = Column(JSON, default={})
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
     account = relationship("Account", back_populates="contacts")
     subordinates = relationship("Contact", backref=backref('manager', remote_side=[id]))
@@ -191,6 +192,7 @@ class Project(Base):
     leverage_data = Column(JSONB, nullable=True)
     is_deleted = Column(Boolean, default=False)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
     account = relationship("Account", back_populates="projects")
     deal = relationship("Deal")
@@ -211,6 +213,7 @@ class Milestone(Base):
     invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=True)
     is_deleted = Column(Boolean, default=False)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
     project = relationship("Project", back_populates="milestones")
     tickets = relationship("Ticket", back_populates="milestone")
@@ -244,6 +247,12 @@ class Ticket(Base):
     no_billable = Column(Boolean, default=False, server_default=text("false"))
     no_billable_reason = Column(Text, nullable=True)
 
+    # Denormalised effort counters, kept in step by services/ticket_counters.py
+    comment_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    time_entry_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    material_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    total_minutes = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
     # Phase-gated acceptance criteria (see #2873 design / #2875 implementation).
     # Nullable with '{}' server default so existing rows materialise as empty dict.
     phase_criteria = Column(
@@ -292,12 +301,7 @@ class Ticket(Base):
 
     @property
     def total_hours(self):
-        total_mins = 0
-        for entry in self.time_entries:
-            if entry.start_time and entry.end_time:
-                delta = entry.end_time - entry.start_time
-                total_mins += int(delta.total_seconds() / 60)
-        return round(total_mins / 60, 2)
+        return round((self.total_minutes or 0) / 60, 2)
 
 class TicketTimeEntry(Base):
     __tablename__ = "ticket_time_entries"
@@ -310,6 +314,7 @@ class TicketTimeEntry(Base):
     end_time = Column(TIMESTAMP(timezone=True), nullable=False)
     description = Column(String, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
     # FINANCIAL LOCKING
     invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=True)
@@ -349,6 +354,7 @@ class TicketMaterial(Base):
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"))
     quantity = Column(Integer, default=1)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
     # FINANCIAL LOCKING
     invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=True)
@@ -467,6 +473,7 @@ class Invoice(Base):
     payment_terms = Column(String, default='Net 14 Days')
     due_date = Column(Date, nullable=True)
     generated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
     pdf_path = Column(String, nullable=True)
 
     # PAYMENT TRACKING
@@ -499,6 +506,7 @@ class Comment(Base):
     body = Column(Text)
     visibility = Column(String, default='internal')
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
     ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=True)
     deal_id = Column(UUID(as_uuid=True), ForeignKey("deals.id"), nullable=True)
     audit_id = Column(UUID(as_uuid=True), ForeignKey("audit_reports.id"), nullable=True)
@@ -988,6 +996,31 @@ Index('ix_workbench_pins_user', WorkbenchPin.user_id)
 Index('ix_workbench_pins_project', WorkbenchPin.project_id)
 
 
+# Unified global-search index — one row per searchable entity, maintained by
+# app/services/search_index.py (ORM flush hooks + scripts/rebuild_search_index.py)
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    entity_type = Column(String(16), primary_key=True)   # client, ticket, contact, wiki, asset, project, milestone, product
+    entity_id = Column(String(64), primary_key=True)     # str(UUID) or str(int) for tickets
+    title = Column(String, nullable=False)
+    subtitle = Column(String, nullable=True)
+    body = Column(Text, nullable=True)                   # secondary match text: description, email, content, IP...
+    identifier = Column(String(64), nullable=True)       # ticket number / wiki identifier — exact-match boost
+    link = Column(String, nullable=False)
+    # Scope
+    account_id = Column(UUID(as_uuid=True), nullable=True)
+    brand_affinity = Column(String(8), nullable=True)
+    staff_only = Column(Boolean, nullable=False, default=False)
+    # Postgres: weighted title (A) + body (B) vector, written with the row. NULL elsewhere.
+    search_vector = Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+Index('ix_search_documents_account', SearchDocument.account_id)
+Index('ix_search_documents_vector', SearchDocument.search_vector, postgresql_using='gin')
+Index('ix_trgm_search_documents_title', SearchDocument.title, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+Index('ix_trgm_search_documents_body', SearchDocument.body, postgresql_using='gin', postgresql_ops={'body': 'gin_trgm_ops'})
+
+
 # TRIGRAM INDEXES (pg_trgm)
 # Phase 75: The Omnisearch — fuzzy search support
 # ─────────────────────────────────────────────────────────────────────────────
@@ -55,9 +55,43 @@ class ServicePrincipal:
         return "*" in granted or scope in granted
 
 
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached, immutable copy of the ``User`` fields handlers read.
+
+    Served from the JWT principal cache in ``app.auth`` so a cache hit needs no
+    session. Secrets (``password_hash``, ``totp_secret``) are deliberately not
+    copied. Handlers that mutate the user re-load the row by ``id``.
+    """
+
+    id: Any
+    email: str | None
+    full_name: str | None
+    role: str | None
+    access_scope: str | None
+    is_active: bool
+    account_id: Any
+    user_type: str | None
+    has_2fa: bool = False
+
+    @classmethod
+    def from_user(cls, user: "models.User") -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            access_scope=user.access_scope,
+            is_active=bool(user.is_active),
+            account_id=user.account_id,
+            user_type=user.user_type,
+            has_2fa=bool(user.has_2fa),
+        )
+
+
 # Union of every principal the auth layer can resolve. Imported lazily to avoid
 # a circular import with ``app.models``.
-Principal = Union["models.User", ServicePrincipal]
+Principal = Union["models.User", UserSnapshot, ServicePrincipal]
 
 
 def _to_datetime(value: Any) -> datetime | None:
@@ -117,6 +151,7 @@ def principal_type_of(principal: Any) -> str:
 __all__ = [
     "Principal",
     "ServicePrincipal",
+    "UserSnapshot",
     "principal_audit_label",
     "principal_type_of",
     "service_principal_from_claims",
@@ -0,0 +1,174 @@
+"""Per-request SQL statement counting and timing (opt-in).
+
+``tests/test_query_budget_accounts.py`` catches N+1 regressions for one
+endpoint in CI only. This module makes the same signal available against real
+data: SQLAlchemy cursor hooks attribute every statement to the request that
+issued it, and :class:`QueryStatsMiddleware` reports the totals as
+``X-DB-Queries`` / ``X-DB-Time-Ms`` response headers and a structured
+``sanctum.db`` log line.
+
+Enable with ``DB_QUERY_STATS_ENABLED=true``. ``DB_QUERY_STATS_SAMPLE_RATE``
+(0.0–1.0) limits how many requests are tracked; a tracked request whose
+total DB time exceeds ``DB_SLOW_REQUEST_MS`` logs at WARNING with its slowest
+statement instead of the usual INFO line.
+
+Statements are attributed through a ``ContextVar``, so sync handlers (run in
+the threadpool with a copied context) and async handlers (asyncpg / aiosqlite
+via the greenlet bridge) are both counted. Statements issued outside a tracked
+request — workers, background tasks after the response — are ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger("sanctum.db")
+
+QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+SAMPLE_RATE = float(os.getenv("DB_QUERY_STATS_SAMPLE_RATE", "1.0"))
+SLOW_REQUEST_MS = float(os.getenv("DB_SLOW_REQUEST_MS", "500"))
+
+# Longest statement text kept for the slow-request log.
+MAX_STATEMENT_CHARS = 500
+
+
+@dataclass
+class RequestQueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("db_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+# The start time rides on the statement's execution context rather than the
+# connection: a statement that raises never reaches after_cursor_execute, and
+# its context is discarded with it instead of leaving a stale entry behind.
+_START_ATTR = "_query_stats_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    start = getattr(context, _START_ATTR, None)
+    if start is None:
+        return
+    delattr(context, _START_ATTR)
+    stats.record(statement, (time.perf_counter() - start) * 1000)
+
+
+_installed = False
+
+
+def install_query_hooks() -> None:
+    """Attach cursor hooks to every ``Engine`` (sync, and async via ``sync_engine``).
+
+    Idempotent. The hooks are no-ops for statements outside a tracked request.
+    """
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+
+def uninstall_query_hooks() -> None:
+    global _installed
+    if not _installed:
+        return
+    event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = False
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware: track DB statements for a sample of HTTP requests.
+
+    Headers are added on ``http.response.start``; for ordinary (non-streaming)
+    responses that is after the handler returns, so the counts are final.
+    """
+
+    def __init__(self, app, sample_rate: float = SAMPLE_RATE,
+                 slow_request_ms: float = SLOW_REQUEST_MS, emit_headers: bool = True):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.emit_headers = emit_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.emit_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.total_ms:.2f}".encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._log(scope, status_code, stats)
+
+    def _log(self, scope, status_code: int, stats: RequestQueryStats) -> None:
+        record = {
+            "method": scope.get("method"),
+            "route": _route_template(scope),
+            "status": status_code,
+            "queries": stats.count,
+            "db_ms": round(stats.total_ms, 2),
+            "slowest_ms": round(stats.slowest_ms, 2),
+            "request_ms": round((time.perf_counter() - stats.started) * 1000, 2),
+        }
+        if stats.total_ms >= self.slow_request_ms:
+            record["slowest_statement"] = (stats.slowest_statement or "")[:MAX_STATEMENT_CHARS]
+            log.warning("db_slow_request %s", json.dumps(record))
+        else:
+            log.info("db_request %s", json.dumps(record))
@@ -81,6 +81,7 @@ def admin_update_user(
 
     db.commit()
     db.refresh(user)
+    auth.invalidate_principal(user.id)
     return user
 
 @user_router.delete("/{user_id}")
@@ -96,6 +97,8 @@ def admin_delete_user(
 
     db.delete(user)
     db.commit()
+    auth.invalidate_api_token(user_id=user.id)
+    auth.invalidate_principal(user.id)
     return {"status": "deleted"}
 
 # --- ADMIN-MINT PERSONAL ACCESS TOKENS (#2806) ---
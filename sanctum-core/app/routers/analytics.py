@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
 from datetime import datetime, timedelta, date
 from typing import List
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_read_db
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 @router.get("/revenue-trend")
-def get_revenue_trend(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
+def get_revenue_trend(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
     # Group invoices by month for last 6 months
     six_months_ago = datetime.now() - timedelta(days=180)
 
@@ -23,7 +23,7 @@ def get_revenue_trend(db: Session = Depends(get_db), _: models.User = Depends(au
     return [{"month": r.month, "revenue": float(r.revenue)} for r in results]
 
 @router.get("/asset-reliability")
-def get_asset_reliability(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
+def get_asset_reliability(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
     # Top 5 Assets by Ticket Count
     # Requires joining Ticket -> Asset via Association Table
     # Complex query: select asset.name, count(ticket.id) from assets join ticket_assets ... group by asset.name
@@ -40,7 +40,7 @@ def get_asset_reliability(db: Session = Depends(get_db), _: models.User = Depend
 
 
 @router.get("/cash-position")
-def get_cash_position(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
+def get_cash_position(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
     today = date.today()
 
     unpaid = db.query(models.Invoice).filter(
@@ -84,7 +84,7 @@ def get_cash_position(db: Session = Depends(get_db), _: models.User = Depends(au
 
 
 @router.get("/pipeline-forecast")
-def get_pipeline_forecast(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
+def get_pipeline_forecast(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
     today = date.today()
 
     milestones = db.query(models.Milestone).filter(
@@ -132,7 +132,7 @@ def get_pipeline_forecast(db: Session = Depends(get_db), _: models.User = Depend
 
 
 @router.get("/recurring-revenue")
-def get_recurring_revenue(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
+def get_recurring_revenue(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
     assets = db.query(models.Asset).join(
         models.Product, models.Asset.linked_product_id == models.Product.id
     ).filter(
@@ -169,8 +169,10 @@ def get_recurring_revenue(db: Session = Depends(get_db), _: models.User = Depend
 
 
 @router.get("/budget-vs-actual")
-def get_budget_vs_actual(db: Session = Depends(get_db), _: models.User = Depends(auth.get_current_active_user)):
-    projects = db.query(models.Project).filter(
+def get_budget_vs_actual(db: Session = Depends(get_read_db), _: models.User = Depends(auth.get_current_active_user)):
+    projects = db.query(models.Project).options(
+        selectinload(models.Project.milestones).selectinload(models.Milestone.invoice)
+    ).filter(
         models.Project.budget > 0,
         models.Project.is_deleted == False
     ).all()
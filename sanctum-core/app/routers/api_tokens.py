@@ -14,7 +14,7 @@ from pydantic import BaseModel, field_validator
 
 from app.database import get_db
 from app import models
-from app.auth import get_current_active_user, pwd_context
+from app.auth import get_current_active_user, invalidate_api_token, pwd_context
 
 log = logging.getLogger(__name__)
 
@@ -240,5 +240,6 @@ def revoke_api_token(
 
     token.is_active = False
     db.commit()
+    invalidate_api_token(token_id=token.id)
 
     return {"status": "revoked", "prefix": token.token_prefix}
@@ -48,14 +48,19 @@ def enable_two_factor(
     totp = pyotp.TOTP(secret)
     if not totp.verify(payload.code):
         raise HTTPException(status_code=400, detail="Invalid Code")
-    current_user.totp_secret = secret
+    # current_user comes from the async auth session — mutate this request's row.
+    user = db.query(models.User).filter(models.User.id == current_user.id).first()
+    user.totp_secret = secret
     db.commit()
+    auth.invalidate_principal(user.id)
     return {"status": "2FA Enabled"}
 
 @router.post("/2fa/disable")
 def disable_two_factor(current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    current_user.totp_secret = None
+    user = db.query(models.User).filter(models.User.id == current_user.id).first()
+    user.totp_secret = None
     db.commit()
+    auth.invalidate_principal(user.id)
     return {"status": "2FA Disabled"}
 
 @router.post("/invite")
@@ -100,6 +100,8 @@ def delete_user(user_id: str, db: Session = Depends(get_db)):
     user = get_or_404(db, models.User, user_id, deleted_filter=False)
     db.delete(user)
     db.commit()
+    auth.invalidate_api_token(user_id=user.id)
+    auth.invalidate_principal(user.id)
     return {"status": "deleted"}
 
 # --- DEALS ---
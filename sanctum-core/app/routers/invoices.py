@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, select
 from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
 import os
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..services.export import ExportFormat, export_response
 from ..services.email_service import email_service
 from ..services.pdf_engine import pdf_engine
 from ..services.billing_service import billing_service
@@ -229,6 +232,48 @@ def get_all_invoices(
         "invoices": result
     }
 
+@router.get("/export", tags=["Invoices"])
+def export_invoices(
+    status: str = None,
+    account_id: Optional[UUID] = None,
+    format: ExportFormat = "ndjson",
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """Streams every invoice matching ?status= (as GET /invoices) and ?account_id= as NDJSON or CSV."""
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Admin only.")
+
+    today = datetime.now().date()
+    Invoice = models.Invoice
+    is_overdue = and_(Invoice.status == 'sent', Invoice.due_date < today)
+
+    stmt = (
+        select(
+            Invoice.id,
+            Invoice.account_id,
+            func.coalesce(models.Account.name, 'Unknown').label('account_name'),
+            case((is_overdue, 'overdue'), else_=Invoice.status).label('status'),
+            Invoice.subtotal_amount,
+            Invoice.gst_amount,
+            Invoice.total_amount,
+            Invoice.payment_terms,
+            Invoice.due_date,
+            Invoice.generated_at,
+            Invoice.paid_at,
+            Invoice.payment_method,
+        )
+        .outerjoin(models.Account, Invoice.account_id == models.Account.id)
+    )
+    if status == "overdue":
+        stmt = stmt.where(is_overdue)
+    elif status and status != "all":
+        stmt = stmt.where(Invoice.status == status)
+    if account_id:
+        stmt = stmt.where(Invoice.account_id == account_id)
+
+    return export_response(db, stmt.order_by(Invoice.generated_at, Invoice.id), "invoices", format)
+
 @router.post("", response_model=schemas.InvoiceResponse)
 def create_invoice(invoice: schemas.InvoiceCreate, current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
     account = db.query(models.Account).filter(models.Account.id == invoice.account_id).first()
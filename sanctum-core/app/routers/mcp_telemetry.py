@@ -11,7 +11,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from .. import models, auth
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..schemas.telemetry import (
     McpToolCallCreate,
     McpToolCallBatchCreate,
@@ -59,7 +59,7 @@ def list_calls(
     window: Optional[str] = Query(None, description="Time window: 1d, 7d, 30d"),
     limit: int = Query(50, le=500),
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: models.User = Depends(auth.get_current_active_user),
 ):
     """Paginated raw telemetry records with optional filters."""
@@ -83,7 +83,7 @@ def list_calls(
 def get_stats(
     window: str = Query("7d", description="Time window: 1d, 7d, 30d"),
     group_by: str = Query("tool_name", description="Group by: tool_name, agent_persona, cost_tier"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: models.User = Depends(auth.get_current_active_user),
 ):
     """Aggregated telemetry stats grouped by the specified dimension."""
@@ -53,12 +53,19 @@ def mark_all_read(db: Session = Depends(get_db), current_user: models.User = Dep
 
 # --- PREFERENCE CONTROLS ---
 
+def _load_preferences(db: Session, user_id):
+    # current_user is detached (async auth session / principal cache), so the
+    # notification_preferences backref cannot lazy-load — query it here.
+    return db.query(UserNotificationPreference).filter(
+        UserNotificationPreference.user_id == user_id
+    ).first()
+
 @router.get("/preferences", response_model=schemas.PreferenceResponse)
 def get_preferences(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    prefs = current_user.notification_preferences
+    prefs = _load_preferences(db, current_user.id)
     if not prefs:
         # Return defaults if no record exists
         return {"email_frequency": "daily", "force_critical": True}
@@ -70,7 +77,7 @@ def update_preferences(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
-    prefs = current_user.notification_preferences
+    prefs = _load_preferences(db, current_user.id)
     if not prefs:
         # Create if missing
         prefs = models.UserNotificationPreference(user_id=current_user.id)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload, noload
 from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy import desc, or_, asc, distinct, func
 from uuid import UUID
@@ -88,6 +88,16 @@ def verify_ticket_access(ticket_id: int, user: models.User, db: Session, imperso
     return ticket, contact
 
 # --- DASHBOARD ---
+# Everything TicketResponse serialises for the dashboard, loaded per collection
+# rather than per ticket.
+_DASHBOARD_TICKET_LOADS = (
+    joinedload(models.Ticket.time_entries),
+    joinedload(models.Ticket.materials),
+    selectinload(models.Ticket.contacts),
+    selectinload(models.Ticket.articles),
+    selectinload(models.Ticket.assets),
+)
+
 @router.get("/dashboard", response_model=schemas.PortalDashboard)
 def get_portal_dashboard(
     impersonate: UUID = None,
@@ -101,7 +111,7 @@ def get_portal_dashboard(
 
     if contact:
         tickets = db.query(models.Ticket).outerjoin(ticket_contacts)\
-            .options(joinedload(models.Ticket.time_entries), joinedload(models.Ticket.materials))\
+            .options(*_DASHBOARD_TICKET_LOADS)\
             .filter(
                 models.Ticket.account_id == aid,
                 models.Ticket.is_deleted == False,
@@ -114,7 +124,7 @@ def get_portal_dashboard(
     else:
         # Admin impersonating — show ALL account tickets
         tickets = db.query(models.Ticket)\
-            .options(joinedload(models.Ticket.time_entries), joinedload(models.Ticket.materials))\
+            .options(*_DASHBOARD_TICKET_LOADS)\
             .filter(
                 models.Ticket.account_id == aid,
                 models.Ticket.is_deleted == False
@@ -123,10 +133,16 @@ def get_portal_dashboard(
     for t in tickets:
         set_committed_value(t, 'related_tickets', [])
         set_committed_value(t, 'comments', [])
-    invoices = db.query(models.Invoice).options(joinedload(models.Invoice.items))\
+    invoices = db.query(models.Invoice)\
+        .options(joinedload(models.Invoice.items), selectinload(models.Invoice.delivery_logs))\
         .filter(models.Invoice.account_id == aid).order_by(desc(models.Invoice.generated_at)).all()
 
-    projects = db.query(models.Project).options(joinedload(models.Project.milestones))\
+    projects = db.query(models.Project)\
+        .options(
+            joinedload(models.Project.milestones).selectinload(models.Milestone.tickets).options(
+                noload(models.Ticket.related_tickets),
+            )
+        )\
         .filter(models.Project.account_id == aid, models.Project.is_deleted == False).all()
 
     # PHASE 60A: Get all audits grouped by category
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import func, text as sa_text
+from sqlalchemy.orm import Session, joinedload, selectinload, noload
+from sqlalchemy import func, case, or_, select
 from typing import List, Optional
 from datetime import datetime, timedelta, date
 from .. import models, schemas, auth
@@ -16,6 +16,7 @@ from ..services.delete_validation import validate_project_deletable, validate_mi
 from ..services.milestone_sequencing import shift_sequences_for_insert, shift_sequences_for_move
 from ..services.expand import ExpandConfig, get_expand_config, get_expand_config_lean, expanded_response
 from ..services.uuid_resolver import resolve_uuid, get_or_404
+from ..services.etag import etag_matches, make_etag, not_modified, project_version
 from decimal import Decimal, ROUND_HALF_UP
 import os
 
@@ -44,6 +45,13 @@ def _validate_discount(market_value, quoted_price, discount_reason):
 
 
 # --- PROJECTS ---
+# Ticket loads for TicketBrief under expanded milestones: total_hours reads the
+# ticket's own total_minutes, and related_tickets is always blanked by the schema
+# for ORM tickets, so skip loading it rather than lazy-loading per ticket.
+_TICKET_BRIEF_LOADS = (
+    noload(models.Ticket.related_tickets),
+)
+
 @router.get("/projects", response_model=None)
 def get_projects(
     account_id: Optional[str] = None,
@@ -73,7 +81,8 @@ def get_projects(
         joinedload(models.Project.template),
     ]
     if load_milestones:
-        opts.append(selectinload(models.Project.milestones).selectinload(models.Milestone.tickets))
+        opts.append(selectinload(models.Project.milestones).selectinload(models.Milestone.tickets)
+                    .options(*_TICKET_BRIEF_LOADS))
 
     limit, offset = pagination["limit"], pagination["offset"]
     projects = db.query(models.Project).options(*opts).filter(*filters)\
@@ -96,12 +105,20 @@ def get_projects(
     return JSONResponse(content=result, headers={"X-Total-Count": str(total)})
 
 @router.get("/projects/{project_id}", response_model=schemas.ProjectResponse)
-def get_project_detail(project_id: str, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
+def get_project_detail(project_id: str, request: Request, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
     # Resolve prefix to full UUID, then do the eager-loaded query
     resolved_id = resolve_uuid(db, models.Project, project_id)
+
+    # Conditional GET: one version query decides whether anything changed
+    version = project_version(db, resolved_id)
+    if version is None: raise HTTPException(status_code=404, detail="Project not found")
+    etag = make_etag("project", version, request, expand.consumer_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     opts = [joinedload(models.Project.account), joinedload(models.Project.template)]
     if expand.should_expand("milestones"):
-        opts.append(joinedload(models.Project.milestones).selectinload(models.Milestone.tickets))
+        opts.append(joinedload(models.Project.milestones).selectinload(models.Milestone.tickets)
+                    .options(*_TICKET_BRIEF_LOADS))
     project = db.query(models.Project).options(*opts).filter(models.Project.id == resolved_id).first()
 
     if not project: raise HTTPException(status_code=404, detail="Project not found")
@@ -161,7 +178,9 @@ def get_project_detail(project_id: str, expand: ExpandConfig = Depends(get_expan
     response_data = jsonable_encoder(schemas.ProjectResponse.model_validate(project))
     response_data["milestone_count"] = milestone_count
     response_data["artefact_count"] = artefact_count
-    return expanded_response(response_data, expand, "project")
+    response = expanded_response(response_data, expand, "project")
+    response.headers["ETag"] = etag
+    return response
 
 @router.post("/projects", response_model=schemas.ProjectResponse)
 def create_project(project: schemas.ProjectCreate, current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
@@ -391,16 +410,19 @@ def get_milestone_detail(milestone_id: str, expand: ExpandConfig = Depends(get_e
     ticket_ids = [t.id for t in ms.tickets]
     rel_map = {}
     if ticket_ids:
-        relations_raw = db.execute(sa_text("""
-            SELECT t.id, t.subject, t.status, t.priority, t.ticket_type,
-                   tr.relation_type, tr.visibility,
-                   tr.ticket_id as source_id, tr.related_id
-            FROM ticket_relations tr
-            JOIN tickets t ON t.id = CASE
-                WHEN tr.ticket_id = ANY(:tids) THEN tr.related_id
-                ELSE tr.ticket_id END
-            WHERE tr.ticket_id = ANY(:tids) OR tr.related_id = ANY(:tids)
-        """), {"tids": ticket_ids}).fetchall()
+        tr = models.ticket_relations
+        other_id = case((tr.c.ticket_id.in_(ticket_ids), tr.c.related_id), else_=tr.c.ticket_id)
+        relations_raw = db.execute(
+            select(
+                models.Ticket.id, models.Ticket.subject, models.Ticket.status,
+                models.Ticket.priority, models.Ticket.ticket_type,
+                tr.c.relation_type, tr.c.visibility,
+                tr.c.ticket_id.label("source_id"), tr.c.related_id,
+            )
+            .select_from(tr)
+            .join(models.Ticket, models.Ticket.id == other_id)
+            .where(or_(tr.c.ticket_id.in_(ticket_ids), tr.c.related_id.in_(ticket_ids)))
+        ).fetchall()
 
         from collections import defaultdict
         rel_map = defaultdict(list)
@@ -422,9 +444,10 @@ def get_milestone_detail(milestone_id: str, expand: ExpandConfig = Depends(get_e
     # Check which tickets have linked articles
     article_tids = set()
     if ticket_ids:
-        article_rows = db.execute(sa_text(
-            "SELECT DISTINCT ticket_id FROM ticket_articles WHERE ticket_id = ANY(:tids)"
-        ), {"tids": ticket_ids}).fetchall()
+        article_rows = db.execute(
+            select(models.ticket_articles.c.ticket_id).distinct()
+            .where(models.ticket_articles.c.ticket_id.in_(ticket_ids))
+        ).fetchall()
         article_tids = {row.ticket_id for row in article_rows}
 
     ticket_briefs = []
@@ -1,13 +1,47 @@
+import asyncio
+import heapq
+import logging
+import os
 import re
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, case, literal
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, func, case, literal, select, text
 from typing import List, Optional
-from .. import models, schemas, auth
-from ..database import get_db
+from .. import models, schemas, auth, metrics
+from ..database import get_async_read_db
+from ..services import search_index
+from ..services.search_index import SEARCH_INDEX_ENABLED
+from ..utils.ttl_cache import TTLCache
 
 router = APIRouter(tags=["Search"])
 
+log = logging.getLogger(__name__)
+
+# Deadline for each entity's query (or the single index query). A type that
+# misses it is left out and named in the X-Search-Partial response header.
+SEARCH_TIMEOUT_SECONDS = float(os.getenv("SEARCH_TIMEOUT_MS", "1500")) / 1000
+
+PARTIAL_HEADER = "X-Search-Partial"
+
+search_timeouts_total = metrics.counter(
+    "sanctum_search_timeouts_total",
+    "Global-search queries abandoned at the deadline, by entity type (\"index\" for the unified query).",
+    ("entity",),
+)
+
+# Type-ahead result cache (per worker). Writes to an indexed entity type drop
+# every entry whose scope includes that type; the TTL bounds staleness from
+# other workers and from bulk writes that skip the ORM.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "30"))
+search_cache = TTLCache("search.results", maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+search_cache_lookups_total = metrics.counter(
+    "sanctum_search_cache_lookups_total",
+    "Global-search cache lookups by outcome (hit, miss).",
+    ("outcome",),
+)
+
 
 # ─────────────────────────────────────────────
 # SCORING HELPERS
@@ -21,37 +55,20 @@ def _best_similarity(term: str, *columns):
     return func.greatest(*sims)
 
 
-def _score_result(term: str, result_dict: dict, title_field: str, content_fields: list = None) -> float:
-    """
-    Calculate a tier-based score for a result.
-    Called after the DB query to assign scores based on match type.
-
-    Tiers:
-      - exact title match: 0.95
-      - ilike title/name: 0.8
-      - ilike content/description: 0.6
-      - fallback (fuzzy only): uses raw similarity passed in
-    """
-    term_lower = term.lower()
-    title_val = (result_dict.get('_title_raw') or '').lower()
+_tier_score = search_index.tier_score
+
 
-    # Exact title match
-    if term_lower == title_val:
-        return 0.95
+def _score(value) -> float:
+    return round(float(value or 0), 3)
 
-    # Title contains term
-    if term_lower in title_val:
-        return 0.8
 
-    # Content fields contain term
-    if content_fields:
-        for field_val in content_fields:
-            if field_val and term_lower in field_val.lower():
-                return 0.6
+def _merge_ranked(results: list) -> list:
+    """k-way merge of per-type runs that each arrive best-first from SQL."""
+    runs = {}
+    for r in results:
+        runs.setdefault(r['type'], []).append(r)
+    return list(heapq.merge(*runs.values(), key=lambda r: -(r.get('score') or 0)))
 
-    # Fuzzy fallback — use raw similarity score if provided
-    raw_sim = result_dict.get('_similarity', 0.3)
-    return round(min(raw_sim, 0.55), 3)  # Cap fuzzy below ilike tier
 
 def _normalise_identifier(term: str) -> Optional[str]:
     """Detect identifier-like patterns and normalise to PREFIX-NNN format."""
@@ -63,11 +80,360 @@ def _normalise_identifier(term: str) -> Optional[str]:
     return None
 
 
+# ─────────────────────────────────────────────
+# INDEXED SEARCH (search_documents)
+# ─────────────────────────────────────────────
+
+async def _search_index(db: AsyncSession, term_str: str, mode: Optional[str], effective_limit: int,
+                        normalised_id: Optional[str], current_user) -> list:
+    """One query against search_documents, at most effective_limit rows per entity type."""
+    stmt = search_index.search_query(
+        term_str, mode, effective_limit, normalised_id, current_user, db.bind.dialect.name,
+    )
+    results = []
+    for row in (await db.execute(stmt)).all():
+        entity_id = search_index.parse_entity_id(row.entity_type, row.entity_id)
+        title = f"#{entity_id} {row.title}" if row.entity_type == 'ticket' else row.title
+        results.append({
+            "id": entity_id, "type": row.entity_type, "title": title,
+            "subtitle": row.subtitle, "link": row.link,
+            "score": _score(row.score),
+        })
+    return results
+
+
+# ─────────────────────────────────────────────
+# PER-ENTITY SEARCH (fallback when SEARCH_INDEX_ENABLED=false)
+# Each query ranks by the SQL tier score and returns its top rows best-first.
+# ─────────────────────────────────────────────
+
+async def _search_clients(db: AsyncSession, term_str: str, effective_limit: int,
+                          normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Account.name)
+    score_col = _tier_score(term_str, models.Account.name, sim=sim_col)
+    acc_query = select(models.Account, score_col.label('score')).filter(or_(
+        models.Account.name.ilike(term),
+        func.word_similarity(term_str, models.Account.name) > 0.3
+    ))
+    if current_user.access_scope == 'nt_only':
+        acc_query = acc_query.filter(models.Account.brand_affinity.in_(['nt', 'both']))
+    elif current_user.access_scope == 'ds_only':
+        acc_query = acc_query.filter(models.Account.brand_affinity.in_(['ds', 'both']))
+
+    rows = await db.execute(acc_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for acc, score in rows.all():
+        results.append({
+            "id": acc.id, "type": "client", "title": acc.name,
+            "subtitle": acc.type, "link": f"/clients/{acc.id}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_tickets(db: AsyncSession, term_str: str, effective_limit: int,
+                          normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    # Exact ID Match
+    if term_str.isdigit():
+        t_exact = select(models.Ticket).filter(models.Ticket.id == int(term_str))
+        if current_user.role == 'client':
+            t_exact = t_exact.filter(models.Ticket.account_id == current_user.account_id)
+        t_exact = (await db.execute(t_exact.limit(1))).scalars().first()
+
+        if t_exact:
+            results.append({
+                "id": t_exact.id, "type": "ticket", "title": f"#{t_exact.id} {t_exact.subject}",
+                "subtitle": f"{t_exact.status} • {t_exact.priority}", "link": f"/tickets/{t_exact.id}",
+                "score": 0.95
+            })
+
+    # Text Search with scoring
+    sim_col = _best_similarity(term_str, models.Ticket.subject, models.Ticket.description)
+    score_col = _tier_score(term_str, models.Ticket.subject,
+                            [models.Ticket.description, models.Ticket.resolution], sim_col)
+    tick_query = select(models.Ticket, score_col.label('score')).filter(or_(
+        models.Ticket.subject.ilike(term),
+        models.Ticket.description.ilike(term),
+        models.Ticket.resolution.ilike(term),
+        models.Ticket.id.cast(models.String).ilike(term),
+        func.word_similarity(term_str, models.Ticket.subject) > 0.3,
+        func.word_similarity(term_str, models.Ticket.description) > 0.3
+    ))
+    if current_user.role == 'client':
+        tick_query = tick_query.filter(models.Ticket.account_id == current_user.account_id)
+
+    rows = await db.execute(tick_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for t, score in rows.all():
+        if not any(r['id'] == t.id and r['type'] == 'ticket' for r in results):
+            results.append({
+                "id": t.id, "type": "ticket", "title": f"#{t.id} {t.subject}",
+                "subtitle": t.status, "link": f"/tickets/{t.id}",
+                "score": _score(score)
+            })
+    return results
+
+
+async def _search_contacts(db: AsyncSession, term_str: str, effective_limit: int,
+                           normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    full_name_sim = _best_similarity(term_str, models.Contact.first_name, models.Contact.last_name)
+    full_name = models.Contact.first_name + ' ' + models.Contact.last_name
+    score_col = _tier_score(term_str, full_name, sim=full_name_sim)
+    con_query = select(models.Contact, score_col.label('score')).filter(or_(
+        models.Contact.first_name.ilike(term),
+        models.Contact.last_name.ilike(term),
+        models.Contact.email.ilike(term),
+        func.word_similarity(term_str, models.Contact.first_name) > 0.3,
+        func.word_similarity(term_str, models.Contact.last_name) > 0.3
+    ))
+    rows = await db.execute(con_query.order_by(score_col.desc(), full_name_sim.desc()).limit(effective_limit))
+    for c, score in rows.all():
+        results.append({
+            "id": c.id, "type": "contact", "title": f"{c.first_name} {c.last_name}",
+            "subtitle": c.email, "link": f"/clients/{c.account_id}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_wiki(db: AsyncSession, term_str: str, effective_limit: int,
+                       normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Article.title, models.Article.content)
+    nid_filter = models.Article.identifier == normalised_id if normalised_id else models.Article.id.is_(None)
+    # Boost exact identifier match
+    exact_id = models.Article.identifier.in_([v for v in (term_str.upper(), normalised_id) if v])
+    score_col = _tier_score(term_str, models.Article.title, [models.Article.content], sim_col, exact=exact_id)
+    wiki_query = select(models.Article, score_col.label('score')).filter(or_(
+        models.Article.title.ilike(term),
+        models.Article.identifier.ilike(term),
+        nid_filter,
+        models.Article.content.ilike(term),
+        func.word_similarity(term_str, models.Article.title) > 0.3
+    ))
+    rows = await db.execute(wiki_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for w, score in rows.all():
+        results.append({
+            "id": w.id, "type": "wiki", "title": w.title,
+            "subtitle": w.identifier, "link": f"/wiki/{w.slug}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_assets(db: AsyncSession, term_str: str, effective_limit: int,
+                         normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Asset.name)
+    score_col = _tier_score(term_str, models.Asset.name, sim=sim_col)
+    asset_query = select(models.Asset, score_col.label('score')).filter(or_(
+        models.Asset.name.ilike(term),
+        models.Asset.ip_address.ilike(term),
+        models.Asset.serial_number.ilike(term),
+        func.word_similarity(term_str, models.Asset.name) > 0.3
+    ))
+    rows = await db.execute(asset_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for a, score in rows.all():
+        results.append({
+            "id": a.id, "type": "asset", "title": a.name,
+            "subtitle": a.ip_address or a.asset_type,
+            "link": f"/assets/{a.id}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_projects(db: AsyncSession, term_str: str, effective_limit: int,
+                           normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Project.name)
+    score_col = _tier_score(term_str, models.Project.name, sim=sim_col)
+    proj_query = select(models.Project, score_col.label('score')).filter(or_(
+        models.Project.name.ilike(term),
+        func.word_similarity(term_str, models.Project.name) > 0.3
+    )).filter(models.Project.is_deleted == False)
+    if current_user.role == 'client':
+        proj_query = proj_query.filter(models.Project.account_id == current_user.account_id)
+    rows = await db.execute(proj_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for p, score in rows.all():
+        results.append({
+            "id": p.id, "type": "project", "title": p.name,
+            "subtitle": p.status, "link": f"/projects/{p.id}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_milestones(db: AsyncSession, term_str: str, effective_limit: int,
+                             normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Milestone.name)
+    score_col = _tier_score(term_str, models.Milestone.name, sim=sim_col)
+    ms_query = select(models.Milestone, score_col.label('score')).join(
+        models.Project, models.Milestone.project_id == models.Project.id
+    ).filter(or_(
+        models.Milestone.name.ilike(term),
+        func.word_similarity(term_str, models.Milestone.name) > 0.3
+    )).filter(models.Project.is_deleted == False).filter(models.Milestone.is_deleted == False)
+    if current_user.role == 'client':
+        ms_query = ms_query.filter(models.Project.account_id == current_user.account_id)
+    rows = await db.execute(ms_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for ms, score in rows.all():
+        results.append({
+            "id": ms.id, "type": "milestone", "title": ms.name,
+            "subtitle": ms.status, "link": f"/projects/{ms.project_id}",
+            "score": _score(score)
+        })
+    return results
+
+
+async def _search_products(db: AsyncSession, term_str: str, effective_limit: int,
+                           normalised_id: Optional[str], current_user) -> list:
+    term = f"%{term_str}%"
+    results = []
+
+    sim_col = _best_similarity(term_str, models.Product.name, models.Product.description)
+    score_col = _tier_score(term_str, models.Product.name, [models.Product.description], sim_col)
+    prod_query = select(models.Product, score_col.label('score')).filter(or_(
+        models.Product.name.ilike(term),
+        models.Product.description.ilike(term),
+        func.word_similarity(term_str, models.Product.name) > 0.3
+    )).filter(models.Product.is_active == True)
+    rows = await db.execute(prod_query.order_by(score_col.desc(), sim_col.desc()).limit(effective_limit))
+    for p, score in rows.all():
+        results.append({
+            "id": p.id, "type": "product", "title": p.name,
+            "subtitle": p.type, "link": f"/catalog/{p.id}",
+            "score": _score(score)
+        })
+    return results
+
+
+# (entity type, search, visible to client users)
+_ENTITY_SEARCHES = (
+    ('client', _search_clients, True),
+    ('ticket', _search_tickets, True),
+    ('contact', _search_contacts, False),
+    ('wiki', _search_wiki, False),
+    ('asset', _search_assets, False),
+    ('project', _search_projects, True),
+    ('milestone', _search_milestones, True),
+    ('product', _search_products, False),
+)
+
+
+def _entity_types(mode: Optional[str], current_user) -> list:
+    return [
+        entity_type for entity_type, _, client_visible in _ENTITY_SEARCHES
+        if mode in (None, entity_type) and (client_visible or current_user.role != 'client')
+    ]
+
+
+async def _timeboxed(db: AsyncSession, search, *args):
+    """Await search(db, *args) within SEARCH_TIMEOUT_SECONDS; None on timeout.
+
+    On Postgres the statement is also capped server-side so a cancelled
+    query doesn't keep running on the pooled connection.
+    """
+    if db.bind.dialect.name == 'postgresql':
+        # A little past the client deadline so asyncio, not the server, decides.
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(SEARCH_TIMEOUT_SECONDS * 1000) + 250}"))
+    try:
+        return await asyncio.wait_for(search(db, *args), SEARCH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return None
+
+
+async def _search_entities(db: AsyncSession, term_str: str, mode: Optional[str], effective_limit: int,
+                           normalised_id: Optional[str], current_user) -> tuple[list, list]:
+    """Run the per-entity searches concurrently, each on its own pooled connection.
+
+    Returns (results, timed_out_types); a type that misses the deadline
+    contributes nothing instead of holding up the others.
+    """
+    searches = {entity_type: search for entity_type, search, _ in _ENTITY_SEARCHES}
+
+    async def run(entity_type):
+        async with AsyncSession(db.bind) as session:
+            return await _timeboxed(session, searches[entity_type], term_str, effective_limit,
+                                    normalised_id, current_user)
+
+    types = _entity_types(mode, current_user)
+    outcomes = await asyncio.gather(*(run(entity_type) for entity_type in types))
+
+    results, timed_out = [], []
+    for entity_type, rows in zip(types, outcomes):
+        if rows is None:
+            search_timeouts_total.inc(entity=entity_type)
+            timed_out.append(entity_type)
+        else:
+            results.extend(rows)
+    return results, timed_out
+
+
+# ─────────────────────────────────────────────
+# RESULT CACHE
+# ─────────────────────────────────────────────
+
+class _CachedSearch:
+    """Scored results for one (term, scope) plus the entity types they cover."""
+
+    __slots__ = ("results", "types")
+
+    def __init__(self, results: list, types: list):
+        self.results = results
+        self.types = frozenset(types)
+
+
+def _cache_key(term_str: str, mode: Optional[str], limit: int, current_user) -> tuple:
+    return (term_str.lower(), mode, limit, current_user.role, current_user.access_scope,
+            str(current_user.account_id) if current_user.account_id else None)
+
+
+def _cached_search(term_str: str, mode: Optional[str], limit: int, current_user) -> Optional[list]:
+    """Cached results for exactly this term and scope, else None.
+
+    A shorter cached prefix can't answer a longer term: rows matched by
+    body text can't be re-checked from the cached fields, and the longer term
+    can fuzzy-match rows the prefix never returned. Those fill any type with
+    fewer substring hits than the limit, which a complete prefix always has.
+    """
+    cached = search_cache.get(_cache_key(term_str, mode, limit, current_user))
+    if cached is None:
+        search_cache_lookups_total.inc(outcome="miss")
+        return None
+    search_cache_lookups_total.inc(outcome="hit")
+    return list(cached.results)
+
+
+def _invalidate_search_cache(entity_types: frozenset) -> None:
+    search_cache.discard_where(lambda _k, entry: not entry.types.isdisjoint(entity_types))
+
+
+search_index.on_change(_invalidate_search_cache)
+
+
 @router.get("/search", response_model=List[schemas.SearchResult])
-def global_search(
+async def global_search(
     q: str,
+    response: Response,
     limit: int = Query(default=5, ge=1, le=20, description="Max results per entity type"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_current_active_user)
 ):
     q = q.strip()
@@ -139,8 +505,6 @@ def global_search(
             mode = None
     normalised_id = _normalise_identifier(term_str)
 
-    term = f"%{term_str}%"
-
     if len(term_str) < 1 and mode:
         return []
 
@@ -150,197 +514,32 @@ def global_search(
     # ─────────────────────────────────────────
     # 3. EXECUTE SCORED QUERIES
     # ─────────────────────────────────────────
-
-    # --- CLIENTS ---
-    if mode in [None, 'client']:
-        sim_col = _best_similarity(term_str, models.Account.name)
-        acc_query = db.query(models.Account, sim_col.label('sim')).filter(or_(
-            models.Account.name.ilike(term),
-            func.word_similarity(term_str, models.Account.name) > 0.3
-        ))
-        if current_user.access_scope == 'nt_only':
-            acc_query = acc_query.filter(models.Account.brand_affinity.in_(['nt', 'both']))
-        elif current_user.access_scope == 'ds_only':
-            acc_query = acc_query.filter(models.Account.brand_affinity.in_(['ds', 'both']))
-
-        for acc, sim in acc_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(term_str, {'_title_raw': acc.name, '_similarity': float(sim)}, 'name')
-            results.append({
-                "id": acc.id, "type": "client", "title": acc.name,
-                "subtitle": acc.type, "link": f"/clients/{acc.id}",
-                "score": score
-            })
-
-    # --- TICKETS ---
-    if mode in [None, 'ticket']:
-        # Exact ID Match
-        if term_str.isdigit():
-            t_exact = db.query(models.Ticket).filter(models.Ticket.id == int(term_str))
-            if current_user.role == 'client':
-                t_exact = t_exact.filter(models.Ticket.account_id == current_user.account_id)
-            t_exact = t_exact.first()
-
-            if t_exact:
-                results.append({
-                    "id": t_exact.id, "type": "ticket", "title": f"#{t_exact.id} {t_exact.subject}",
-                    "subtitle": f"{t_exact.status} • {t_exact.priority}", "link": f"/tickets/{t_exact.id}",
-                    "score": 0.95
-                })
-
-        # Text Search with scoring
-        sim_col = _best_similarity(term_str, models.Ticket.subject, models.Ticket.description)
-        tick_query = db.query(models.Ticket, sim_col.label('sim')).filter(or_(
-            models.Ticket.subject.ilike(term),
-            models.Ticket.description.ilike(term),
-            models.Ticket.resolution.ilike(term),
-            models.Ticket.id.cast(models.String).ilike(term),
-            func.word_similarity(term_str, models.Ticket.subject) > 0.3,
-            func.word_similarity(term_str, models.Ticket.description) > 0.3
-        ))
-        if current_user.role == 'client':
-            tick_query = tick_query.filter(models.Ticket.account_id == current_user.account_id)
-
-        for t, sim in tick_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            if not any(r['id'] == t.id and r['type'] == 'ticket' for r in results):
-                score = _score_result(
-                    term_str,
-                    {'_title_raw': t.subject, '_similarity': float(sim)},
-                    'subject',
-                    [t.description, t.resolution]
-                )
-                results.append({
-                    "id": t.id, "type": "ticket", "title": f"#{t.id} {t.subject}",
-                    "subtitle": t.status, "link": f"/tickets/{t.id}",
-                    "score": score
-                })
-
-    # --- CONTACTS ---
-    if mode in [None, 'contact'] and current_user.role != 'client':
-        full_name_sim = _best_similarity(term_str, models.Contact.first_name, models.Contact.last_name)
-        con_query = db.query(models.Contact, full_name_sim.label('sim')).filter(or_(
-            models.Contact.first_name.ilike(term),
-            models.Contact.last_name.ilike(term),
-            models.Contact.email.ilike(term),
-            func.word_similarity(term_str, models.Contact.first_name) > 0.3,
-            func.word_similarity(term_str, models.Contact.last_name) > 0.3
-        ))
-        for c, sim in con_query.order_by(full_name_sim.desc()).limit(effective_limit).all():
-            score = _score_result(
-                term_str,
-                {'_title_raw': f"{c.first_name} {c.last_name}", '_similarity': float(sim)},
-                'name'
-            )
-            results.append({
-                "id": c.id, "type": "contact", "title": f"{c.first_name} {c.last_name}",
-                "subtitle": c.email, "link": f"/clients/{c.account_id}",
-                "score": score
-            })
-
-    # --- WIKI ---
-    if mode in [None, 'wiki'] and current_user.role != 'client':
-        sim_col = _best_similarity(term_str, models.Article.title, models.Article.content)
-        nid_filter = models.Article.identifier == normalised_id if normalised_id else models.Article.id.is_(None)
-        wiki_query = db.query(models.Article, sim_col.label('sim')).filter(or_(
-            models.Article.title.ilike(term),
-            models.Article.identifier.ilike(term),
-            nid_filter,
-            models.Article.content.ilike(term),
-            func.word_similarity(term_str, models.Article.title) > 0.3
-        ))
-        for w, sim in wiki_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(
-                term_str,
-                {'_title_raw': w.title, '_similarity': float(sim)},
-                'title',
-                [w.content]
-            )
-            # Boost exact identifier match
-            if w.identifier and (term_str.upper() == w.identifier or normalised_id == w.identifier):
-                score = 0.95
-            results.append({
-                "id": w.id, "type": "wiki", "title": w.title,
-                "subtitle": w.identifier, "link": f"/wiki/{w.slug}",
-                "score": score
-            })
-
-    # --- ASSETS ---
-    if mode in [None, 'asset'] and current_user.role != 'client':
-        sim_col = _best_similarity(term_str, models.Asset.name)
-        asset_query = db.query(models.Asset, sim_col.label('sim')).filter(or_(
-            models.Asset.name.ilike(term),
-            models.Asset.ip_address.ilike(term),
-            models.Asset.serial_number.ilike(term),
-            func.word_similarity(term_str, models.Asset.name) > 0.3
-        ))
-        for a, sim in asset_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(term_str, {'_title_raw': a.name, '_similarity': float(sim)}, 'name')
-            results.append({
-                "id": a.id, "type": "asset", "title": a.name,
-                "subtitle": a.ip_address or a.asset_type,
-                "link": f"/assets/{a.id}",
-                "score": score
-            })
-
-    # --- PROJECTS ---
-    if mode in [None, 'project']:
-        sim_col = _best_similarity(term_str, models.Project.name)
-        proj_query = db.query(models.Project, sim_col.label('sim')).filter(or_(
-            models.Project.name.ilike(term),
-            func.word_similarity(term_str, models.Project.name) > 0.3
-        )).filter(models.Project.is_deleted == False)
-        if current_user.role == 'client':
-            proj_query = proj_query.filter(models.Project.account_id == current_user.account_id)
-        for p, sim in proj_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(term_str, {'_title_raw': p.name, '_similarity': float(sim)}, 'name')
-            results.append({
-                "id": p.id, "type": "project", "title": p.name,
-                "subtitle": p.status, "link": f"/projects/{p.id}",
-                "score": score
-            })
-
-    # --- MILESTONES ---
-    if mode in [None, 'milestone']:
-        sim_col = _best_similarity(term_str, models.Milestone.name)
-        ms_query = db.query(models.Milestone, sim_col.label('sim')).join(
-            models.Project, models.Milestone.project_id == models.Project.id
-        ).filter(or_(
-            models.Milestone.name.ilike(term),
-            func.word_similarity(term_str, models.Milestone.name) > 0.3
-        )).filter(models.Project.is_deleted == False).filter(models.Milestone.is_deleted == False)
-        if current_user.role == 'client':
-            ms_query = ms_query.filter(models.Project.account_id == current_user.account_id)
-        for ms, sim in ms_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(term_str, {'_title_raw': ms.name, '_similarity': float(sim)}, 'name')
-            results.append({
-                "id": ms.id, "type": "milestone", "title": ms.name,
-                "subtitle": ms.status, "link": f"/projects/{ms.project_id}",
-                "score": score
-            })
-
-    # --- PRODUCTS (CATALOG) ---
-    if mode in [None, 'product'] and current_user.role != 'client':
-        sim_col = _best_similarity(term_str, models.Product.name, models.Product.description)
-        prod_query = db.query(models.Product, sim_col.label('sim')).filter(or_(
-            models.Product.name.ilike(term),
-            models.Product.description.ilike(term),
-            func.word_similarity(term_str, models.Product.name) > 0.3
-        )).filter(models.Product.is_active == True)
-        for p, sim in prod_query.order_by(sim_col.desc()).limit(effective_limit).all():
-            score = _score_result(
-                term_str,
-                {'_title_raw': p.name, '_similarity': float(sim)},
-                'name',
-                [p.description]
-            )
-            results.append({
-                "id": p.id, "type": "product", "title": p.name,
-                "subtitle": p.type, "link": f"/catalog/{p.id}",
-                "score": score
-            })
+    cached = _cached_search(term_str, mode, effective_limit, current_user)
+    if cached is not None:
+        results.extend(cached)
+        found, timed_out = cached, []
+    elif SEARCH_INDEX_ENABLED:
+        found = await _timeboxed(db, _search_index, term_str, mode, effective_limit, normalised_id, current_user)
+        if found is None:
+            search_timeouts_total.inc(entity="index")
+            timed_out = _entity_types(mode, current_user)
+        else:
+            results.extend(found)
+            timed_out = []
+    else:
+        found, timed_out = await _search_entities(db, term_str, mode, effective_limit, normalised_id, current_user)
+        results.extend(found)
+
+    if timed_out:
+        log.warning("search %r: %s timed out after %.2fs", term_str, ",".join(timed_out), SEARCH_TIMEOUT_SECONDS)
+        response.headers[PARTIAL_HEADER] = ",".join(timed_out)
+    elif cached is None:
+        search_cache.set(_cache_key(term_str, mode, effective_limit, current_user),
+                         _CachedSearch(found, _entity_types(mode, current_user)))
 
     # ─────────────────────────────────────────
-    # 4. SORT BY RELEVANCE
+    # 4. MERGE BY RELEVANCE
     # ─────────────────────────────────────────
-    results.sort(key=lambda r: r.get('score', 0), reverse=True)
-
-    return results
+    # Each entity's rows arrive ranked from SQL (action shortcuts all score 1.0),
+    # so a k-way merge replaces a full sort.
+    return _merge_ranked(results)
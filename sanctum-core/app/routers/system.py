@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_db, engine, get_async_engine_if_created, replica_engine, replica_router
+from ..db_pool import pool_status
+from ..utils.ttl_cache import cache_stats
+from .. import metrics
+from ..services.token_usage import token_usage_buffer
 import time
 import psutil
 import subprocess
@@ -25,6 +29,13 @@ def api_health_check(db: Session = Depends(get_db)):
             content={"status": "error", "detail": str(e)},
         )
 
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text exposition for this process. Unauthenticated, like /health."""
+    if not metrics.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Metrics disabled"})
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @router.get("/system/health")
 def run_system_diagnostics(db: Session = Depends(get_db)):
     start_time = time.time()
@@ -82,6 +93,23 @@ def run_system_diagnostics(db: Session = Depends(get_db)):
         report["database"]["latency_ms"] = -1
         add_check("Database Ping", "error", str(e))
 
+    # Connection Pool
+    try:
+        pool = pool_status(engine)
+        report["database"]["pool"] = {
+            "checked_out": pool["checked_out"],
+            "overflow": pool["overflow"],
+            "timeouts_total": pool["timeouts_total"],
+            "timeouts_recent": pool["timeouts_recent"],
+        }
+        if pool["timeouts_recent"]:
+            add_check("Connection Pool", "warning",
+                      f"{pool['timeouts_recent']} checkout timeouts in the last {pool['recent_window_s']}s")
+        else:
+            add_check("Connection Pool", "ok", f"{pool['checked_out'] or 0} checked out")
+    except Exception as e:
+        add_check("Connection Pool", "error", str(e))
+
     # Notify Service
     try:
         from ..services.notify_client import health_check as notify_health
@@ -105,6 +133,47 @@ def run_system_diagnostics(db: Session = Depends(get_db)):
     report["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
     return report
 
+def _pool_report(eng) -> dict:
+    # "degraded" follows recent timeouts only, so it clears once the pool recovers.
+    report = pool_status(eng)
+    status = "ok"
+    if report["timeouts_recent"]:
+        status = "degraded"
+    if report["size"] is not None and report["max_overflow"] is not None:
+        capacity = report["size"] + report["max_overflow"]
+        if capacity and report["checked_out"] >= capacity:
+            status = "exhausted"
+    report["status"] = status
+    return report
+
+
+@router.get("/system/pool")
+def get_pool_diagnostics():
+    """Live connection-pool gauges and checkout wait/timeout metrics. No DB round trip.
+
+    The top level is the primary sync engine; ``engines`` reports every
+    engine this worker has built, each with its own metrics.
+    """
+    report = _pool_report(engine)
+    engines = {"sync": dict(report)}
+    async_engine = get_async_engine_if_created()
+    if async_engine is not None:
+        engines["async"] = _pool_report(async_engine.sync_engine)
+    if replica_engine is not None:
+        engines["replica"] = _pool_report(replica_engine)
+    report["engines"] = engines
+    report["replica"] = replica_router.stats()
+    return report
+
+@router.get("/system/caches")
+def get_cache_diagnostics():
+    """Hit/miss/eviction counters for every in-process cache in this worker."""
+    return {
+        "pid": os.getpid(),
+        "caches": cache_stats(),
+        "write_behind": {"api_token_last_used": token_usage_buffer.stats()},
+    }
+
 @router.get("/version")
 def get_version():
     """Return the running git commit SHA. No auth, no DB dependency."""
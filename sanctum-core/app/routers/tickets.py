@@ -1,19 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, text as sa_text
-from typing import List, Optional
+from sqlalchemy import Numeric, cast, exists, func, desc, select, text as sa_text
+from typing import List, Literal, Optional
 from .. import models, schemas, auth
-from ..database import get_db
-from ..services.pagination import pagination_params
+from ..database import get_db, get_async_db, get_read_db
+from ..services.pagination import pagination_params, cursor_params, count_params, count_rows, encode_cursor, total_count_headers
 from ..services.event_bus import event_bus
 from ..services.notification_service import notification_service
 from ..services.ticket_validation import validate_ticket_description, validate_ticket_transition, get_available_transitions, validate_ticket_type, validate_ticket_priority, auto_transition_from_new, SUBSTANTIVE_FIELDS
-from ..services.ticket_query import base_ticket_query, enrich_ticket_response
+from ..services.ticket_query import base_ticket_query, enrich_ticket_response, ticket_list_items, ticket_list_query, time_entry_export_query, unloaded_collection_counts
+from ..services.export import ExportFormat, export_response
 from ..services.milestone_validation import validate_milestone_sealed, check_milestone_completion_advisory
-from ..services.cascade import cascade_from_ticket
+from ..services.cascade import cascade_from_ticket, cascade_milestones
 from ..services.expand import ExpandConfig, get_expand_config, expanded_response, _get_optional_user
+from ..services.etag import etag_matches, make_etag, not_modified, ticket_version
+from ..services import ticket_cache
 from datetime import datetime, timezone
 from uuid import UUID
 from ..services.uuid_resolver import resolve_uuid, get_or_404 as uuid_get_or_404
@@ -30,38 +34,49 @@ def _record_transition(
     changed_by: str = "system",
 ) -> None:
     """Record a status transition with computed duration."""
+    _record_transitions(db, [(ticket_id, from_status, to_status)], changed_by=changed_by)
+
+
+def _record_transitions(db: Session, transitions: list[tuple], changed_by: str = "system") -> None:
+    """Record (ticket_id, from_status, to_status) transitions with computed durations.
+
+    One lookup of each ticket's latest transition, however many tickets.
+    """
+    if not transitions:
+        return
     now = datetime.now(timezone.utc)
 
-    prev = db.query(models.TicketStatusTransition).filter(
-        models.TicketStatusTransition.ticket_id == ticket_id,
-    ).order_by(models.TicketStatusTransition.changed_at.desc()).first()
-
-    duration = None
-    if prev:
-        duration = int((now - prev.changed_at).total_seconds())
-
-    transition = models.TicketStatusTransition(
-        ticket_id=ticket_id,
-        from_status=from_status,
-        to_status=to_status,
-        changed_at=now,
-        changed_by=changed_by,
-        duration_seconds=duration,
-    )
-    db.add(transition)
+    T = models.TicketStatusTransition
+    latest = dict(db.query(T.ticket_id, func.max(T.changed_at)).filter(
+        T.ticket_id.in_({ticket_id for ticket_id, _, _ in transitions}),
+    ).group_by(T.ticket_id).all())
+
+    for ticket_id, from_status, to_status in transitions:
+        prev = latest.get(ticket_id)
+        duration = None
+        if prev:
+            if prev.tzinfo is None:
+                prev = prev.replace(tzinfo=timezone.utc)
+            duration = int((now - prev).total_seconds())
+        latest[ticket_id] = now
+        db.add(T(
+            ticket_id=ticket_id,
+            from_status=from_status,
+            to_status=to_status,
+            changed_at=now,
+            changed_by=changed_by,
+            duration_seconds=duration,
+        ))
     db.flush()
 
-@router.get("")
-def get_tickets(
+def _ticket_filters(
+    current_user: models.User,
     status: Optional[str] = None,
     account_id: Optional[UUID] = None,
     milestone_id: Optional[UUID] = None,
     project_id: Optional[UUID] = None,
-    pagination: dict = Depends(pagination_params),
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db),
-):
-    # Build filter conditions (shared between count and data queries)
+) -> list:
+    """WHERE clauses for ticket lists and exports (over Ticket, Account and Milestone)."""
     filters = [models.Ticket.is_deleted == False]
 
     if current_user.access_scope == 'nt_only':
@@ -86,31 +101,89 @@ def get_tickets(
 
     if project_id:
         filters.append(models.Milestone.project_id == project_id)
+    return filters
 
-    # Lightweight count query (no joinedloads)
-    count_query = db.query(func.count(models.Ticket.id))\
-        .join(models.Account)
-    if project_id:
-        count_query = count_query.join(models.Ticket.milestone)
-    total = count_query.filter(*filters).scalar()
 
-    # Data query with eager loads
-    data_query = base_ticket_query(db)\
-        .join(models.Account)
-    if project_id:
-        data_query = data_query.join(models.Ticket.milestone)
-    query = data_query.filter(*filters)
+@router.get("")
+def get_tickets(
+    status: Optional[str] = None,
+    account_id: Optional[UUID] = None,
+    milestone_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    pagination: dict = Depends(pagination_params),
+    after_id: Optional[int] = Depends(cursor_params),
+    count: str = Depends(count_params),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    # Filter conditions (shared between count and data queries)
+    filters = _ticket_filters(current_user, status, account_id, milestone_id, project_id)
 
     limit, offset = pagination["limit"], pagination["offset"]
-    tickets = query.order_by(models.Ticket.id.desc()).offset(offset).limit(limit).all()
-    items = []
-    for t in tickets:
-        item = jsonable_encoder(schemas.TicketResponse.model_validate(enrich_ticket_response(t, db)))
-        item.pop("description", None)
-        item.pop("resolution", None)
-        item.pop("resolved_description", None)
-        items.append(item)
-    return JSONResponse(content=items, headers={"X-Total-Count": str(total)})
+    if after_id is not None and offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor pagination, not both")
+
+    # Lightweight count query (no joinedloads); skipped or estimated on request
+    count_query = select(models.Ticket.id).join(models.Account)
+    if project_id:
+        count_query = count_query.join(models.Ticket.milestone)
+    total, estimated = count_rows(db, count_query.where(*filters), count)
+
+    # Data query: column projection, no ORM hydration
+    query = ticket_list_query().where(*filters)
+    if after_id is not None:
+        # Keyset: walk the id ordering directly, no OFFSET scan.
+        query = query.where(models.Ticket.id < after_id)
+
+    # One extra row tells us whether another page exists.
+    rows = db.execute(query.order_by(models.Ticket.id.desc()).offset(offset).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    items = ticket_list_items(rows[:limit], db)
+    headers = total_count_headers(total, estimated)
+    if has_more:
+        headers["X-Next-Cursor"] = encode_cursor(items[-1]["id"])
+    return JSONResponse(content=items, headers=headers)
+
+@router.get("/export")
+def export_tickets(
+    status: Optional[str] = None,
+    account_id: Optional[UUID] = None,
+    milestone_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    format: ExportFormat = "ndjson",
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_read_db),
+):
+    """Every ticket matching the GET /tickets filters, streamed in id order (list projection columns)."""
+    filters = _ticket_filters(current_user, status, account_id, milestone_id, project_id)
+    total_hours = func.round(cast(models.Ticket.total_minutes, Numeric) / 60, 2).label('total_hours')
+    stmt = ticket_list_query().add_columns(total_hours).where(*filters).order_by(models.Ticket.id)
+    return export_response(db, stmt, "tickets", format)
+
+@router.get("/time_entries/export")
+def export_time_entries(
+    status: Optional[str] = None,
+    account_id: Optional[UUID] = None,
+    milestone_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    user_id: Optional[UUID] = None,
+    since: Optional[datetime] = Query(None, description="Entries starting at or after this time"),
+    until: Optional[datetime] = Query(None, description="Entries starting before this time"),
+    format: ExportFormat = "ndjson",
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_read_db),
+):
+    """Time entries on tickets matching the GET /tickets filters, streamed in start order."""
+    TE = models.TicketTimeEntry
+    filters = _ticket_filters(current_user, status, account_id, milestone_id, project_id)
+    if user_id:
+        filters.append(TE.user_id == user_id)
+    if since:
+        filters.append(TE.start_time >= since)
+    if until:
+        filters.append(TE.start_time < until)
+    stmt = time_entry_export_query().where(*filters).order_by(TE.start_time, TE.id)
+    return export_response(db, stmt, "time_entries", format)
 
 @router.post("", response_model=schemas.TicketResponse)
 def create_ticket(
@@ -187,13 +260,35 @@ def create_ticket(
 
 
 @router.get("/{ticket_id}", response_model=schemas.TicketResponse)
-def get_ticket_by_id(ticket_id: int, resolve_embeds: bool = False, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
-    ticket = base_ticket_query(db).filter(models.Ticket.id == ticket_id).first()
+def get_ticket_by_id(ticket_id: int, request: Request, resolve_embeds: bool = False, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
+    # Response cache: a hit skips the database entirely (writes invalidate via ORM hooks)
+    cache_key = ticket_cache.entry_key(ticket_id, ticket_cache.variant(expand, resolve_embeds))
+    cached = ticket_cache.get(cache_key)
+    if cached is not None:
+        body, headers = cached
+        if "etag" in headers and etag_matches(request, headers["etag"]):
+            return not_modified(headers["etag"])
+        return Response(body, media_type="application/json", headers=headers)
+
+    # Conditional GET: one version query decides whether anything changed
+    etag = None
+    if not resolve_embeds:
+        version = ticket_version(db, ticket_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        etag = make_etag("ticket", version, request, expand.consumer_type)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    ticket = base_ticket_query(db, expand).filter(models.Ticket.id == ticket_id).first()
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
     t_dict = enrich_ticket_response(ticket, db)
     t_dict['related_tickets'] = []
+    # Collections the expand config left unloaded are counted in SQL instead
+    counts = unloaded_collection_counts(ticket_id, expand, db)
+    t_dict['total_hours'] = counts.get('total_hours', t_dict['total_hours'])
     response_data = schemas.TicketResponse.model_validate(t_dict)
 
     # Build related_tickets from ticket_relations join table (both directions)
@@ -252,40 +347,44 @@ def get_ticket_by_id(ticket_id: int, resolve_embeds: bool = False, expand: Expan
             print(f"Content Engine failed: {e}")
 
     # Populate count fields before filtering
-    response_data.comment_count = len(response_data.comments)
-    response_data.article_count = len(response_data.articles)
+    response_data.comment_count = counts.get('comment_count', len(response_data.comments))
+    response_data.article_count = counts.get('article_count', len(response_data.articles))
     response_data.artefact_count = len(response_data.artefacts)
-    response_data.time_entry_count = len(response_data.time_entries)
-    response_data.material_count = len(response_data.materials)
+    response_data.time_entry_count = counts.get('time_entry_count', len(response_data.time_entries))
+    response_data.material_count = counts.get('material_count', len(response_data.materials))
     response_data.related_ticket_count = len(response_data.related_tickets)
-    response_data.transition_count = len(response_data.transitions)
+    response_data.transition_count = counts.get('transition_count', len(response_data.transitions))
 
     result = jsonable_encoder(response_data)
-    return expanded_response(result, expand, "ticket")
+    response = expanded_response(result, expand, "ticket")
+    if etag:
+        response.headers["ETag"] = etag
+    ticket_cache.put(cache_key, response.body, {
+        k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")
+    })
+    return response
 
 @router.get("/{ticket_id}/transitions", response_model=List[schemas.TicketStatusTransitionResponse])
-def get_ticket_transitions(ticket_id: int, db: Session = Depends(get_db)):
-    ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
-    if not ticket:
+async def get_ticket_transitions(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+    exists = (await db.execute(select(models.Ticket.id).filter(models.Ticket.id == ticket_id))).first()
+    if not exists:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    transitions = db.query(models.TicketStatusTransition).filter(
-        models.TicketStatusTransition.ticket_id == ticket_id,
-    ).order_by(models.TicketStatusTransition.changed_at.asc()).all()
+    transitions = (await db.execute(
+        select(models.TicketStatusTransition).filter(
+            models.TicketStatusTransition.ticket_id == ticket_id,
+        ).order_by(models.TicketStatusTransition.changed_at.asc())
+    )).scalars().all()
     return transitions
 
-@router.put("/{ticket_id}", response_model=schemas.TicketResponse)
-def update_ticket(
-    ticket_id: int,
-    ticket_update: schemas.TicketUpdate,
-    background_tasks: BackgroundTasks,
-    resolve_embeds: bool = False,
-    current_user: Optional[models.User] = Depends(_get_optional_user),
-    db: Session = Depends(get_db),
-):
-    ticket = base_ticket_query(db).filter(models.Ticket.id == ticket_id).first()
-    if not ticket: raise HTTPException(status_code=404, detail="Ticket not found")
-    update_data = ticket_update.model_dump(exclude_unset=True)
+def _ticket_has(db: Session, model, ticket_id: int, *criteria) -> bool:
+    """EXISTS check for a ticket's child rows without loading them."""
+    return db.query(exists().where(model.ticket_id == ticket_id, *criteria)).scalar()
 
+def _validate_ticket_update(db: Session, ticket: models.Ticket, ticket_update: schemas.TicketUpdate, update_data: dict) -> None:
+    """Run every PUT /tickets/{id} gate for ``update_data``; raises HTTPException on the first failure.
+
+    Reads only — nothing is written, so a rejected patch leaves the session clean.
+    """
     # Type/priority validation on update
     if not ticket_update.skip_validation and 'ticket_type' in update_data:
         validate_ticket_type(update_data['ticket_type'], db)
@@ -327,10 +426,7 @@ def update_ticket(
         and update_data.get('status') == 'closed'
         and ticket.status == 'resolved'
     ):
-        has_mirror = db.query(models.Comment).filter(
-            models.Comment.ticket_id == ticket.id,
-            models.Comment.mirror == True,
-        ).first() is not None
+        has_mirror = _ticket_has(db, models.Comment, ticket.id, models.Comment.mirror == True)
         if not has_mirror:
             raise HTTPException(
                 status_code=422,
@@ -347,8 +443,8 @@ def update_ticket(
 
     # Billable item enforcement (BUS-001 D7, replaces time_entry_required)
     if update_data.get('status') == 'resolved' and ticket.status != 'resolved':
-        has_time_entries = len(ticket.time_entries) > 0
-        has_materials = len(ticket.materials) > 0
+        has_time_entries = _ticket_has(db, models.TicketTimeEntry, ticket.id)
+        has_materials = _ticket_has(db, models.TicketMaterial, ticket.id)
         if not has_time_entries and not has_materials:
             raise HTTPException(
                 status_code=422,
@@ -406,19 +502,22 @@ def update_ticket(
         if new_milestone_id and new_milestone_id != ticket.milestone_id:
             validate_milestone_sealed(new_milestone_id, db)
 
-    # Resolve changed_by from soft-auth
-    changed_by = (current_user.full_name if current_user else None) or "system"
 
+def _apply_ticket_update(db: Session, ticket: models.Ticket, update_data: dict) -> tuple[str, list[tuple]]:
+    """Apply a validated patch to ``ticket``.
+
+    Returns the status before the explicit change and the (ticket_id, from, to)
+    transitions to record; cascading and recording are left to the caller.
+    """
+    transitions = []
     # Auto-transition from 'new' → 'open' on substantive field changes (#774)
     if ticket.status == 'new' and 'status' not in update_data:
         if SUBSTANTIVE_FIELDS & set(update_data.keys()):
             applied, auto_from, auto_to = auto_transition_from_new(ticket, db)
             if applied:
-                _record_transition(db, ticket.id, auto_from, auto_to, changed_by=changed_by)
+                transitions.append((ticket.id, auto_from, auto_to))
 
-    was_resolved = ticket.status == 'resolved'
     old_status = ticket.status
-    old_tech_id = ticket.assigned_tech_id
 
     # 1. HANDLE MANY-TO-MANY CONTACTS
     if 'contact_ids' in update_data:
@@ -445,19 +544,23 @@ def update_ticket(
     # 4. GENERIC FIELDS
     for key, value in update_data.items(): setattr(ticket, key, value)
 
-    # 4. CASCADE: ticket status change → milestone → project
-    if ticket.status != old_status and ticket.milestone_id:
-        cascade_from_ticket(ticket, db)
-
-    # Record explicit status transition (skip if auto_transition already recorded it)
+    # Explicit status transition (auto-transition only happens when status is not in the patch)
     if ticket.status != old_status and 'status' in update_data:
-        _record_transition(db, ticket.id, old_status, ticket.status, changed_by=changed_by)
+        transitions.append((ticket.id, old_status, ticket.status))
+    return old_status, transitions
 
-    db.commit()
-
-    # Re-query with full joinedloads after commit to get fresh state
-    ticket = base_ticket_query(db).filter(models.Ticket.id == ticket_id).first()
 
+def _notify_ticket_update(
+    db: Session,
+    ticket: models.Ticket,
+    old_status: str,
+    old_tech_id,
+    was_resolved: bool,
+    changed_by: str,
+    current_user: Optional[models.User],
+    background_tasks: BackgroundTasks,
+) -> None:
+    """Assignment / status notifications and events for a committed ticket update."""
     # 4. NOTIFY: ASSIGNMENT CHANGE
     if ticket.assigned_tech_id and ticket.assigned_tech_id != old_tech_id:
         tech = db.query(models.User).filter(models.User.id == ticket.assigned_tech_id).first()
@@ -526,16 +629,72 @@ def update_ticket(
     if ticket.status == 'resolved' and not was_resolved:
         event_bus.emit("ticket_resolved", ticket, background_tasks)
 
-    t_dict = enrich_ticket_response(ticket, db)
-    t_dict['related_tickets'] = []
-    response_data = schemas.TicketResponse.model_validate(t_dict)
+
+@router.put("/{ticket_id}", response_model=schemas.TicketResponse)
+def update_ticket(
+    ticket_id: int,
+    ticket_update: schemas.TicketUpdate,
+    background_tasks: BackgroundTasks,
+    resolve_embeds: bool = False,
+    return_: Literal["representation", "minimal"] = Query(
+        "representation", alias="return",
+        description="'minimal' returns only id/status/updated_at and skips building the full ticket",
+    ),
+    current_user: Optional[models.User] = Depends(_get_optional_user),
+    db: Session = Depends(get_db),
+):
+    # Plain row load: relations are fetched lazily, only by the gates that need them
+    ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
+    if not ticket: raise HTTPException(status_code=404, detail="Ticket not found")
+    update_data = ticket_update.model_dump(exclude_unset=True)
+
+    _validate_ticket_update(db, ticket, ticket_update, update_data)
+
+    # Resolve changed_by from soft-auth
+    changed_by = (current_user.full_name if current_user else None) or "system"
+
+    was_resolved = ticket.status == 'resolved'
+    old_tech_id = ticket.assigned_tech_id
+    old_status, transitions = _apply_ticket_update(db, ticket, update_data)
+
+    # CASCADE: ticket status change → milestone → project
+    if ticket.status != old_status and ticket.milestone_id:
+        cascade_from_ticket(ticket, db)
+
+    _record_transitions(db, transitions, changed_by=changed_by)
+
+    db.commit()
+
+    if return_ == "minimal":
+        db.refresh(ticket)
+    else:
+        # Re-query with full joinedloads after commit to get fresh state
+        ticket = base_ticket_query(db).filter(models.Ticket.id == ticket_id).first()
+
+    _notify_ticket_update(db, ticket, old_status, old_tech_id, was_resolved, changed_by,
+                          current_user, background_tasks)
 
     # Completion advisory — hint when resolving the last open ticket in a milestone
+    advisory = None
     if ticket.status == 'resolved' and not was_resolved and ticket.milestone_id:
         advisory = check_milestone_completion_advisory(ticket.milestone_id, db)
-        if advisory:
-            response_data.milestone_completion_ready = advisory["milestone_completion_ready"]
-            response_data.milestone_completion_message = advisory["milestone_completion_message"]
+
+    if return_ == "minimal":
+        minimal = {
+            "id": ticket.id,
+            "status": ticket.status,
+            "previous_status": ticket.previous_status,
+            "updated_at": ticket.updated_at,
+            **(advisory or {}),
+        }
+        return JSONResponse(content=jsonable_encoder(minimal))
+
+    t_dict = enrich_ticket_response(ticket, db)
+    t_dict['related_tickets'] = []
+    response_data = schemas.TicketResponse.model_validate(t_dict)
+    if advisory:
+        response_data.milestone_completion_ready = advisory["milestone_completion_ready"]
+        response_data.milestone_completion_message = advisory["milestone_completion_message"]
 
     if resolve_embeds:
         try:
@@ -550,6 +709,71 @@ def update_ticket(
 
     return response_data
 
+@router.post("/bulk")
+def bulk_update_tickets(
+    payload: schemas.TicketBulkUpdate,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Apply per-ticket patches (PUT /tickets/{id} bodies plus ``id``) in one transaction.
+
+    Every item runs the same gates as PUT; a failing item is reported and
+    skipped, or with ``atomic`` the whole batch is rolled back (422).
+    Transitions are recorded together and each affected milestone and project
+    cascades once, after all items are applied.
+    """
+    tickets = {t.id: t for t in db.query(models.Ticket).filter(
+        models.Ticket.id.in_({item.id for item in payload.items})
+    ).all()}
+    changed_by = current_user.full_name or "system"
+
+    results, to_notify, transitions, milestone_ids = [], [], [], set()
+    for item in payload.items:
+        ticket = tickets.get(item.id)
+        if ticket is None:
+            results.append({"id": item.id, "ok": False, "status_code": 404, "detail": "Ticket not found"})
+            continue
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        try:
+            _validate_ticket_update(db, ticket, item, update_data)
+        except HTTPException as e:
+            results.append({"id": item.id, "ok": False, "status_code": e.status_code, "detail": e.detail})
+            continue
+
+        was_resolved = ticket.status == 'resolved'
+        old_tech_id = ticket.assigned_tech_id
+        old_milestone_id = ticket.milestone_id
+        old_status, item_transitions = _apply_ticket_update(db, ticket, update_data)
+        transitions.extend(item_transitions)
+        if ticket.status != old_status or ticket.milestone_id != old_milestone_id:
+            milestone_ids.update((old_milestone_id, ticket.milestone_id))
+        if ticket.status != old_status or ticket.assigned_tech_id != old_tech_id:
+            to_notify.append((ticket, old_status, old_tech_id, was_resolved))
+        results.append({"id": ticket.id, "ok": True, "status": ticket.status})
+
+    failed = sum(1 for r in results if not r["ok"])
+    if payload.atomic and failed:
+        db.rollback()
+        return JSONResponse(status_code=422, content=jsonable_encoder(
+            {"applied": 0, "failed": failed, "results": results}
+        ))
+
+    cascaded = cascade_milestones(milestone_ids, db)
+    _record_transitions(db, transitions, changed_by=changed_by)
+    db.commit()
+
+    for ticket, old_status, old_tech_id, was_resolved in to_notify:
+        _notify_ticket_update(db, ticket, old_status, old_tech_id, was_resolved, changed_by,
+                              current_user, background_tasks)
+
+    return jsonable_encoder({
+        "applied": len(results) - failed,
+        "failed": failed,
+        "results": results,
+        "cascaded": cascaded,
+    })
+
 @router.delete("/{ticket_id}")
 def delete_ticket(ticket_id: int, db: Session = Depends(get_db)):
     tick = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
@@ -740,6 +964,7 @@ def link_ticket_relation(ticket_id: int, body: schemas.TicketRelationCreate, db:
         "INSERT INTO ticket_relations (ticket_id, related_id, relation_type, visibility) VALUES (:a, :b, :rt, :v)"
     ), {"a": ticket_id, "b": related_id, "rt": relation_type, "v": visibility})
     db.commit()
+    ticket_cache.invalidate(ticket_id, related_id)
     return {"status": "linked"}
 
 @router.delete("/{ticket_id}/relations/{related_id}")
@@ -748,4 +973,5 @@ def unlink_ticket_relation(ticket_id: int, related_id: int, db: Session = Depend
         "DELETE FROM ticket_relations WHERE (ticket_id = :a AND related_id = :b) OR (ticket_id = :b AND related_id = :a)"
     ), {"a": ticket_id, "b": related_id})
     db.commit()
+    ticket_cache.invalidate(ticket_id, related_id)
     return {"status": "unlinked"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, joinedload
@@ -14,6 +14,7 @@ import os
 from ..services.content_engine import resolve_content
 from ..services.expand import ExpandConfig, get_expand_config, expanded_response
 from ..services.uuid_resolver import resolve_uuid
+from ..services.etag import article_version, etag_matches, make_etag, not_modified
 
 router = APIRouter(tags=["Wiki"])
 
@@ -146,8 +147,16 @@ def get_articles(
     return JSONResponse(content=result, headers={"X-Total-Count": str(total)})
 
 @router.get("/articles/{slug}", response_model=schemas.ArticleResponse)
-def get_article_detail(slug: str, resolve_embeds: bool = False, inline_embeds: bool = False, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
+def get_article_detail(slug: str, request: Request, resolve_embeds: bool = False, inline_embeds: bool = False, expand: ExpandConfig = Depends(get_expand_config), db: Session = Depends(get_db)):
     article = _resolve_article(db, slug)
+
+    # Conditional GET — not for resolved embeds, whose content lives in other entities
+    etag = None
+    if article and not (resolve_embeds or inline_embeds):
+        etag = make_etag("article", article_version(db, article.id), request, expand.consumer_type)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
     if article:
         # Re-fetch with eager loads
         article = db.query(models.Article).options(joinedload(models.Article.author)).filter(models.Article.id == article.id).first()
@@ -219,7 +228,10 @@ def get_article_detail(slug: str, resolve_embeds: bool = False, inline_embeds: b
             response_data.content = resolve_content(db, response_data.content, inline_mode=True)
 
     result = jsonable_encoder(response_data)
-    return expanded_response(result, expand, "article")
+    response = expanded_response(result, expand, "article")
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 @router.post("/articles", response_model=schemas.ArticleResponse)
 def create_article(article: schemas.ArticleCreate, current_user: models.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
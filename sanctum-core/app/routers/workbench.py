@@ -7,12 +7,13 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy import func as sa_func, case, and_
+from sqlalchemy import func as sa_func, case, and_, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_db, get_async_read_db
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +22,15 @@ router = APIRouter(prefix="/workbench", tags=["Workbench"])
 MAX_PINS = 6
 
 
-def _resolve_workbench_user(current_user: models.User, db: Session) -> models.User:
-    """Service accounts resolve to their account's primary human admin user.
+def _workbench_owner_query(current_user: models.User):
+    """Select the human owner a service account's workbench resolves to.
 
-    This ensures MCP-originated pins appear on the operator's workbench,
-    not the service account's.
+    Returns None when ``current_user`` is not a service account (or has no
+    account), i.e. the workbench is the caller's own.
     """
     if current_user.user_type == "service_account" and current_user.account_id:
         # Try admin first, fall back to any active human user in the account
-        owner = db.query(models.User).filter(
+        return select(models.User).filter(
             models.User.account_id == current_user.account_id,
             models.User.user_type == "human",
             models.User.is_active == True,
@@ -37,63 +38,80 @@ def _resolve_workbench_user(current_user: models.User, db: Session) -> models.Us
             # Prefer admin role, then by earliest created
             (models.User.role != "admin"),
             models.User.id,
-        ).first()
+        ).limit(1)
+    return None
+
+
+def _resolve_workbench_user(current_user: models.User, db: Session) -> models.User:
+    """Service accounts resolve to their account's primary human admin user.
+
+    This ensures MCP-originated pins appear on the operator's workbench,
+    not the service account's.
+    """
+    stmt = _workbench_owner_query(current_user)
+    if stmt is not None:
+        owner = db.execute(stmt).scalars().first()
+        if owner:
+            return owner
+    return current_user
+
+
+async def _resolve_workbench_user_async(current_user: models.User, db: AsyncSession) -> models.User:
+    """Async-session variant of :func:`_resolve_workbench_user`."""
+    stmt = _workbench_owner_query(current_user)
+    if stmt is not None:
+        owner = (await db.execute(stmt)).scalars().first()
         if owner:
             return owner
     return current_user
 
 
 @router.get("", response_model=schemas.WorkbenchListResponse)
-def list_pins(
-    db: Session = Depends(get_db),
+async def list_pins(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     """List pinned projects for the current user with ticket summaries."""
-    target_user = _resolve_workbench_user(current_user, db)
-    pins = (
-        db.query(models.WorkbenchPin)
-        .filter(models.WorkbenchPin.user_id == target_user.id)
-        .order_by(models.WorkbenchPin.position, models.WorkbenchPin.pinned_at)
-        .all()
-    )
-
-    result = []
-    for pin in pins:
-        project = db.query(models.Project).filter(
-            models.Project.id == pin.project_id,
+    target_user = await _resolve_workbench_user_async(current_user, db)
+    rows = (await db.execute(
+        select(models.WorkbenchPin, models.Project, models.Account.name.label("account_name"))
+        .join(models.Project, models.Project.id == models.WorkbenchPin.project_id)
+        .outerjoin(models.Account, models.Account.id == models.Project.account_id)
+        .filter(
+            models.WorkbenchPin.user_id == target_user.id,
             models.Project.is_deleted == False,
-        ).first()
-        if not project:
-            continue
-
-        # Ticket summary via aggregation (tickets link to projects through milestones)
-        project_milestone_ids = [
-            m.id for m in db.query(models.Milestone.id).filter(
-                models.Milestone.project_id == pin.project_id
-            ).all()
-        ]
-        if project_milestone_ids:
-            ticket_stats = (
-                db.query(
-                    sa_func.count(models.Ticket.id).label("total"),
-                    sa_func.sum(
-                        case((models.Ticket.status != "resolved", 1), else_=0)
-                    ).label("open"),
-                    sa_func.sum(
-                        case((models.Ticket.status == "resolved", 1), else_=0)
-                    ).label("resolved"),
-                )
-                .filter(
-                    models.Ticket.milestone_id.in_(project_milestone_ids),
-                    models.Ticket.is_deleted == False,
-                )
-                .first()
+        )
+        .order_by(models.WorkbenchPin.position, models.WorkbenchPin.pinned_at)
+    )).all()
+
+    # Ticket summaries for every pinned project in one aggregate
+    # (tickets link to projects through milestones).
+    stats_by_project = {}
+    project_ids = [project.id for _, project, _ in rows]
+    if project_ids:
+        stats_rows = (await db.execute(
+            select(
+                models.Milestone.project_id,
+                sa_func.count(models.Ticket.id).label("total"),
+                sa_func.sum(
+                    case((models.Ticket.status != "resolved", 1), else_=0)
+                ).label("open"),
+                sa_func.sum(
+                    case((models.Ticket.status == "resolved", 1), else_=0)
+                ).label("resolved"),
             )
-        else:
-            ticket_stats = None
-
-        account = db.query(models.Account).filter(models.Account.id == project.account_id).first()
+            .join(models.Milestone, models.Ticket.milestone_id == models.Milestone.id)
+            .filter(
+                models.Milestone.project_id.in_(project_ids),
+                models.Ticket.is_deleted == False,
+            )
+            .group_by(models.Milestone.project_id)
+        )).all()
+        stats_by_project = {r.project_id: r for r in stats_rows}
 
+    result = []
+    for pin, project, account_name in rows:
+        ticket_stats = stats_by_project.get(project.id)
         result.append(
             schemas.WorkbenchPinResponse(
                 id=pin.id,
@@ -101,7 +119,7 @@ def list_pins(
                 project_id=pin.project_id,
                 project_name=project.name,
                 project_status=project.status,
-                account_name=account.name if account else None,
+                account_name=account_name,
                 position=pin.position,
                 pinned_at=pin.pinned_at,
                 ticket_summary=schemas.TicketSummary(
@@ -378,21 +396,21 @@ def _compute_health(tickets, last_activity_at, milestones):
 
 
 @router.get("/notifications", response_model=schemas.WorkbenchNotificationResponse)
-def get_workbench_notifications(
+async def get_workbench_notifications(
     limit: int = Query(20, le=50),
     since: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     """Get in_app notifications for the current user's pinned projects."""
-    target_user = _resolve_workbench_user(current_user, db)
+    target_user = await _resolve_workbench_user_async(current_user, db)
 
     # Get pinned project IDs
-    pinned_project_ids = [
-        p.project_id for p in db.query(models.WorkbenchPin.project_id).filter(
+    pinned_project_ids = (await db.execute(
+        select(models.WorkbenchPin.project_id).filter(
             models.WorkbenchPin.user_id == target_user.id
-        ).all()
-    ]
+        )
+    )).scalars().all()
 
     if not pinned_project_ids:
         return schemas.WorkbenchNotificationResponse(notifications=[], unread_count=0)
@@ -410,16 +428,17 @@ def get_workbench_notifications(
         base_filter = and_(base_filter, models.Notification.created_at > since)
 
     # Query notifications
-    notifications = (
-        db.query(models.Notification)
+    notifications = (await db.execute(
+        select(models.Notification)
         .filter(base_filter)
         .order_by(models.Notification.created_at.desc())
         .limit(limit)
-        .all()
-    )
+    )).scalars().all()
 
     # Count total unread (same filter, no limit)
-    unread_count = db.query(sa_func.count(models.Notification.id)).filter(base_filter).scalar()
+    unread_count = (await db.execute(
+        select(sa_func.count(models.Notification.id)).filter(base_filter)
+    )).scalar()
 
     return schemas.WorkbenchNotificationResponse(
         notifications=[
@@ -442,46 +461,42 @@ def get_workbench_notifications(
 
 
 @router.get("/{project_id}/summary", response_model=schemas.WorkbenchSummaryResponse)
-def get_workbench_summary(
+async def get_workbench_summary(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     """Lightweight workbench summary for a single pinned project."""
-    project = db.query(models.Project).filter(
+    project = (await db.execute(select(models.Project).filter(
         models.Project.id == project_id,
         models.Project.is_deleted == False,
-    ).first()
+    ))).scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    account = db.query(models.Account).filter(
-        models.Account.id == project.account_id
-    ).first()
+    account = await db.get(models.Account, project.account_id) if project.account_id else None
 
     # Fetch milestones ordered by sequence
-    milestones = (
-        db.query(models.Milestone)
+    milestones = (await db.execute(
+        select(models.Milestone)
         .filter(
             models.Milestone.project_id == project_id,
             models.Milestone.is_deleted == False,
         )
         .order_by(models.Milestone.sequence)
-        .all()
-    )
+    )).scalars().all()
     milestone_ids = [m.id for m in milestones]
 
     # Fetch all tickets across milestones
     tickets = []
     if milestone_ids:
-        tickets = (
-            db.query(models.Ticket)
+        tickets = (await db.execute(
+            select(models.Ticket)
             .filter(
                 models.Ticket.milestone_id.in_(milestone_ids),
                 models.Ticket.is_deleted == False,
             )
-            .all()
-        )
+        )).scalars().all()
 
     # Progress
     total = len(tickets)
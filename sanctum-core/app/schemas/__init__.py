@@ -26,7 +26,7 @@ from .strategy import (
 from .operations import (
     TimeEntryCreate, TimeEntryUpdate, TimeEntryResponse,
     TicketMaterialCreate, TicketMaterialUpdate, TicketMaterialResponse,
-    TicketCreate, TicketUpdate, TicketResponse, TicketRelationResponse, TicketRelationCreate, TicketStatusTransitionResponse, LeadSchema
+    TicketCreate, TicketUpdate, TicketBulkItem, TicketBulkUpdate, TicketResponse, TicketRelationResponse, TicketRelationCreate, TicketStatusTransitionResponse, LeadSchema
 )
 from .knowledge import (
     CommentCreate, CommentResponse,
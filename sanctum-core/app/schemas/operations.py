@@ -145,6 +145,13 @@ class TicketUpdate(SanctumBase):
     )
     skip_validation: bool = Field(default=False, exclude=True)
 
+class TicketBulkItem(TicketUpdate):
+    id: int
+
+class TicketBulkUpdate(SanctumBase):
+    items: List[TicketBulkItem] = Field(..., min_length=1, max_length=500)
+    atomic: bool = Field(default=False, description="Roll back every item if any item fails validation")
+
 class TicketRelationResponse(SanctumBase):
     id: int
     subject: str
@@ -134,3 +134,48 @@ def cascade_from_milestone(milestone, db: Session) -> None:
         )
         project.status = new_proj_status
         db.flush()
+
+
+def cascade_milestones(milestone_ids, db: Session) -> dict:
+    """Recompute each milestone once, then each affected project once.
+
+    For bulk ticket changes: instead of cascade_from_ticket() per ticket,
+    collect the milestones touched (old and new) and cascade them together.
+    Pending ticket changes are flushed first so the recompute sees them.
+    Returns {"milestones": n, "projects": n} — how many changed status.
+    """
+    milestone_ids = {mid for mid in milestone_ids if mid}
+    changed = {"milestones": 0, "projects": 0}
+    if not milestone_ids:
+        return changed
+    db.flush()
+
+    project_ids = set()
+    milestones = db.query(models.Milestone).filter(models.Milestone.id.in_(milestone_ids)).all()
+    for milestone in milestones:
+        new_ms_status = compute_milestone_status(milestone, db)
+        if new_ms_status:
+            logger.info(
+                "Cascade: bulk → milestone '%s' status %s → %s",
+                milestone.name, milestone.status, new_ms_status,
+            )
+            milestone.status = new_ms_status
+            changed["milestones"] += 1
+            if milestone.project_id:
+                project_ids.add(milestone.project_id)
+    if not project_ids:
+        return changed
+    db.flush()
+
+    projects = db.query(models.Project).filter(models.Project.id.in_(project_ids)).all()
+    for project in projects:
+        new_proj_status = compute_project_status(project, db)
+        if new_proj_status:
+            logger.info(
+                "Cascade: bulk → project '%s' status %s → %s",
+                project.name, project.status, new_proj_status,
+            )
+            project.status = new_proj_status
+            changed["projects"] += 1
+    db.flush()
+    return changed
@@ -1,8 +1,6 @@
 import os
-import resend
 import logging
 from dotenv import load_dotenv
-from jinja2 import Environment, FileSystemLoader
 
 load_dotenv()
 
@@ -15,17 +13,23 @@ class EmailService:
         self.api_key = os.getenv("RESEND_API_KEY")
         if not self.api_key:
             logger.warning("RESEND_API_KEY not found in env. Email disabled.")
-        else:
-            resend.api_key = self.api_key
 
         self.system_email = "notifications@digitalsanctum.com.au"
         self.admin_email = "hello@digitalsanctum.com.au"
 
-        # JINJA2 SETUP
+        # JINJA2 SETUP (built on first render — see `env`)
         # Points to app/templates/emails/
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        template_dir = os.path.join(current_dir, '../templates/emails')
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        self.template_dir = os.path.join(current_dir, '../templates/emails')
+        self._env = None
+
+    @property
+    def env(self):
+        """Jinja2 environment, created on first use so workers don't import jinja2 at boot."""
+        if self._env is None:
+            from jinja2 import Environment, FileSystemLoader
+            self._env = Environment(loader=FileSystemLoader(self.template_dir))
+        return self._env
 
     def send_template(self, to_email: str, subject: str, template_name: str, context: dict, cc_emails=None, attachments=None):
         """
@@ -75,6 +79,8 @@ class EmailService:
 
                 if att_list: params["attachments"] = att_list
 
+            import resend  # deferred: only needed when a real send happens
+            resend.api_key = self.api_key
             resp = resend.Emails.send(params)
             logger.info(f"Email Sent ID: {resp.get('id')}")
             return True
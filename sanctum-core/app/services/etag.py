@@ -0,0 +1,191 @@
+"""
+Strong ETags and conditional GET for detail endpoints.
+
+A detail route reads a version row first — one SELECT of the entity's
+updated_at plus high-water marks (count, latest updated_at / created_at) of
+every child table its response draws on — and answers a matching
+If-None-Match with 304 before loading or serialising anything:
+
+    version = ticket_version(db, ticket_id)
+    if version is None:
+        raise HTTPException(status_code=404, ...)
+    etag = make_etag("ticket", version, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    ...
+    response = expanded_response(result, expand, "ticket")
+    response.headers["ETag"] = etag
+
+The query string is part of the tag (expand/resolve flags change the body),
+and so is the consumer type, which picks the default expand. Responses with
+resolved embeds are not tagged: their content depends on other entities.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import String, and_, cast, func, or_, select, union
+from sqlalchemy.orm import Session
+
+from .. import models
+
+
+def make_etag(entity: str, version: tuple, request: Request, consumer_type: str = "") -> str:
+    """Strong ETag for one representation of an entity version."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(repr((entity, version, query, consumer_type)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+# ---------------------------------------------------------------------------
+# Version rows
+# ---------------------------------------------------------------------------
+
+def _stamp(model):
+    """updated_at, falling back to created_at for rows never updated."""
+    created = getattr(model, "created_at", None)
+    return model.updated_at if created is None else func.coalesce(model.updated_at, created)
+
+
+def _marks(table, *where, stamp=None) -> list:
+    """[count, max(stamp)] of the rows matching ``where``, as scalar subqueries."""
+    marks = [select(func.count()).select_from(table).where(*where).scalar_subquery()]
+    if stamp is not None:
+        marks.append(select(func.max(stamp)).select_from(table).where(*where).scalar_subquery())
+    return marks
+
+
+def _link_marks(link_table, owner_col, owner_id, target, target_col) -> list:
+    """Count, newest target stamp and max target id across a many-to-many link."""
+    joined = link_table.join(target, target_col == target.id)
+    where = owner_col == owner_id
+    stamp = _stamp(target) if hasattr(target, "updated_at") else None
+    return [
+        *_marks(joined, where, stamp=stamp),
+        select(func.max(cast(target.id, String))).select_from(joined).where(where).scalar_subquery(),
+    ]
+
+
+def _artefact_marks(entity_type: str, entity_id) -> list:
+    links = models.ArtefactLink
+    joined = links.__table__.join(models.Artefact, links.artefact_id == models.Artefact.id)
+    return _marks(joined, links.linked_entity_type == entity_type,
+                  links.linked_entity_id == str(entity_id), stamp=_stamp(models.Artefact))
+
+
+def _version(db: Session, base, columns: list, *where, joins=()) -> Optional[tuple]:
+    stmt = select(*columns).select_from(base)
+    for target, onclause, outer in joins:
+        stmt = stmt.join(target, onclause, isouter=outer)
+    row = db.execute(stmt.where(*where)).first()
+    return tuple(row) if row is not None else None
+
+
+def ticket_version(db: Session, ticket_id: int) -> Optional[tuple]:
+    """Version row for GET /tickets/{id}; None if the ticket does not exist."""
+    T = models.Ticket
+    tid = ticket_id
+    invoice_ids = union(
+        select(models.InvoiceItem.invoice_id).where(models.InvoiceItem.ticket_id == tid),
+        select(models.TicketTimeEntry.invoice_id).where(models.TicketTimeEntry.ticket_id == tid),
+        select(models.TicketMaterial.invoice_id).where(models.TicketMaterial.ticket_id == tid),
+    )
+    other = T.__table__.alias("related_ticket")
+    rel = models.ticket_relations
+    related = rel.join(other, or_(
+        and_(rel.c.ticket_id == tid, rel.c.related_id == other.c.id),
+        and_(rel.c.related_id == tid, rel.c.ticket_id == other.c.id),
+    ))
+    columns = [
+        T.updated_at, T.created_at,
+        models.Account.name, models.Milestone.updated_at, models.Milestone.name,
+        models.Project.updated_at, models.Project.name,
+        *_marks(models.Comment, models.Comment.ticket_id == tid, stamp=_stamp(models.Comment)),
+        *_marks(models.TicketTimeEntry, models.TicketTimeEntry.ticket_id == tid,
+                stamp=_stamp(models.TicketTimeEntry)),
+        *_marks(models.TicketMaterial, models.TicketMaterial.ticket_id == tid,
+                stamp=_stamp(models.TicketMaterial)),
+        *_marks(models.TicketStatusTransition, models.TicketStatusTransition.ticket_id == tid,
+                stamp=models.TicketStatusTransition.changed_at),
+        *_marks(models.Invoice, models.Invoice.id.in_(invoice_ids),
+                stamp=func.coalesce(models.Invoice.updated_at, models.Invoice.generated_at)),
+        *_link_marks(models.ticket_contacts, models.ticket_contacts.c.ticket_id, tid,
+                     models.Contact, models.ticket_contacts.c.contact_id),
+        *_link_marks(models.ticket_articles, models.ticket_articles.c.ticket_id, tid,
+                     models.Article, models.ticket_articles.c.article_id),
+        *_link_marks(models.ticket_assets, models.ticket_assets.c.ticket_id, tid,
+                     models.Asset, models.ticket_assets.c.asset_id),
+        *_marks(related, or_(rel.c.ticket_id == tid, rel.c.related_id == tid),
+                stamp=func.coalesce(other.c.updated_at, other.c.created_at)),
+        *_artefact_marks("ticket", tid),
+    ]
+    return _version(
+        db, T, columns, T.id == ticket_id,
+        joins=(
+            (models.Account, T.account_id == models.Account.id, True),
+            (models.Milestone, T.milestone_id == models.Milestone.id, True),
+            (models.Project, models.Milestone.project_id == models.Project.id, True),
+        ),
+    )
+
+
+def project_version(db: Session, project_id) -> Optional[tuple]:
+    """Version row for GET /projects/{id}; None if the project does not exist."""
+    P, M, T = models.Project, models.Milestone, models.Ticket
+    project_tickets = T.__table__.join(M, T.milestone_id == M.id)
+    project_entries = models.TicketTimeEntry.__table__.join(
+        project_tickets, models.TicketTimeEntry.ticket_id == T.id,
+    )
+    columns = [
+        P.updated_at, P.created_at, models.Account.name,
+        models.Template.updated_at, models.Template.name,
+        *_marks(M, M.project_id == project_id, stamp=_stamp(M)),
+        *_marks(project_tickets, M.project_id == project_id, stamp=_stamp(T)),
+        *_marks(project_entries, M.project_id == project_id, stamp=_stamp(models.TicketTimeEntry)),
+        *_artefact_marks("project", project_id),
+    ]
+    return _version(
+        db, P, columns, P.id == project_id,
+        joins=(
+            (models.Account, P.account_id == models.Account.id, True),
+            (models.Template, P.template_id == models.Template.id, True),
+        ),
+    )
+
+
+def article_version(db: Session, article_id) -> Optional[tuple]:
+    """Version row for GET /articles/{slug}; None if the article does not exist."""
+    A = models.Article
+    other = A.__table__.alias("related_article")
+    rel = models.article_relations
+    related = rel.join(other, or_(
+        and_(rel.c.article_id == article_id, rel.c.related_id == other.c.id),
+        and_(rel.c.related_id == article_id, rel.c.article_id == other.c.id),
+    ))
+    columns = [
+        A.updated_at, A.created_at, models.User.full_name,
+        *_marks(models.ArticleHistory, models.ArticleHistory.article_id == article_id,
+                stamp=models.ArticleHistory.snapshot_at),
+        *_marks(related, or_(rel.c.article_id == article_id, rel.c.related_id == article_id),
+                stamp=func.coalesce(other.c.updated_at, other.c.created_at)),
+        *_artefact_marks("article", article_id),
+    ]
+    return _version(
+        db, A, columns, A.id == article_id,
+        joins=((models.User, A.author_id == models.User.id, True),),
+    )
@@ -5,8 +5,10 @@ from .. import models
 # NEW IMPORTS
 from .notification_router import notification_router
 from .notification_service import notification_service
+from ..metrics import track_task
 
 import json
+import threading
 from datetime import datetime
 from sqlalchemy.orm import Session
 
@@ -17,6 +19,10 @@ Listener = Callable[[EventPayload, BackgroundTasks], None]
 class EventBus:
     def __init__(self):
         self._subscribers: Dict[str, List[Listener]] = {}
+        # Dynamic-rule jobs currently running. Counted inside the job, so a
+        # request that fails before its BackgroundTasks run leaves no residue.
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
 
     def subscribe(self, event_type: str, listener: Listener):
         """Register a hardcoded code-based listener."""
@@ -37,7 +43,17 @@ class EventBus:
                     print(f"[EventBus] Hardcoded Listener Error: {e}")
 
         # 2. Dynamic Rules (The Weaver)
-        background_tasks.add_task(self._process_dynamic_rules, event_type, payload)
+        background_tasks.add_task(self._run_dynamic_rules, event_type, payload)
+
+    def _run_dynamic_rules(self, event_type: str, payload: Any):
+        with self._in_flight_lock:
+            self.in_flight += 1
+        try:
+            with track_task(f"event_rules:{event_type}"):
+                self._process_dynamic_rules(event_type, payload)
+        finally:
+            with self._in_flight_lock:
+                self.in_flight -= 1
 
     def _process_dynamic_rules(self, event_type: str, payload: Any):
         """
@@ -15,10 +15,10 @@ import json
 from fastapi import Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth import get_current_user
-from ..database import get_db
+from ..database import get_async_db
 from ..principals import Principal, ServicePrincipal
 from .. import models
 
@@ -76,7 +76,7 @@ def _default_expand_all(consumer_type: str) -> bool:
 
 async def _get_optional_user(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Optional[Principal]:
     """Soft auth — returns the resolved principal (user or service) if a
     valid token is present, None otherwise.
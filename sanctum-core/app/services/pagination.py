@@ -1,5 +1,5 @@
 """
-Shared pagination dependency for list endpoints.
+Shared pagination dependencies for list endpoints.
 
 Usage:
     from ..services.pagination import pagination_params
@@ -7,8 +7,33 @@ Usage:
     @router.get("/things")
     def list_things(pagination: dict = Depends(pagination_params)):
         limit, offset = pagination["limit"], pagination["offset"]
+
+Keyset (cursor) pagination for lists ordered by ``id DESC``:
+
+    @router.get("/things")
+    def list_things(after_id: Optional[int] = Depends(cursor_params),
+                    count: str = Depends(count_params)):
+        rows = query.filter(Thing.id < after_id) ... .limit(limit + 1)
+        headers = {"X-Next-Cursor": encode_cursor(rows[limit - 1].id)} if len(rows) > limit else {}
+
+``after_id`` is the last id of the previous page; ``cursor`` is the same thing
+wrapped as an opaque token (``X-Next-Cursor``). Keyset pages cost the same at
+any depth, unlike OFFSET.
+
+``count_params`` lets callers that page through history skip the
+``count(*)`` (``none``) or take the planner's estimate (``estimate``).
 """
-from fastapi import Query
+import base64
+import binascii
+import json
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+CountMode = Literal["exact", "estimate", "none"]
 
 
 def pagination_params(
@@ -16,3 +41,83 @@ def pagination_params(
     offset: int = Query(0, ge=0),
 ) -> dict:
     return {"limit": limit, "offset": offset}
+
+
+# ─────────────────────────────────────────────
+# KEYSET CURSORS
+# ─────────────────────────────────────────────
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"after_id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))["after_id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(after_id, int) or isinstance(after_id, bool) or after_id < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+
+def cursor_params(
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset: only rows with a lower id"),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor from the previous page"),
+) -> Optional[int]:
+    """The keyset position, or None for offset pagination."""
+    if cursor is not None:
+        if after_id is not None:
+            raise HTTPException(status_code=400, detail="Pass either cursor or after_id, not both")
+        return decode_cursor(cursor)
+    return after_id
+
+
+# ─────────────────────────────────────────────
+# TOTAL COUNTS
+# ─────────────────────────────────────────────
+
+def count_params(
+    count: CountMode = Query("exact", description="Total in X-Total-Count: exact, estimate (planner) or none"),
+) -> str:
+    return count
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def count_rows(db, stmt, mode: str) -> tuple[Optional[int], bool]:
+    """Total rows ``stmt`` (a SELECT) returns, as ``(total, estimated)``.
+
+    ``estimate`` reads the Postgres planner's row estimate (pg_class /
+    pg_statistic) instead of scanning; other dialects count exactly.
+    ``none`` returns ``(None, False)`` without touching the database.
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate" and db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(_Explain(stmt)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+    return db.execute(select(func.count()).select_from(stmt.subquery())).scalar(), False
+
+
+def total_count_headers(total: Optional[int], estimated: bool) -> dict:
+    if total is None:
+        return {}
+    headers = {"X-Total-Count": str(total)}
+    if estimated:
+        headers["X-Total-Count-Estimated"] = "true"
+    return headers
@@ -1,4 +1,3 @@
-from fpdf import FPDF
 import os
 from datetime import datetime
 
@@ -44,6 +43,7 @@ class PDFService:
         pdf.add_font("DejaVuMono", "B", f"{font_dir}/DejaVuSansMono-Bold.ttf", uni=True)
 
     def generate_invoice_pdf(self, invoice_data):
+        from fpdf import FPDF  # deferred: fpdf + font tables cost ~0.3s at import
 
         self.ensure_directory()
 
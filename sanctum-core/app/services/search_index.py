@@ -0,0 +1,445 @@
+"""
+Unified global-search index (``search_documents``).
+
+``GET /search`` used to run one ILIKE + ``word_similarity`` query per entity
+type on every keystroke. Instead, each searchable row (accounts, tickets,
+contacts, wiki articles, assets, projects, milestones, products) is mirrored
+into one ``search_documents`` row carrying its display fields, match text and
+scope columns, so a search is a single indexed query (see
+:func:`search_query`).
+
+Maintenance is incremental: an ``after_flush`` hook on every ``Session``
+(sync, and async via ``AsyncSession.sync_session``) re-renders the documents
+for indexed objects the flush inserted, changed or deleted, inside the same
+transaction. A project change also re-renders its milestones, which inherit
+the project's account and deleted state. Bulk ``query.update()`` / raw SQL
+writes bypass the hook — ``scripts/rebuild_search_index.py`` rebuilds from
+scratch.
+
+On Postgres a trigger (migration ``a7c3e9f1b2d4``) fills ``search_vector``
+from title/identifier (weight A) and body (weight B); elsewhere it stays NULL
+and matching uses ILIKE / ``word_similarity`` only.
+
+``SEARCH_INDEX_ENABLED=false`` stops maintenance and sends ``/search`` back to
+the per-entity queries. Either way, :func:`on_change` listeners hear which
+entity types each commit touched.
+"""
+import logging
+import os
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, delete, event, func, insert, literal, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from .. import models
+
+log = logging.getLogger(__name__)
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+# Minimum word_similarity for a fuzzy-only match (same cut-off as the per-entity queries).
+FUZZY_THRESHOLD = 0.3
+# Fuzzy-only scores stay below the substring tiers.
+FUZZY_CAP = 0.55
+
+ENTITY_TYPES = ("client", "ticket", "contact", "wiki", "asset", "project", "milestone", "product")
+
+SD = models.SearchDocument
+
+# The search_vector trigger from migration a7c3e9f1b2d4, for Postgres
+# databases built with ``create_all`` (benchmarks, scratch environments).
+POSTGRES_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION search_documents_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', COALESCE(NEW.title, '') || ' ' || COALESCE(NEW.identifier, '')), 'A') ||
+            setweight(to_tsvector('simple', COALESCE(NEW.body, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS search_documents_vector_trigger ON search_documents",
+    """
+    CREATE TRIGGER search_documents_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, identifier, body ON search_documents
+    FOR EACH ROW EXECUTE FUNCTION search_documents_vector_update()
+    """,
+)
+
+
+def _join(*parts) -> Optional[str]:
+    text = " ".join(p for p in parts if p)
+    return text or None
+
+
+# ─────────────────────────────────────────────
+# DOCUMENT BUILDERS
+# Each returns the row to store, or None when the entity must not be searchable.
+# ─────────────────────────────────────────────
+
+def _account_doc(a, ctx):
+    return dict(entity_type="client", entity_id=str(a.id), title=a.name or "", subtitle=a.type,
+                link=f"/clients/{a.id}", account_id=a.id, brand_affinity=a.brand_affinity)
+
+
+def _ticket_doc(t, ctx):
+    return dict(entity_type="ticket", entity_id=str(t.id), title=t.subject or "", subtitle=t.status,
+                body=_join(t.description, t.resolution), identifier=str(t.id),
+                link=f"/tickets/{t.id}", account_id=t.account_id)
+
+
+def _contact_doc(c, ctx):
+    return dict(entity_type="contact", entity_id=str(c.id), title=f"{c.first_name} {c.last_name}",
+                subtitle=c.email, body=c.email, link=f"/clients/{c.account_id}",
+                account_id=c.account_id, staff_only=True)
+
+
+def _article_doc(w, ctx):
+    return dict(entity_type="wiki", entity_id=str(w.id), title=w.title or "", subtitle=w.identifier,
+                body=w.content, identifier=w.identifier, link=f"/wiki/{w.slug}", staff_only=True)
+
+
+def _asset_doc(a, ctx):
+    return dict(entity_type="asset", entity_id=str(a.id), title=a.name or "",
+                subtitle=a.ip_address or a.asset_type, body=_join(a.ip_address, a.serial_number),
+                link=f"/assets/{a.id}", account_id=a.account_id, staff_only=True)
+
+
+def _project_doc(p, ctx):
+    if p.is_deleted:
+        return None
+    return dict(entity_type="project", entity_id=str(p.id), title=p.name or "", subtitle=p.status,
+                link=f"/projects/{p.id}", account_id=p.account_id)
+
+
+def _milestone_doc(m, ctx):
+    project = ctx.project(m.project_id)
+    if m.is_deleted or project is None or project.is_deleted:
+        return None
+    return dict(entity_type="milestone", entity_id=str(m.id), title=m.name or "", subtitle=m.status,
+                link=f"/projects/{m.project_id}", account_id=project.account_id)
+
+
+def _product_doc(p, ctx):
+    if p.is_active is False:
+        return None
+    return dict(entity_type="product", entity_id=str(p.id), title=p.name or "", subtitle=p.type,
+                body=p.description, link=f"/catalog/{p.id}", staff_only=True)
+
+
+_BUILDERS = {
+    models.Account: ("client", _account_doc),
+    models.Ticket: ("ticket", _ticket_doc),
+    models.Contact: ("contact", _contact_doc),
+    models.Article: ("wiki", _article_doc),
+    models.Asset: ("asset", _asset_doc),
+    models.Project: ("project", _project_doc),
+    models.Milestone: ("milestone", _milestone_doc),
+    models.Product: ("product", _product_doc),
+}
+
+_MODEL_FOR_TYPE = {entity_type: model for model, (entity_type, _) in _BUILDERS.items()}
+
+_DOC_DEFAULTS = dict(subtitle=None, body=None, identifier=None, account_id=None,
+                     brand_affinity=None, staff_only=False)
+
+
+class _Context:
+    """Project lookups for milestone documents, memoised per sync."""
+
+    def __init__(self, conn, projects: Optional[dict] = None):
+        self._conn = conn
+        self._projects = projects if projects is not None else {}
+
+    def project(self, project_id):
+        if project_id is None:
+            return None
+        if project_id not in self._projects:
+            self._projects[project_id] = self._conn.execute(
+                select(models.Project.account_id, models.Project.is_deleted)
+                .where(models.Project.id == project_id)
+            ).first()
+        return self._projects[project_id]
+
+
+def document_for(obj, ctx) -> Optional[dict]:
+    entity_type, build = _BUILDERS[type(obj)]
+    doc = build(obj, ctx)
+    return {**_DOC_DEFAULTS, **doc} if doc is not None else None
+
+
+def _key(obj) -> tuple[str, str]:
+    return _BUILDERS[type(obj)][0], str(obj.id)
+
+
+def sync_documents(conn, changed: Iterable = (), removed: Iterable[tuple[str, str]] = ()) -> int:
+    """Replace the documents for ``changed`` objects and drop ``removed`` keys.
+
+    ``conn`` is a Core connection (or Session) in the writer's transaction.
+    Returns the number of documents written.
+    """
+    ctx = _Context(conn)
+    keys = set(removed)
+    docs = []
+    for obj in changed:
+        keys.add(_key(obj))
+        doc = document_for(obj, ctx)
+        if doc is not None:
+            docs.append(doc)
+    if not keys:
+        return 0
+    conn.execute(delete(SD).where(tuple_(SD.entity_type, SD.entity_id).in_(list(keys))))
+    if docs:
+        conn.execute(insert(SD), docs)
+    return len(docs)
+
+
+def _milestones_of(conn, project_ids) -> list:
+    return conn.execute(
+        select(models.Milestone.id, models.Milestone.project_id, models.Milestone.name,
+               models.Milestone.status, models.Milestone.is_deleted)
+        .where(models.Milestone.project_id.in_(project_ids))
+    ).all()
+
+
+class _MilestoneRow:
+    """Adapts a Core row so the milestone builder (and ``_key``) accept it."""
+
+    __slots__ = ("id", "project_id", "name", "status", "is_deleted")
+
+    def __init__(self, row):
+        self.id, self.project_id, self.name, self.status, self.is_deleted = row
+
+
+_BUILDERS[_MilestoneRow] = _BUILDERS[models.Milestone]
+
+
+# ─────────────────────────────────────────────
+# FLUSH HOOK
+# ─────────────────────────────────────────────
+
+_PENDING_TYPES = "search_index.changed_types"
+
+_change_listeners: list = []
+
+
+def on_change(listener) -> None:
+    """Call ``listener(entity_types)`` after each commit that wrote indexed entities.
+
+    Fires whether or not the index itself is maintained, so result caches can
+    invalidate by entity type. Listener errors are logged, never raised.
+    """
+    _change_listeners.append(listener)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    changed = {}
+    removed = set()
+    for obj in session.new:
+        if type(obj) in _BUILDERS:
+            changed[id(obj)] = obj
+    for obj in session.dirty:
+        if type(obj) in _BUILDERS and session.is_modified(obj, include_collections=False):
+            changed[id(obj)] = obj
+    for obj in session.deleted:
+        if type(obj) in _BUILDERS:
+            removed.add(_key(obj))
+    if not changed and not removed:
+        return
+
+    projects = [o.id for o in changed.values() if type(o) is models.Project]
+    types = {_key(o)[0] for o in changed.values()} | {entity_type for entity_type, _ in removed}
+    if projects:
+        types.add("milestone")
+    session.info.setdefault(_PENDING_TYPES, set()).update(types)
+
+    if not SEARCH_INDEX_ENABLED:
+        return
+    conn = session.connection()
+    try:
+        with conn.begin_nested():
+            pending = {_key(o) for o in changed.values()}
+            extra = []
+            if projects:
+                for row in _milestones_of(conn, projects):
+                    ms = _MilestoneRow(row)
+                    if _key(ms) not in pending:
+                        extra.append(ms)
+            sync_documents(conn, [*changed.values(), *extra], removed)
+    except Exception:
+        # Never fail the user's write over the index; a rebuild repairs drift.
+        log.exception("search index sync failed (%d changed, %d removed)", len(changed), len(removed))
+
+
+def _after_commit(session: Session) -> None:
+    types = session.info.pop(_PENDING_TYPES, None)
+    if not types:
+        return
+    for listener in _change_listeners:
+        try:
+            listener(frozenset(types))
+        except Exception:
+            log.exception("search index change listener failed")
+
+
+def _after_transaction_end(session: Session, transaction) -> None:
+    # A rolled-back outer transaction changed nothing; don't carry its types forward.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_TYPES, None)
+
+
+_HOOKS = (
+    ("after_flush", _after_flush),
+    ("after_commit", _after_commit),
+    ("after_transaction_end", _after_transaction_end),
+)
+
+_installed = False
+
+
+def install() -> None:
+    """Attach the flush / commit hooks to every Session. Idempotent."""
+    global _installed
+    if not _installed:
+        for name, fn in _HOOKS:
+            event.listen(Session, name, fn)
+        _installed = True
+
+
+def uninstall() -> None:
+    global _installed
+    if _installed:
+        for name, fn in _HOOKS:
+            event.remove(Session, name, fn)
+        _installed = False
+
+
+# ─────────────────────────────────────────────
+# REBUILD
+# ─────────────────────────────────────────────
+
+def rebuild(db: Session, entity_types: Optional[Iterable[str]] = None, batch_size: int = 500) -> dict:
+    """Re-render every document of ``entity_types`` (default: all). Returns counts per type.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    types = list(entity_types or ENTITY_TYPES)
+    unknown = set(types) - set(ENTITY_TYPES)
+    if unknown:
+        raise ValueError(f"unknown entity types: {sorted(unknown)}")
+
+    projects = {
+        row.id: row for row in db.execute(
+            select(models.Project.id, models.Project.account_id, models.Project.is_deleted)
+        )
+    } if "milestone" in types else {}
+    ctx = _Context(db, projects)
+
+    counts = {}
+    for entity_type in types:
+        model = _MODEL_FOR_TYPE[entity_type]
+        db.execute(delete(SD).where(SD.entity_type == entity_type))
+        written = 0
+        batch = []
+        for obj in db.execute(select(model).execution_options(yield_per=batch_size)).scalars():
+            doc = document_for(obj, ctx)
+            if doc is not None:
+                batch.append(doc)
+            if len(batch) >= batch_size:
+                db.execute(insert(SD), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            db.execute(insert(SD), batch)
+            written += len(batch)
+        counts[entity_type] = written
+        db.expunge_all()
+    return counts
+
+
+# ─────────────────────────────────────────────
+# QUERY
+# ─────────────────────────────────────────────
+
+def tier_score(term_str: str, title, contents=(), sim=None, exact=None):
+    """SQL relevance tier for one row.
+
+    0.95 exact identifier (``exact``) or exact title; 0.8 title contains the
+    term; 0.6 any of ``contents`` contains it; otherwise ``sim`` capped at
+    0.55 so a fuzzy hit never outranks a substring hit.
+    """
+    term = f"%{term_str}%"
+    whens = []
+    if exact is not None:
+        whens.append((exact, 0.95))
+    whens.append((func.lower(title) == term_str.lower(), 0.95))
+    whens.append((title.ilike(term), 0.8))
+    if contents:
+        whens.append((or_(*(c.ilike(term) for c in contents)), 0.6))
+    sim = func.coalesce(sim, 0.0) if sim is not None else literal(0.0)
+    return case(*whens, else_=case((sim > FUZZY_CAP, FUZZY_CAP), else_=sim))
+
+
+def search_query(term_str: str, mode: Optional[str], per_type_limit: int, normalised_id: Optional[str],
+                 current_user, dialect_name: str):
+    """One statement returning the top ``per_type_limit`` documents per entity type.
+
+    Rows carry the display fields plus ``score`` (:func:`tier_score`, with the
+    identifier boost for tickets and wiki articles) and come back grouped by
+    entity type, best first, ready for a k-way merge. On Postgres ``ts_rank``
+    breaks ties within a tier.
+    """
+    term = f"%{term_str}%"
+    sim = func.word_similarity(term_str, SD.title)
+
+    identifiers = {term_str, term_str.upper()}
+    if normalised_id:
+        identifiers.add(normalised_id)
+    exact = SD.identifier.in_(sorted(identifiers))
+
+    match = [
+        SD.title.ilike(term),
+        SD.body.ilike(term),
+        SD.identifier.ilike(term),
+        exact,
+        sim > FUZZY_THRESHOLD,
+    ]
+    order = []
+    if dialect_name == "postgresql":
+        tsquery = func.websearch_to_tsquery("simple", term_str)
+        match.append(SD.search_vector.op("@@")(tsquery))
+        order.append(func.ts_rank(SD.search_vector, tsquery).desc())
+
+    filters = [or_(*match)]
+    if mode:
+        filters.append(SD.entity_type == mode)
+    if current_user.role == "client":
+        filters.append(SD.staff_only == False)
+        filters.append(or_(SD.entity_type == "client", SD.account_id == current_user.account_id))
+    if current_user.access_scope == "nt_only":
+        filters.append(or_(SD.entity_type != "client", SD.brand_affinity.in_(["nt", "both"])))
+    elif current_user.access_scope == "ds_only":
+        filters.append(or_(SD.entity_type != "client", SD.brand_affinity.in_(["ds", "both"])))
+
+    score = tier_score(term_str, SD.title, [SD.body], sim,
+                       exact=and_(exact, SD.entity_type.in_(["ticket", "wiki"])))
+    rank = func.row_number().over(
+        partition_by=SD.entity_type,
+        order_by=(score.desc(), *order, sim.desc()),
+    )
+    ranked = select(
+        SD.entity_type, SD.entity_id, SD.title, SD.subtitle, SD.link,
+        score.label("score"),
+        rank.label("rn"),
+    ).where(*filters).subquery()
+    return (
+        select(ranked)
+        .where(ranked.c.rn <= per_type_limit)
+        .order_by(ranked.c.entity_type, ranked.c.rn)
+    )
+
+
+def parse_entity_id(entity_type: str, entity_id: str):
+    return int(entity_id) if entity_type == "ticket" else uuid.UUID(entity_id)
@@ -1,12 +1,12 @@
 import asyncio
 import socket
 import ssl
-import requests
-import dns.resolver
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
 from datetime import datetime
 
+# requests, dnspython, Playwright and BeautifulSoup are imported inside the
+# passes that use them so importing this module (the worker does at boot)
+# stays cheap.
+
 class SentinelEngine:
     def __init__(self):
         self.results = []
@@ -21,6 +21,9 @@ class SentinelEngine:
         self._run_dns_pass(domain)
 
         # 2. THE DEEP SCAN (Playwright)
+        from playwright.async_api import async_playwright
+        from bs4 import BeautifulSoup
+
         async with async_playwright() as p:
             try:
                 browser = await p.chromium.launch(headless=True)
@@ -56,6 +59,8 @@ class SentinelEngine:
         self.results.append({"category": category, "item": item, "status": status, "comment": str(comment)})
 
     def _run_network_pass(self, domain):
+        import requests
+
         try:
             r = requests.get(f"https://{domain}", timeout=10)
             h = r.headers
@@ -64,6 +69,8 @@ class SentinelEngine:
         except: pass
 
     def _run_dns_pass(self, domain):
+        import dns.resolver
+
         try:
             mx = dns.resolver.resolve(domain, 'MX')
             self._add_item("DNS", "MX Records", "Green", f"Found {len(mx)} mail servers")
@@ -0,0 +1,278 @@
+"""
+Response cache for GET /tickets/{id}.
+
+Entries are the rendered JSON body plus response headers, keyed by ticket id,
+the expand set, resolve_embeds and the consumer type. They live in a
+key-value backend:
+
+- ``memory`` (default): a per-worker TTLCache, reported at /system/caches.
+- a shared store: set ``TICKET_CACHE_BACKEND=module:factory``. The factory
+  returns an object with ``get(key)``, ``set(key, value, ttl)`` and
+  ``delete(key)`` that takes string values. RedisBackend adapts a redis-py
+  style client.
+
+Invalidation does not enumerate keys. Every entry key embeds a generation
+token, one per ticket plus a global one. Invalidating deletes the token, and
+the next reader mints a fresh random one, so older entries are never read
+again and age out by TTL. Tokens are random, never counters, so a token lost
+to eviction cannot bring stale entries back.
+
+install() hooks the ORM session. After each commit it invalidates every
+ticket whose row, comments, time entries, materials, transitions or artefact
+links were written, plus the tickets related to an updated ticket (their
+detail lists its subject and status). Writes to entities a ticket detail only
+displays (accounts, projects, contacts, invoices, ...) invalidate everything.
+Raw-SQL writes bypass the hooks and must call invalidate() themselves.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import uuid
+from typing import Optional, Protocol
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+
+from .. import metrics, models
+from ..utils.ttl_cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+TICKET_CACHE_BACKEND = os.getenv("TICKET_CACHE_BACKEND", "memory")
+TICKET_CACHE_SIZE = int(os.getenv("TICKET_CACHE_SIZE", "1024"))
+TICKET_CACHE_TTL = float(os.getenv("TICKET_CACHE_TTL", "120"))
+
+_PREFIX = "tickets.detail"
+_GLOBAL_GENERATION = f"{_PREFIX}:gen"
+_PENDING = "ticket_cache.pending"
+_ALL = "*"
+
+ticket_cache_lookups_total = metrics.counter(
+    "sanctum_ticket_cache_lookups_total",
+    "Ticket detail response cache lookups by outcome (hit, miss).",
+    ("outcome",),
+)
+ticket_cache_invalidations_total = metrics.counter(
+    "sanctum_ticket_cache_invalidations_total",
+    "Ticket detail cache invalidations by scope (ticket, all).",
+    ("scope",),
+)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+    def set(self, key: str, value: str, ttl: float) -> None: ...
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryBackend:
+    """Per-worker backend on a TTLCache (TICKET_CACHE_SIZE = 0 disables)."""
+
+    def __init__(self, maxsize: int = TICKET_CACHE_SIZE, ttl: float = TICKET_CACHE_TTL):
+        self.cache = TTLCache(_PREFIX, maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.pop(key)
+
+
+class RedisBackend:
+    """Shared backend over a redis-py compatible client (``get`` / ``set(ex=)`` / ``delete``)."""
+
+    def __init__(self, client, prefix: str = "sanctum:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+def _load_backend(spec: str) -> CacheBackend:
+    if spec == "memory":
+        return MemoryBackend()
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+_backend: CacheBackend = _load_backend(TICKET_CACHE_BACKEND)
+
+
+def set_backend(backend: CacheBackend) -> CacheBackend:
+    """Swap the backend (tests, or wiring a shared store at startup); returns the old one."""
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+def _safe(op, *args, default=None):
+    # The cache is an optimisation: a failing shared store must not fail the request.
+    try:
+        return op(*args)
+    except Exception:
+        log.exception("ticket cache backend error")
+        return default
+
+
+def _generation(key: str) -> str:
+    token = _safe(_backend.get, key)
+    if token is None:
+        token = uuid.uuid4().hex[:12]
+        _safe(_backend.set, key, token, TICKET_CACHE_TTL)
+    return token
+
+
+# ─────────────────────────────────────────────
+# LOOKUP / STORE
+# ─────────────────────────────────────────────
+
+def variant(expand, resolve_embeds: bool) -> str:
+    """The part of the key that selects one representation of a ticket."""
+    fields = "all" if expand.expand_all else ",".join(sorted(expand.fields)) or "none"
+    return f"{fields}|{int(resolve_embeds)}|{expand.consumer_type}"
+
+
+def entry_key(ticket_id: int, variant_key: str) -> str:
+    """Key under the current generations. Compute once per request, before reading the DB,
+    so a write committed mid-request leaves the stored entry unreachable."""
+    ticket_generation = _generation(f"{_PREFIX}:gen:{ticket_id}")
+    return f"{_PREFIX}:{_generation(_GLOBAL_GENERATION)}:{ticket_id}:{ticket_generation}:{variant_key}"
+
+
+def get(key: str) -> Optional[tuple[bytes, dict]]:
+    raw = _safe(_backend.get, key)
+    ticket_cache_lookups_total.inc(outcome="hit" if raw is not None else "miss")
+    if raw is None:
+        return None
+    entry = json.loads(raw)
+    return entry["body"].encode(), entry["headers"]
+
+
+def put(key: str, body: bytes, headers: dict) -> None:
+    entry = json.dumps({"body": body.decode(), "headers": headers})
+    _safe(_backend.set, key, entry, TICKET_CACHE_TTL)
+
+
+def invalidate(*ticket_ids: int) -> None:
+    for ticket_id in ticket_ids:
+        _safe(_backend.delete, f"{_PREFIX}:gen:{ticket_id}")
+    if ticket_ids:
+        ticket_cache_invalidations_total.inc(len(ticket_ids), scope="ticket")
+
+
+def invalidate_all() -> None:
+    _safe(_backend.delete, _GLOBAL_GENERATION)
+    ticket_cache_invalidations_total.inc(scope="all")
+
+
+# ─────────────────────────────────────────────
+# ORM HOOKS
+# ─────────────────────────────────────────────
+
+_TICKET_CHILDREN = (
+    models.Comment, models.TicketTimeEntry, models.TicketMaterial, models.TicketStatusTransition,
+)
+# Shown inside a ticket detail but keyed elsewhere; a write drops every entry.
+_DISPLAYED = (
+    models.Account, models.Milestone, models.Project, models.Contact, models.Article,
+    models.Asset, models.Invoice, models.Artefact, models.Product,
+)
+
+
+def _touched(session: Session) -> tuple[set, set, bool]:
+    """(ticket ids written, ticket ids updated in place, whether a displayed entity changed)."""
+    tickets, updated, displayed = set(), set(), False
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, models.Ticket):
+            if obj.id is not None:
+                tickets.add(obj.id)
+                if obj in session.dirty:
+                    updated.add(obj.id)
+        elif isinstance(obj, _TICKET_CHILDREN):
+            if obj.ticket_id is not None:
+                tickets.add(obj.ticket_id)
+        elif isinstance(obj, models.ArtefactLink):
+            if obj.linked_entity_type == "ticket" and str(obj.linked_entity_id).isdigit():
+                tickets.add(int(obj.linked_entity_id))
+        elif isinstance(obj, _DISPLAYED):
+            displayed = True
+    return tickets, updated, displayed
+
+
+def _related(session: Session, ticket_ids: set) -> set:
+    rel = models.ticket_relations
+    rows = session.connection().execute(
+        select(rel.c.ticket_id, rel.c.related_id)
+        .where(or_(rel.c.ticket_id.in_(ticket_ids), rel.c.related_id.in_(ticket_ids)))
+    )
+    return {ticket_id for row in rows for ticket_id in row}
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    tickets, updated, displayed = _touched(session)
+    if updated:
+        try:
+            tickets |= _related(session, updated)
+        except Exception:
+            log.exception("ticket cache: related ticket lookup failed")
+            displayed = True
+    if tickets or displayed:
+        pending = session.info.setdefault(_PENDING, set())
+        pending.update(tickets)
+        if displayed:
+            pending.add(_ALL)
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        invalidate_all()
+        pending.discard(_ALL)
+    invalidate(*pending)
+
+
+def _after_transaction_end(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+_HOOKS = (
+    ("after_flush", _after_flush),
+    ("after_commit", _after_commit),
+    ("after_transaction_end", _after_transaction_end),
+)
+
+_installed = False
+
+
+def install() -> None:
+    """Attach the flush / commit hooks to every Session. Idempotent."""
+    global _installed
+    if not _installed:
+        for name, fn in _HOOKS:
+            event.listen(Session, name, fn)
+        _installed = True
+
+
+def uninstall() -> None:
+    global _installed
+    if _installed:
+        for name, fn in _HOOKS:
+            event.remove(Session, name, fn)
+        _installed = False
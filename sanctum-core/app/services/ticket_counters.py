@@ -0,0 +1,227 @@
+"""
+Denormalised ticket effort counters.
+
+tickets.comment_count, time_entry_count, material_count and total_minutes
+mirror the ticket's child rows so lists, summaries and Ticket.total_hours
+read one row instead of loading or counting time entries, materials and
+comments.
+
+install() hooks every ORM flush: inserts, deletes and edits of those child
+rows become ``col = col + delta`` UPDATEs on the owning tickets, in the same
+transaction as the write. Increments rather than recounts, so concurrent
+writers to one ticket serialise on its row lock instead of overwriting each
+other's totals. Writes that bypass the ORM (raw SQL, bulk query.update())
+are not seen — repair with scripts/ticket_counters.py, which uses
+recount() / drift() below.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, event, func, inspect, or_, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from .. import models
+
+COUNTER_COLUMNS = ("comment_count", "time_entry_count", "material_count", "total_minutes")
+
+_EXPIRE = "ticket_counters.expire"
+
+
+class EntryMinutes(FunctionElement):
+    """Whole minutes between a time entry's start and end (as TicketTimeEntry.duration_minutes)."""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(EntryMinutes)
+def _compile_entry_minutes(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return (f"((CAST(strftime('%s', {end}) AS INTEGER)"
+            f" - CAST(strftime('%s', {start}) AS INTEGER)) / 60)")
+
+
+@compiles(EntryMinutes, "postgresql")
+def _compile_entry_minutes_pg(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"CAST(TRUNC(EXTRACT(EPOCH FROM ({end} - {start})) / 60) AS INTEGER)"
+
+
+# ─────────────────────────────────────────────
+# LIVE VALUES (recount / drift)
+# ─────────────────────────────────────────────
+
+def _count_of(column):
+    return (
+        select(func.count())
+        .select_from(column.table)
+        .where(column == models.Ticket.id)
+        .correlate(models.Ticket)
+        .scalar_subquery()
+    )
+
+
+def _live_columns() -> dict:
+    TE = models.TicketTimeEntry
+    return {
+        "comment_count": _count_of(models.Comment.ticket_id),
+        "time_entry_count": _count_of(TE.ticket_id),
+        "material_count": _count_of(models.TicketMaterial.ticket_id),
+        "total_minutes": (
+            select(func.coalesce(func.sum(EntryMinutes(TE.start_time, TE.end_time)), 0))
+            .where(TE.ticket_id == models.Ticket.id)
+            .correlate(models.Ticket)
+            .scalar_subquery()
+        ),
+    }
+
+
+def recount(db: Session, ticket_ids: Optional[Iterable[int]] = None) -> int:
+    """Rewrite the counters from the child tables; every ticket when ``ticket_ids`` is None.
+
+    Returns the number of tickets updated. The caller commits.
+    """
+    # Pin updated_at so Ticket's onupdate doesn't stamp every recounted row.
+    stmt = update(models.Ticket).values(**_live_columns(), updated_at=models.Ticket.updated_at)
+    if ticket_ids is not None:
+        stmt = stmt.where(models.Ticket.id.in_(list(ticket_ids)))
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def drift(db: Session, limit: Optional[int] = None) -> list[dict]:
+    """Tickets whose stored counters disagree with the child tables.
+
+    Each row: ``{"id", "<column>": (stored, live), ...}`` for the columns that differ.
+    """
+    T = models.Ticket
+    live = {name: expr.label(f"live_{name}") for name, expr in _live_columns().items()}
+    stmt = (
+        select(T.id, *(getattr(T, name) for name in COUNTER_COLUMNS), *live.values())
+        .where(or_(*(getattr(T, name) != live[name] for name in COUNTER_COLUMNS)))
+        .order_by(T.id)
+        .limit(limit)
+    )
+    report = []
+    for row in db.execute(stmt):
+        m = row._mapping
+        item = {"id": m["id"]}
+        for name in COUNTER_COLUMNS:
+            if m[name] != m[f"live_{name}"]:
+                item[name] = (m[name], m[f"live_{name}"])
+        report.append(item)
+    return report
+
+
+# ─────────────────────────────────────────────
+# FLUSH HOOKS
+# ─────────────────────────────────────────────
+
+def _minutes(start, end) -> int:
+    if not (start and end):
+        return 0
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        # A naive value assigned over a loaded aware one (or vice versa): read naive as UTC
+        start, end = (d if d.tzinfo else d.replace(tzinfo=timezone.utc) for d in (start, end))
+    return int((end - start).total_seconds() / 60)
+
+
+def _committed(obj, attr):
+    """Value of ``attr`` as last loaded from the database (before this flush's changes)."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def _contribution(obj, committed: bool) -> tuple[Optional[int], dict]:
+    """(ticket_id, {counter: delta}) one child row adds to its ticket."""
+    value = (lambda attr: _committed(obj, attr)) if committed else (lambda attr: getattr(obj, attr))
+    if isinstance(obj, models.Comment):
+        return value("ticket_id"), {"comment_count": 1}
+    if isinstance(obj, models.TicketMaterial):
+        return value("ticket_id"), {"material_count": 1}
+    if isinstance(obj, models.TicketTimeEntry):
+        return value("ticket_id"), {
+            "time_entry_count": 1,
+            "total_minutes": _minutes(value("start_time"), value("end_time")),
+        }
+    return None, {}
+
+
+_CHILDREN = (models.Comment, models.TicketMaterial, models.TicketTimeEntry)
+
+
+def _deltas(session: Session) -> dict[int, dict]:
+    deltas: dict[int, dict] = defaultdict(lambda: defaultdict(int))
+
+    def apply(obj, committed: bool, sign: int) -> None:
+        ticket_id, contribution = _contribution(obj, committed)
+        if ticket_id is not None:
+            for column, amount in contribution.items():
+                deltas[ticket_id][column] += sign * amount
+
+    for obj in session.new:
+        if isinstance(obj, _CHILDREN):
+            apply(obj, committed=False, sign=1)
+    for obj in session.deleted:
+        if isinstance(obj, _CHILDREN):
+            apply(obj, committed=True, sign=-1)
+    for obj in session.dirty:
+        if isinstance(obj, _CHILDREN) and session.is_modified(obj, include_collections=False):
+            apply(obj, committed=True, sign=-1)
+            apply(obj, committed=False, sign=1)
+    return {tid: {c: d for c, d in cols.items() if d} for tid, cols in deltas.items()
+            if any(cols.values())}
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    deltas = _deltas(session)
+    if not deltas:
+        return
+    table = models.Ticket.__table__
+    connection = session.connection()
+    for ticket_id, columns in deltas.items():
+        values = {table.c[name]: table.c[name] + delta for name, delta in columns.items()}
+        # A child row changing is not a ticket edit: keep updated_at out of onupdate's reach.
+        values[table.c.updated_at] = table.c.updated_at
+        connection.execute(update(table).where(table.c.id == ticket_id).values(values))
+    session.info.setdefault(_EXPIRE, set()).update(deltas)
+
+
+def _after_flush_postexec(session: Session, flush_context) -> None:
+    # The UPDATEs bypassed the identity map; reload counters on next access.
+    for ticket_id in session.info.pop(_EXPIRE, ()):
+        ticket = session.identity_map.get(inspect(models.Ticket).identity_key_from_primary_key((ticket_id,)))
+        if ticket is not None:
+            session.expire(ticket, list(COUNTER_COLUMNS))
+
+
+_HOOKS = (
+    ("after_flush", _after_flush),
+    ("after_flush_postexec", _after_flush_postexec),
+)
+
+_installed = False
+
+
+def install() -> None:
+    """Attach the flush hooks to every Session. Idempotent."""
+    global _installed
+    if not _installed:
+        for name, fn in _HOOKS:
+            event.listen(Session, name, fn)
+        _installed = True
+
+
+def uninstall() -> None:
+    global _installed
+    if _installed:
+        for name, fn in _HOOKS:
+            event.remove(Session, name, fn)
+        _installed = False
@@ -4,9 +4,19 @@ Centralised ticket query builder.
 All ticket endpoints that return TicketResponse should use base_ticket_query()
 to ensure joinedload chains stay in sync with the schema. When a new relationship
 is added to TicketResponse, update TICKET_RESPONSE_OPTIONS here — not in every endpoint.
+
+Ticket detail passes its ExpandConfig to base_ticket_query() so only the
+expanded collections are loaded; unloaded ones are counted with
+unloaded_collection_counts().
+
+List endpoints use ticket_list_query() / ticket_list_items() instead: a column
+projection with counts and total hours read from the ticket row or counted in SQL.
 """
-from sqlalchemy.orm import Session, joinedload
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
 from .. import models
+from .ticket_counters import EntryMinutes
 from .ticket_validation import get_available_transitions
 
 
@@ -27,20 +37,72 @@ TICKET_RESPONSE_OPTIONS = (
 )
 
 
-def base_ticket_query(db: Session):
-    """Return a Ticket query pre-loaded with all TicketResponse relationships."""
-    return db.query(models.Ticket).options(*TICKET_RESPONSE_OPTIONS)
+def base_ticket_query(db: Session, expand=None):
+    """Return a Ticket query pre-loaded with all TicketResponse relationships.
+
+    With an ExpandConfig, loads only what that response keeps (see
+    ticket_detail_options()).
+    """
+    options = TICKET_RESPONSE_OPTIONS if expand is None else ticket_detail_options(expand)
+    return db.query(models.Ticket).options(*options)
 
 
-def enrich_ticket_response(ticket, db: Session) -> dict:
+def related_invoices_by_ticket(ticket_ids, db: Session) -> dict[int, list[dict]]:
+    """Invoices linked to each ticket via InvoiceItem, in one ``IN`` query.
+
+    Tickets without invoices are absent from the result.
     """
-    Build a dict from a fully-loaded Ticket ORM object that is ready
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return {}
+    rows = db.execute(
+        select(models.InvoiceItem.ticket_id, models.Invoice.id,
+               models.Invoice.status, models.Invoice.total_amount)
+        .join(models.Invoice, models.InvoiceItem.invoice_id == models.Invoice.id)
+        .where(models.InvoiceItem.ticket_id.in_(ticket_ids))
+        .distinct()
+    ).all()
+    by_ticket: dict[int, dict] = {}
+    for ticket_id, invoice_id, status, total_amount in rows:
+        by_ticket.setdefault(ticket_id, {})[invoice_id] = {
+            'id': invoice_id, 'status': status, 'total_amount': total_amount,
+        }
+    return {ticket_id: list(invoices.values()) for ticket_id, invoices in by_ticket.items()}
+
+
+def available_transitions_by_state(states, db: Session) -> dict[tuple, list[str]]:
+    """get_available_transitions once per distinct (status, ticket_type, previous_status)."""
+    return {
+        (status, ticket_type, previous_status): get_available_transitions(
+            status, db, ticket_type=ticket_type, previous_status=previous_status,
+        )
+        for status, ticket_type, previous_status in set(states)
+    }
+
+
+def enrich_ticket_responses(tickets, db: Session) -> list[dict]:
+    """
+    Build dicts from fully-loaded Ticket ORM objects that are ready
     for schemas.TicketResponse serialisation.
 
     Handles: account_name, milestone_name, project_id/name,
     comment author_name, time_entry/material invoice_status,
     total_hours, related_invoices, available_transitions.
+    Related invoices and transitions are resolved for the whole batch.
     """
+    invoices = related_invoices_by_ticket((t.id for t in tickets), db)
+    transitions = available_transitions_by_state(
+        ((t.status, t.ticket_type, t.previous_status) for t in tickets), db,
+    )
+    return [_enrich(t, invoices, transitions) for t in tickets]
+
+
+def enrich_ticket_response(ticket, db: Session) -> dict:
+    """Single-ticket form of enrich_ticket_responses()."""
+    return enrich_ticket_responses([ticket], db)[0]
+
+
+def _enrich(ticket, invoices: dict, transitions: dict) -> dict:
     t_dict = ticket.__dict__.copy()
 
     # Account
@@ -83,20 +145,193 @@ def enrich_ticket_response(ticket, db: Session) -> dict:
     t_dict['transitions'] = ticket.status_transitions
 
     # Related invoices (via InvoiceItem join)
-    linked_items = db.query(models.InvoiceItem).options(
-        joinedload(models.InvoiceItem.invoice)
-    ).filter(models.InvoiceItem.ticket_id == ticket.id).all()
-    unique_invoices = {}
-    for item in linked_items:
-        if item.invoice:
-            unique_invoices[item.invoice.id] = item.invoice
-    t_dict['related_invoices'] = list(unique_invoices.values())
+    t_dict['related_invoices'] = invoices.get(ticket.id, [])
 
     # Transitions
-    t_dict['available_transitions'] = get_available_transitions(
-        ticket.status, db,
-        ticket_type=ticket.ticket_type,
-        previous_status=ticket.previous_status,
+    t_dict['available_transitions'] = list(
+        transitions[(ticket.status, ticket.ticket_type, ticket.previous_status)]
     )
 
     return t_dict
+
+
+# ---------------------------------------------------------------------------
+# List projection
+# ---------------------------------------------------------------------------
+# GET /tickets returns a few columns per row, so it selects them directly
+# instead of hydrating the TICKET_RESPONSE_OPTIONS graph: scalar columns
+# (including the effort counters), joined names, and the remaining counts as
+# correlated subqueries. description and resolution are deliberately not selected.
+
+def _count_of(column):
+    return (
+        select(func.count())
+        .select_from(column.table)
+        .where(column == models.Ticket.id)
+        .correlate(models.Ticket)
+        .scalar_subquery()
+    )
+
+
+# Comment / time entry / material counts and total minutes are denormalised
+# onto tickets (services/ticket_counters.py); articles and transitions are
+# still counted per row.
+_COUNT_COLUMNS = {
+    'comment_count': models.Ticket.comment_count,
+    'article_count': _count_of(models.ticket_articles.c.ticket_id),
+    'time_entry_count': models.Ticket.time_entry_count,
+    'material_count': models.Ticket.material_count,
+    'transition_count': _count_of(models.TicketStatusTransition.ticket_id),
+}
+
+_TOTAL_MINUTES = models.Ticket.total_minutes
+
+TICKET_LIST_COLUMNS = (
+    models.Ticket.id,
+    models.Ticket.account_id,
+    models.Ticket.subject,
+    models.Ticket.status,
+    models.Ticket.priority,
+    models.Ticket.ticket_type,
+    models.Ticket.previous_status,
+    models.Ticket.assigned_tech_id,
+    models.Ticket.milestone_id,
+    models.Ticket.resolution_comment_id,
+    models.Ticket.no_billable,
+    models.Ticket.no_billable_reason,
+    models.Ticket.phase_criteria,
+    models.Ticket.created_at,
+    models.Ticket.updated_at,
+    models.Ticket.closed_at,
+    models.Account.name.label('account_name'),
+    models.Milestone.name.label('milestone_name'),
+    models.Project.id.label('project_id'),
+    models.Project.name.label('project_name'),
+    *(column.label(name) for name, column in _COUNT_COLUMNS.items()),
+    _TOTAL_MINUTES.label('total_minutes'),
+)
+
+
+def ticket_list_query():
+    """SELECT of TICKET_LIST_COLUMNS; filters apply to Ticket, Account and Milestone.
+
+    Account is inner-joined (as the old list query did); milestone and
+    project are optional.
+    """
+    return (
+        select(*TICKET_LIST_COLUMNS)
+        .join(models.Account, models.Ticket.account_id == models.Account.id)
+        .outerjoin(models.Milestone, models.Ticket.milestone_id == models.Milestone.id)
+        .outerjoin(models.Project, models.Milestone.project_id == models.Project.id)
+    )
+
+
+def ticket_list_items(rows, db: Session) -> list[dict]:
+    """Serialise ticket_list_query() rows to JSON-ready dicts — no ORM objects."""
+    items = [dict(row._mapping) for row in rows]
+    invoices = related_invoices_by_ticket((item['id'] for item in items), db)
+    transitions = available_transitions_by_state(
+        ((item['status'], item['ticket_type'], item['previous_status']) for item in items), db,
+    )
+    for item in items:
+        item['total_hours'] = round((item.pop('total_minutes') or 0) / 60, 2)
+        item['related_invoices'] = invoices.get(item['id'], [])
+        item['available_transitions'] = list(
+            transitions[(item['status'], item['ticket_type'], item['previous_status'])]
+        )
+    return jsonable_encoder(items)
+
+
+def time_entry_export_query():
+    """SELECT of ticket time entries for export; filters apply to Ticket, Account and Milestone.
+
+    duration_minutes is computed in SQL (EntryMinutes) so the rows stream
+    without loading the ORM objects.
+    """
+    TE = models.TicketTimeEntry
+    return (
+        select(
+            TE.id,
+            TE.ticket_id,
+            models.Ticket.subject.label('ticket_subject'),
+            models.Ticket.account_id,
+            models.Account.name.label('account_name'),
+            models.Milestone.project_id,
+            TE.user_id,
+            models.User.full_name.label('user_name'),
+            TE.product_id,
+            models.Product.name.label('product_name'),
+            TE.start_time,
+            TE.end_time,
+            EntryMinutes(TE.start_time, TE.end_time).label('duration_minutes'),
+            TE.description,
+            TE.cached_rate,
+            TE.invoice_id,
+            TE.created_at,
+        )
+        .join(models.Ticket, TE.ticket_id == models.Ticket.id)
+        .join(models.Account, models.Ticket.account_id == models.Account.id)
+        .outerjoin(models.Milestone, models.Ticket.milestone_id == models.Milestone.id)
+        .outerjoin(models.User, TE.user_id == models.User.id)
+        .outerjoin(models.Product, TE.product_id == models.Product.id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Expand-aware detail loading
+# ---------------------------------------------------------------------------
+# expand field -> (collection, nested many-to-ones, count field). Expanded
+# collections are selectinloaded (one query each, no cartesian join); the rest
+# are noloaded and counted in SQL.
+_EXPANDABLE_COLLECTIONS = {
+    'comments': (models.Ticket.comments, (models.Comment.author,), 'comment_count'),
+    'time_entries': (
+        models.Ticket.time_entries,
+        (models.TicketTimeEntry.user, models.TicketTimeEntry.product, models.TicketTimeEntry.invoice),
+        'time_entry_count',
+    ),
+    'materials': (
+        models.Ticket.materials,
+        (models.TicketMaterial.product, models.TicketMaterial.invoice),
+        'material_count',
+    ),
+    'articles': (models.Ticket.articles, (), 'article_count'),
+    'transitions': (models.Ticket.status_transitions, (), 'transition_count'),
+}
+
+
+def ticket_detail_options(expand) -> list:
+    """Loader options for a TicketResponse trimmed by ``expand``."""
+    options = [
+        joinedload(models.Ticket.account),
+        joinedload(models.Ticket.milestone).joinedload(models.Milestone.project),
+        selectinload(models.Ticket.contacts),
+        selectinload(models.Ticket.assets),
+    ]
+    for field_name, (collection, nested, _) in _EXPANDABLE_COLLECTIONS.items():
+        if expand.should_expand(field_name):
+            options.append(selectinload(collection).options(*(joinedload(rel) for rel in nested)))
+        else:
+            options.append(noload(collection))
+    return options
+
+
+def unloaded_collection_counts(ticket_id: int, expand, db: Session) -> dict:
+    """Counts (and total_hours) for the collections ticket_detail_options() skipped.
+
+    One query; empty dict (no query) when everything was expanded.
+    """
+    columns = [
+        _COUNT_COLUMNS[count_field].label(count_field)
+        for field_name, (_, _, count_field) in _EXPANDABLE_COLLECTIONS.items()
+        if not expand.should_expand(field_name)
+    ]
+    if not expand.should_expand('time_entries'):
+        columns.append(_TOTAL_MINUTES.label('total_minutes'))
+    if not columns:
+        return {}
+    row = db.execute(select(*columns).where(models.Ticket.id == ticket_id)).one()
+    counts = dict(row._mapping)
+    if 'total_minutes' in counts:
+        counts['total_hours'] = round((counts.pop('total_minutes') or 0) / 60, 2)
+    return counts
@@ -0,0 +1,115 @@
+"""Write-behind buffer for ``ApiToken.last_used_at``.
+
+PAT auth used to stamp ``last_used_at`` and commit on every request, turning
+each read-only GET into a write transaction and serialising hot service tokens
+on a single row lock. Auth now only calls :meth:`TokenUsageBuffer.record`,
+which coalesces the newest timestamp per token in memory. The app lifespan
+(``app/main.py``) flushes the buffer in one executemany UPDATE every
+``API_TOKEN_USAGE_FLUSH_SECONDS`` and once more on shutdown.
+
+``last_used_at`` is advisory (shown in the token list), so losing at most one
+interval of stamps on a hard crash is an acceptable trade.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, or_, update
+
+from .. import models
+from ..database import SessionLocal
+from ..metrics import track_task
+
+log = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = max(1, int(os.getenv("API_TOKEN_USAGE_FLUSH_SECONDS", "30")))
+
+_tokens = models.ApiToken.__table__
+
+# Never move a stamp backwards — another worker may have flushed a newer one.
+_BULK_TOUCH = (
+    update(_tokens)
+    .where(_tokens.c.id == bindparam("b_id"))
+    .where(or_(_tokens.c.last_used_at.is_(None), _tokens.c.last_used_at < bindparam("b_ts")))
+    .values(last_used_at=bindparam("b_ts"))
+)
+
+
+class TokenUsageBuffer:
+    """Thread-safe ``token_id -> newest last_used_at`` map with bulk flush."""
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self._session_factory = session_factory
+        self._pending: dict = {}
+        self._lock = threading.Lock()
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+
+    def record(self, token_id, when: Optional[datetime] = None) -> None:
+        when = when or datetime.now(timezone.utc)
+        with self._lock:
+            current = self._pending.get(token_id)
+            if current is None or when > current:
+                self._pending[token_id] = when
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _drain(self) -> dict:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        return batch
+
+    def _restore(self, batch: dict) -> None:
+        for token_id, when in batch.items():
+            self.record(token_id, when)
+
+    def flush(self) -> int:
+        """Write every pending stamp in one UPDATE round trip. Returns batch size."""
+        batch = self._drain()
+        if not batch:
+            return 0
+        db = self._session_factory()
+        try:
+            with track_task("token_usage_flush"):
+                db.execute(
+                    _BULK_TOUCH,
+                    [{"b_id": token_id, "b_ts": when} for token_id, when in batch.items()],
+                )
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failures += 1
+            self._restore(batch)
+            log.warning("api token usage flush failed (%d pending): %s", len(batch), e)
+            return 0
+        finally:
+            db.close()
+        self.flushes += 1
+        self.rows_written += len(batch)
+        return len(batch)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failures": self.failures,
+            "interval_s": FLUSH_INTERVAL_SECONDS,
+        }
+
+    async def run(self, interval: float = FLUSH_INTERVAL_SECONDS) -> None:
+        """Flush forever on ``interval``; cancelled by the app lifespan."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.flush)
+
+
+token_usage_buffer = TokenUsageBuffer()
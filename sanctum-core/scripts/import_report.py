@@ -0,0 +1,129 @@
+"""
+Summarise what importing Core costs at worker boot (``python -X importtime``).
+
+Runs the import in a fresh interpreter, parses the ``-X importtime`` trace and
+prints the slowest modules, the third-party packages that dominate self time,
+and any deferred heavy dependency that was imported eagerly anyway.
+
+    cd sanctum-core && source venv/bin/activate
+    python scripts/import_report.py                  # report for app.main
+    python scripts/import_report.py --top 40
+    python scripts/import_report.py --check          # exit 1 if a deferred dep loads at boot
+    python scripts/import_report.py --module app.worker --json
+
+Heavy engines (PDF, email, sentinel scanning) import their libraries on first
+use; --check keeps it that way.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+# Top-level packages that must only be imported on first use, not at boot.
+DEFERRED_PACKAGES = (
+    "fpdf", "resend", "jinja2", "playwright", "bs4", "dns", "weasyprint", "markdown",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` output; non-trace lines are ignored."""
+    records = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, module = m.groups()
+        # The header line ("self [us] | cumulative | imported package") doesn't match.
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def trace_import(module: str) -> str:
+    """Import ``module`` in a fresh interpreter and return its importtime trace."""
+    env = dict(os.environ)
+    # app.database needs a URL to build its engine; nothing connects at import.
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=CORE_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return proc.stderr
+
+
+def summarise(records: list[ImportRecord], top: int = 20) -> dict:
+    by_package = defaultdict(int)
+    for r in records:
+        by_package[r.package] += r.self_us
+    total_us = sum(r.self_us for r in records)
+    loaded = {r.package for r in records}
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "modules": len(records),
+        "slowest_cumulative": [
+            {"module": r.module, "cumulative_ms": round(r.cumulative_us / 1000, 1)}
+            for r in sorted(records, key=lambda r: -r.cumulative_us)[:top]
+        ],
+        "packages_by_self_time": [
+            {"package": pkg, "self_ms": round(us / 1000, 1)}
+            for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]
+        ],
+        "eager_deferred": sorted(p for p in DEFERRED_PACKAGES if p in loaded),
+    }
+
+
+def print_report(module: str, summary: dict) -> None:
+    print(f"IMPORT REPORT: {module}")
+    print("=" * 50)
+    print(f"{summary['modules']} modules, {summary['total_ms']} ms total self time\n")
+    print("Slowest (cumulative):")
+    for row in summary["slowest_cumulative"]:
+        print(f"  {row['cumulative_ms']:>9.1f} ms  {row['module']}")
+    print("\nPackages by self time:")
+    for row in summary["packages_by_self_time"]:
+        print(f"  {row['self_ms']:>9.1f} ms  {row['package']}")
+    eager = summary["eager_deferred"]
+    print("\nDeferred deps imported at boot: " + (", ".join(eager) if eager else "none"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=20, help="rows per section (default: 20)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if any deferred dependency is imported eagerly")
+    args = parser.parse_args(argv)
+
+    summary = summarise(parse_importtime(trace_import(args.module)), top=args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(args.module, summary)
+    return 1 if args.check and summary["eager_deferred"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Rebuild the global-search index (``search_documents``) from the source tables.
+
+The ORM flush hook keeps the index current; run this after bulk updates or
+raw-SQL writes that bypassed it, or to repair drift.
+
+    cd sanctum-core && source venv/bin/activate
+    python scripts/rebuild_search_index.py                    # every entity type
+    python scripts/rebuild_search_index.py --type ticket --type wiki
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import search_index
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--type", action="append", dest="types", choices=search_index.ENTITY_TYPES,
+                        help="entity type to rebuild (repeatable; default: all)")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per insert batch (default: 500)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        counts = search_index.rebuild(db, args.types, batch_size=args.batch_size)
+        db.commit()
+    finally:
+        db.close()
+
+    for entity_type, written in counts.items():
+        print(f"  {entity_type:<10} {written:>7} documents")
+    print(f"Indexed {sum(counts.values())} documents.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
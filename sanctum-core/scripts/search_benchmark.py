@@ -0,0 +1,373 @@
+"""
+Benchmark global search latency and relevance on a synthetic corpus.
+
+Seeds a scratch Postgres database (pg_trgm required) with a deterministic
+corpus — filler accounts, tickets, wiki articles and contacts plus a handful
+of labelled "needle" rows — then replays a fixed query set through the
+``/search`` handler and reports p50/p95/p99 latency per query and overall,
+plus recall@k against the labelled expectations.
+
+    cd sanctum-core && source venv/bin/activate
+    createdb sanctum_bench && psql sanctum_bench -c 'CREATE EXTENSION pg_trgm'
+    python scripts/search_benchmark.py --database-url postgresql://localhost/sanctum_bench --reset
+    python scripts/search_benchmark.py --database-url ... --path entities       # per-entity fallback
+    python scripts/search_benchmark.py --database-url ... --json --min-recall 0.9
+
+--reset drops and recreates every table in the target database, so the
+script refuses to run against the application's database (DATABASE_URL from
+the environment or sanctum-core/.env). Without --reset the existing corpus is
+reused. The result cache is off unless --cache is given, so each repeat
+measures the database. The per-type search deadline is off unless
+--deadline-ms is given; with it, calls answered partially (X-Search-Partial)
+are counted per query, since a cut-off call is both fast and short of recall.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from dotenv import dotenv_values
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The database the application is configured for, read the way app.database
+# does (environment first, then .env) before the scratch default below hides it.
+APP_DATABASE_URL = os.environ.get("DATABASE_URL") or dotenv_values(os.path.join(ROOT, ".env")).get("DATABASE_URL")
+
+# app.database builds its engine at import; the benchmark uses its own.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+# Stands in for "no deadline": asyncio and the Postgres statement_timeout both need a number.
+NO_DEADLINE_SECONDS = 3600.0
+
+DEFAULT_SIZES = {"accounts": 500, "tickets": 100_000, "articles": 5_000, "contacts": 10_000}
+
+_WORDS = (
+    "printer email outage network laptop password reset vpn backup server invoice "
+    "licence upgrade migration firmware switch router wifi phone monitor dock "
+    "mailbox calendar sharepoint teams onedrive antivirus patch certificate dns "
+    "domain website hosting database report payroll scanner camera badge access"
+).split()
+_FIRST = "Alex Sam Jordan Casey Riley Morgan Taylor Jamie Quinn Avery Drew Harper".split()
+_LAST = "Smith Nguyen Patel Brown Wilson Taylor Martin Lee Walker Hall Young King".split()
+_COMPANY = "Harbour Summit Pioneer Apex Coastal Metro Granite Northern Civic Prime".split()
+_SUFFIX = "Dental Legal Motors Partners Group Clinic Studio Trading Foods Logistics".split()
+
+# Labelled rows. Their distinctive words never appear in the filler vocabulary.
+NEEDLES = {
+    "client": [{"name": "Zephyr Freight"}],
+    "ticket": [
+        {"subject": "Quarterly firewall audit for Zephyr", "description": "Review rule base and NAT"},
+        {"subject": "Kestrel scanner jams on duplex", "description": "Feed rollers worn"},
+    ],
+    "wiki": [
+        {"title": "Offsite backup rotation", "identifier": "SOP-099", "content": "Weekly tape rotation"},
+        {"title": "VPN onboarding guide", "identifier": "DOC-042", "content": "Install the client profile"},
+    ],
+    "contact": [{"first_name": "Marguerite", "last_name": "Okonkwo"}],
+}
+
+
+@dataclass
+class BenchQuery:
+    q: str
+    # (entity type, display title without the "#id " ticket prefix) expected in the top k.
+    expected: list = field(default_factory=list)
+
+
+QUERIES = [
+    BenchQuery("zephyr", [("client", "Zephyr Freight"), ("ticket", "Quarterly firewall audit for Zephyr")]),
+    BenchQuery("t: firewall audit", [("ticket", "Quarterly firewall audit for Zephyr")]),
+    BenchQuery("firewal audit", [("ticket", "Quarterly firewall audit for Zephyr")]),
+    BenchQuery("kestrel", [("ticket", "Kestrel scanner jams on duplex")]),
+    BenchQuery("w: backup rotation", [("wiki", "Offsite backup rotation")]),
+    BenchQuery("SOP 99", [("wiki", "Offsite backup rotation")]),
+    BenchQuery("sop-099", [("wiki", "Offsite backup rotation")]),
+    BenchQuery("DOC-042", [("wiki", "VPN onboarding guide")]),
+    BenchQuery("okonkwo", [("contact", "Marguerite Okonkwo")]),
+    BenchQuery("u: marguerite", [("contact", "Marguerite Okonkwo")]),
+    # Unlabelled load: common words that match thousands of rows.
+    BenchQuery("printer"),
+    BenchQuery("t: email"),
+    BenchQuery("network outage"),
+    BenchQuery("c: harbour"),
+    BenchQuery("w: password"),
+    BenchQuery("pa"),
+]
+
+
+# ─────────────────────────────────────────────
+# CORPUS
+# ─────────────────────────────────────────────
+
+def generate_corpus(sizes: dict, seed: int = 42) -> dict:
+    """Deterministic rows per table (dicts ready for Core inserts), needles included."""
+    rng = random.Random(seed)
+    phrase = lambda n: " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    accounts = [{"id": uuid.UUID(int=rng.getrandbits(128)), "type": "client", "brand_affinity": "ds",
+                 "status": "active", "name": f"{rng.choice(_COMPANY)} {rng.choice(_SUFFIX)} {i}"}
+                for i in range(max(sizes["accounts"] - len(NEEDLES["client"]), 1))]
+    accounts += [{"id": uuid.UUID(int=rng.getrandbits(128)), "type": "client", "brand_affinity": "ds",
+                  "status": "active", **n} for n in NEEDLES["client"]]
+    account_ids = [a["id"] for a in accounts]
+
+    tickets = [{"account_id": rng.choice(account_ids), "subject": phrase(4).capitalize(),
+                "description": phrase(30), "status": rng.choice(["new", "open", "resolved"]),
+                "priority": "normal"}
+               for _ in range(sizes["tickets"])]
+    tickets += [{"account_id": account_ids[-1], "status": "open", "priority": "high", **n}
+                for n in NEEDLES["ticket"]]
+    rng.shuffle(tickets)
+
+    articles = [{"id": uuid.UUID(int=rng.getrandbits(128)), "title": phrase(3).title(),
+                 "slug": f"bench-{i}", "identifier": f"KB-{i:04d}", "category": "wiki",
+                 "content": phrase(120)}
+                for i in range(sizes["articles"])]
+    articles += [{"id": uuid.UUID(int=rng.getrandbits(128)), "slug": n["identifier"].lower(),
+                  "category": "sop", **n} for n in NEEDLES["wiki"]]
+
+    contacts = []
+    for i in range(sizes["contacts"]):
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        contacts.append({"id": uuid.UUID(int=rng.getrandbits(128)), "account_id": rng.choice(account_ids),
+                         "first_name": first, "last_name": last,
+                         "email": f"{first}.{last}{i}@example.test".lower()})
+    contacts += [{"id": uuid.UUID(int=rng.getrandbits(128)), "account_id": account_ids[-1],
+                  "email": f"{n['first_name']}@zephyr.test".lower(), **n} for n in NEEDLES["contact"]]
+
+    return {"accounts": accounts, "tickets": tickets, "articles": articles, "contacts": contacts}
+
+
+def seed_corpus(engine, corpus: dict, batch_size: int = 5_000) -> dict:
+    """Recreate the schema, insert ``corpus`` and build the search index."""
+    from sqlalchemy import insert, text
+    from sqlalchemy.orm import Session
+
+    from app import models
+    from app.services import search_index
+
+    models.Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for statement in search_index.POSTGRES_DDL:
+                conn.execute(text(statement))
+        for name, model in (("accounts", models.Account), ("contacts", models.Contact),
+                            ("tickets", models.Ticket), ("articles", models.Article)):
+            rows = corpus[name]
+            for start in range(0, len(rows), batch_size):
+                conn.execute(insert(model), rows[start:start + batch_size])
+
+    with Session(engine) as db:
+        counts = search_index.rebuild(db)
+        db.commit()
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    return counts
+
+
+# ─────────────────────────────────────────────
+# MEASUREMENT
+# ─────────────────────────────────────────────
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def result_key(result: dict) -> tuple:
+    title = result["title"] or ""
+    if result["type"] == "ticket" and title.startswith("#"):
+        title = title.split(" ", 1)[1] if " " in title else ""
+    return result["type"], title
+
+
+def recall_at_k(results: list, expected: list, k: int) -> float:
+    if not expected:
+        return 1.0
+    found = {result_key(r) for r in results[:k]}
+    return sum(1 for e in expected if tuple(e) in found) / len(expected)
+
+
+async def run_benchmark(search, queries: list, repeat: int = 20, warmup: int = 2, k: int = 5) -> dict:
+    """Replay ``queries`` through ``search(q) -> results`` and summarise.
+
+    ``search`` is any coroutine function; latency is wall time per call.
+    """
+    per_query = []
+    all_ms = []
+    recalls = []
+    partial_total = 0
+    for bq in queries:
+        for _ in range(warmup):
+            await search(bq.q)
+        timings, results = [], []
+        partial_before = getattr(search, "partial_calls", 0)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = await search(bq.q)
+            timings.append((time.perf_counter() - start) * 1000)
+        partial = getattr(search, "partial_calls", 0) - partial_before
+        partial_total += partial
+        all_ms.extend(timings)
+        recall = recall_at_k(results, bq.expected, k) if bq.expected else None
+        if recall is not None:
+            recalls.append(recall)
+        per_query.append({
+            "q": bq.q,
+            "results": len(results),
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "recall": recall,
+            "partial": partial,
+        })
+    return {
+        "queries": per_query,
+        "overall": {
+            "calls": len(all_ms),
+            "p50_ms": round(percentile(all_ms, 50), 2),
+            "p95_ms": round(percentile(all_ms, 95), 2),
+            "p99_ms": round(percentile(all_ms, 99), 2),
+            "mean_ms": round(statistics.fmean(all_ms), 2) if all_ms else 0.0,
+            f"recall_at_{k}": round(statistics.fmean(recalls), 4) if recalls else None,
+            "partial_calls": partial_total,
+        },
+    }
+
+
+def make_search(async_engine, path: str, limit: int = 5, use_cache: bool = False,
+                deadline_ms: float = None):
+    """A ``search(q)`` coroutine calling the /search handler as an admin.
+
+    ``search.partial_calls`` counts calls answered with X-Search-Partial;
+    ``deadline_ms`` of None lifts the per-type deadline.
+    """
+    from fastapi import Response
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.principals import UserSnapshot
+    from app.routers import search as search_router
+
+    search_router.SEARCH_INDEX_ENABLED = path == "index"
+    search_router.SEARCH_TIMEOUT_SECONDS = deadline_ms / 1000 if deadline_ms else NO_DEADLINE_SECONDS
+    if not use_cache:
+        search_router.search_cache.maxsize = 0
+    user = UserSnapshot(id=uuid.uuid4(), email="bench@example.test", full_name="Bench", role="admin",
+                        access_scope="global", is_active=True, user_type="human", account_id=None)
+
+    async def search(q: str) -> list:
+        response = Response()
+        async with AsyncSession(async_engine) as db:
+            results = await search_router.global_search(q=q, response=response, limit=limit,
+                                                        db=db, current_user=user)
+        if search_router.PARTIAL_HEADER in response.headers:
+            search.partial_calls += 1
+        return results
+
+    search.partial_calls = 0
+    return search
+
+
+def _same_database(a: str, b: str) -> bool:
+    """True when two URLs name the same database, whatever the driver or spelling."""
+    from sqlalchemy.engine import make_url
+
+    def identity(url):
+        u = make_url(url)
+        return (u.get_backend_name(), (u.host or "localhost").lower(), u.port, u.database)
+
+    return identity(a) == identity(b)
+
+
+def print_report(summary: dict, k: int) -> None:
+    print("SEARCH BENCHMARK")
+    print("=" * 78)
+    print(f"{'query':<24} {'rows':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'recall@' + str(k):>10} "
+          f"{'partial':>7}")
+    for row in summary["queries"]:
+        recall = "-" if row["recall"] is None else f"{row['recall']:.2f}"
+        print(f"{row['q']:<24} {row['results']:>5} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+              f"{row['p99_ms']:>9.2f} {recall:>10} {row['partial']:>7}")
+    o = summary["overall"]
+    print("-" * 78)
+    recall = o[f"recall_at_{k}"]
+    print(f"{o['calls']} calls  p50 {o['p50_ms']} ms  p95 {o['p95_ms']} ms  p99 {o['p99_ms']} ms  "
+          f"recall@{k} {'-' if recall is None else recall}  partial {o['partial_calls']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="scratch Postgres database (sync URL)")
+    parser.add_argument("--reset", action="store_true", help="drop all tables, seed the corpus and index it")
+    for name, default in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help=f"{name} to seed (default: {default})")
+    parser.add_argument("--seed", type=int, default=42, help="corpus RNG seed (default: 42)")
+    parser.add_argument("--path", choices=("index", "entities"), default="index",
+                        help="search_documents index or the per-entity fallback (default: index)")
+    parser.add_argument("--limit", type=int, default=5, help="per-type limit passed to /search (default: 5)")
+    parser.add_argument("--k", type=int, default=5, help="cut-off for recall@k (default: 5)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per query (default: 20)")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls per query (default: 2)")
+    parser.add_argument("--cache", action="store_true", help="leave the search result cache on")
+    parser.add_argument("--deadline-ms", type=float,
+                        help="per-type search deadline to apply (default: none; partial calls are reported)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--min-recall", type=float, help="exit 1 if overall recall@k is below this")
+    args = parser.parse_args(argv)
+
+    if APP_DATABASE_URL and _same_database(args.database_url, APP_DATABASE_URL):
+        parser.error("--database-url must not be the application's DATABASE_URL")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_engine(args.database_url)
+    if args.reset:
+        sizes = {name: getattr(args, name) for name in DEFAULT_SIZES}
+        started = time.perf_counter()
+        counts = seed_corpus(engine, generate_corpus(sizes, args.seed))
+        print(f"Seeded and indexed {sum(counts.values())} documents in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+    engine.dispose()
+
+    async def _run():
+        # Not app.database.async_database_url: ASYNC_DATABASE_URL must not redirect the benchmark.
+        url = make_url(args.database_url)
+        driver = "sqlite+aiosqlite" if url.get_backend_name() == "sqlite" else "postgresql+asyncpg"
+        async_engine = create_async_engine(url.set(drivername=driver))
+        try:
+            search = make_search(async_engine, args.path, args.limit, args.cache, args.deadline_ms)
+            return await run_benchmark(search, QUERIES, args.repeat, args.warmup, args.k)
+        finally:
+            await async_engine.dispose()
+
+    summary = asyncio.run(_run())
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary, args.k)
+    recall = summary["overall"][f"recall_at_{args.k}"]
+    return 1 if args.min_recall is not None and (recall or 0) < args.min_recall else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
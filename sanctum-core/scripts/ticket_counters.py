@@ -0,0 +1,56 @@
+"""
+Check or rebuild the denormalised ticket effort counters
+(comment_count, time_entry_count, material_count, total_minutes).
+
+The ORM flush hook keeps them current; run this after raw-SQL writes or bulk
+updates that bypassed it, or periodically to confirm there is no drift.
+
+    cd sanctum-core && source venv/bin/activate
+    python scripts/ticket_counters.py                 # report drift; exit 1 if any
+    python scripts/ticket_counters.py --fix           # recount the drifted tickets
+    python scripts/ticket_counters.py --fix --all     # recount every ticket (backfill)
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services import ticket_counters
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="rewrite drifted counters from the child tables")
+    parser.add_argument("--all", action="store_true", help="with --fix: recount every ticket, drifted or not")
+    parser.add_argument("--limit", type=int, default=None, help="report at most this many tickets")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.fix and args.all:
+            updated = ticket_counters.recount(db)
+            db.commit()
+            print(f"Recounted {updated} tickets.")
+            return 0
+
+        drifted = ticket_counters.drift(db, limit=args.limit)
+        for item in drifted:
+            fields = ", ".join(f"{name} {stored} -> {live}" for name, (stored, live) in
+                               ((k, v) for k, v in item.items() if k != "id"))
+            print(f"  #{item['id']:<7} {fields}")
+        if args.fix and drifted:
+            updated = ticket_counters.recount(db, [item["id"] for item in drifted])
+            db.commit()
+            print(f"Recounted {updated} tickets.")
+            return 0
+        print(f"{len(drifted)} tickets drifted.")
+        return 1 if drifted else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -94,3 +94,15 @@ def sign_rs256(claims: dict, fixture: _RS256Fixture) -> str:
         algorithm="RS256",
         headers={"kid": fixture.kid},
     )
+
+
+@pytest.fixture(autouse=True)
+def _reset_auth_caches():
+    """Keep the in-process auth caches from leaking principals across tests."""
+    from app import auth
+
+    auth.principal_cache.clear()
+    auth.verified_token_cache.clear()
+    yield
+    auth.principal_cache.clear()
+    auth.verified_token_cache.clear()
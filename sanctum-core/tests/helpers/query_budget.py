@@ -0,0 +1,201 @@
+"""Reusable SQLite harness for live-endpoint query-budget tests.
+
+Generalises the setup in ``test_query_budget_accounts.py``: a throwaway
+file-backed SQLite database with the full schema, a sync engine plus an
+aiosqlite engine on the same file, and a ``TestClient`` whose ``get_db`` /
+``get_async_db`` (and their read-replica variants) / auth dependencies are overridden to use them. Because the
+database is private to the harness, results don't depend on which test module
+imported ``app.database`` first.
+
+Usage::
+
+    with QueryBudgetHarness(tmp_path) as harness:
+        with harness.session() as db:
+            account_id, admin_id = seed_account_admin(db)
+            seed(db, account_id)
+        harness.login_as(admin_id)
+        counter = harness.count("GET", "/tickets")
+        assert counter.count < 15, counter.report()
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import String, create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import DefaultClause
+from sqlalchemy.sql import expression
+
+from tests.helpers.query_counter import QueryCounter
+
+
+# SQLite PG-type compatibility (idempotent: re-registering replaces the hook).
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(element, compiler, **kw):
+    return compiler.visit_JSON(element)
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(element, compiler, **kw):
+    return compiler.visit_VARCHAR(String())
+
+
+def _trigram_similarity(a, b) -> float:
+    """Rough stand-in for pg_trgm ``word_similarity`` — values only need to be plausible."""
+    if not a or not b:
+        return 0.0
+    a, b = str(a).lower(), str(b).lower()
+    grams = lambda s: {s[i:i + 3] for i in range(max(len(s) - 2, 1))}
+    ga, gb = grams(a), grams(b)
+    return len(ga & gb) / len(ga) if ga else 0.0
+
+
+def _register_pg_functions(dbapi_connection, connection_record):
+    """Register the Postgres functions Core queries call, so they run on SQLite."""
+    dbapi_connection.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+    dbapi_connection.create_function("now", 0, lambda: datetime.now(timezone.utc).isoformat(" "))
+    dbapi_connection.create_function("word_similarity", 2, _trigram_similarity)
+    dbapi_connection.create_function("greatest", -1, lambda *xs: max((x for x in xs if x is not None), default=None))
+    dbapi_connection.create_function("to_char", 2, lambda ts, fmt: str(ts)[:7] if ts else None)
+    dbapi_connection.create_function("extract", 2, lambda field, value: 0.0)
+
+
+def _create_schema(engine) -> None:
+    """``create_all`` with PG-only ``::jsonb`` server defaults stripped."""
+    from app import models
+
+    patched = {}
+    for table in models.Base.metadata.sorted_tables:
+        for col in table.columns:
+            sd = col.server_default
+            if sd is not None and "::jsonb" in str(getattr(sd, "arg", "")):
+                patched[col] = sd
+                col.server_default = DefaultClause(expression.text(str(sd.arg).replace("::jsonb", "")))
+    try:
+        models.Base.metadata.create_all(bind=engine)
+    finally:
+        for col, sd in patched.items():
+            col.server_default = sd
+
+
+def seed_account_admin(db, *, name: str = "Acme", email: str = "admin@example.test") -> tuple[uuid.UUID, uuid.UUID]:
+    """Add a client ``Account`` and a global admin ``User`` to ``db`` and flush.
+
+    Returns ``(account_id, admin_id)``; tests add the rest of their graph on top.
+    """
+    from app import models
+
+    account_id, admin_id = uuid.uuid4(), uuid.uuid4()
+    db.add(models.Account(id=account_id, name=name, type="client", brand_affinity="ds", status="active"))
+    db.add(models.User(id=admin_id, email=email, full_name="Admin", role="admin",
+                       access_scope="global", is_active=True, user_type="human"))
+    db.flush()
+    return account_id, admin_id
+
+
+class QueryBudgetHarness:
+    """Private SQLite database + dependency-overridden ``TestClient``."""
+
+    def __init__(self, tmp_path: Path, name: str = "query_budget.db"):
+        path = Path(tmp_path) / name
+        self.engine = create_engine(f"sqlite:///{path}")
+        event.listen(self.engine, "connect", _register_pg_functions)
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        event.listen(self.async_engine.sync_engine, "connect", _register_pg_functions)
+        self._sessions = sessionmaker(bind=self.engine, autoflush=False)
+        self._async_sessions = async_sessionmaker(
+            self.async_engine, autoflush=False, expire_on_commit=False,
+        )
+        self.principal = None
+        _create_schema(self.engine)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def __enter__(self) -> "QueryBudgetHarness":
+        from app import auth
+        from app.database import get_async_db, get_async_read_db, get_db, get_read_db
+        from app.main import app
+
+        def _get_db():
+            db = self._sessions()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def _get_async_db():
+            async with self._async_sessions() as db:
+                yield db
+
+        def _principal():
+            return self.principal
+
+        self.app = app
+        self._overrides = {
+            get_db: _get_db,
+            get_read_db: _get_db,
+            get_async_db: _get_async_db,
+            get_async_read_db: _get_async_db,
+            auth.get_current_user: _principal,
+            auth.get_current_principal: _principal,
+            auth.get_current_active_user: _principal,
+        }
+        app.dependency_overrides.update(self._overrides)
+        from fastapi.testclient import TestClient
+
+        self.client = TestClient(app)
+        self.reset_result_caches()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for dep in self._overrides:
+            self.app.dependency_overrides.pop(dep, None)
+        self.engine.dispose()
+        self.async_engine.sync_engine.dispose()
+
+    # -- helpers -----------------------------------------------------------
+
+    @contextmanager
+    def session(self):
+        with Session(self.engine) as db:
+            yield db
+            db.commit()
+
+    def reset_result_caches(self) -> None:
+        """Drop process-level caches of query results, which belong to other databases."""
+        from app.routers.search import search_cache
+        from app.services import ticket_cache
+
+        search_cache.clear()
+        ticket_cache.invalidate_all()
+
+    def login(self, user) -> None:
+        """Authenticate subsequent requests as ``user`` (a committed ``models.User``)."""
+        from app.principals import UserSnapshot
+
+        self.principal = UserSnapshot.from_user(user)
+
+    def login_as(self, user_id) -> None:
+        """:meth:`login` as the committed user with ``user_id``."""
+        from app import models
+
+        with self.session() as db:
+            self.login(db.get(models.User, user_id))
+
+    def count(self, method: str, path: str, expected_status: int = 200, **kwargs) -> QueryCounter:
+        """Issue one request and return the statements it ran on either engine."""
+        counter = QueryCounter(self.engine, self.async_engine.sync_engine)
+        with counter:
+            response = self.client.request(method, path, **kwargs)
+        assert response.status_code == expected_status, (
+            f"{method} {path} -> {response.status_code}: {response.text[:500]}"
+        )
+        counter.response = response
+        return counter
@@ -7,24 +7,37 @@ Usage::
     def test_something():
         with QueryCounter(db) as counter:
             client.get("/some-endpoint")
-        assert counter.count < 15
+        assert counter.count < 15, counter.report()
 """
 
 from __future__ import annotations
 
+import re
+from collections import Counter
+
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
+# Collapse expanded IN-lists / VALUES tuples so "IN (?, ?, ?)" and "IN (?)"
+# group under one template.
+_PLACEHOLDER_RUN = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_template(statement: str) -> str:
+    """Normalise a statement so repeats of the same query group together."""
+    return _PLACEHOLDER_RUN.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
 
 class QueryCounter:
-    """Context manager that counts SQL statements executed on an engine.
+    """Context manager that counts SQL statements executed on one or more engines.
 
     Subscribes to ``after_cursor_execute`` and increments a counter
     for every statement.  Resets on entry, captures on exit.
     """
 
-    def __init__(self, engine: Engine):
-        self._engine = engine
+    def __init__(self, *engines: Engine):
+        self._engines = engines
         self.count: int = 0
         self.statements: list[str] = []
         self._listener = None
@@ -36,8 +49,20 @@ class QueryCounter:
     def __enter__(self) -> QueryCounter:
         self.count = 0
         self.statements.clear()
-        event.listen(self._engine, "after_cursor_execute", self._callback)
+        for engine in self._engines:
+            event.listen(engine, "after_cursor_execute", self._callback)
         return self
 
     def __exit__(self, *exc_info) -> None:
-        event.remove(self._engine, "after_cursor_execute", self._callback)
+        for engine in self._engines:
+            event.remove(engine, "after_cursor_execute", self._callback)
+
+    def by_template(self) -> Counter:
+        return Counter(statement_template(s) for s in self.statements)
+
+    def report(self) -> str:
+        """Statements grouped by template, most repeated first — for assert messages."""
+        lines = [f"{self.count} statements:"]
+        for template, n in self.by_template().most_common():
+            lines.append(f"  {n:>4} x {template[:300]}")
+        return "\n".join(lines)
@@ -0,0 +1,103 @@
+"""Tests for the async database session path.
+
+Covers:
+- DATABASE_URL → async driver mapping (asyncpg / aiosqlite, override)
+- _resolve_principal resolves HS256 and PAT tokens on a real AsyncSession
+  (aiosqlite), including eager-loading ApiToken.user so no lazy load fires
+  after the session closes
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from jose import jwt
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+class TestAsyncDatabaseUrl:
+    @pytest.mark.parametrize("url, expected", [
+        ("postgresql://u:p@db/sanctum", "postgresql+asyncpg://u:p@db/sanctum"),
+        ("postgresql+psycopg2://u:p@db/sanctum", "postgresql+asyncpg://u:p@db/sanctum"),
+        ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("sqlite:////tmp/x.db", "sqlite+aiosqlite:////tmp/x.db"),
+    ])
+    def test_driver_mapping(self, monkeypatch, url, expected):
+        from app.database import async_database_url
+
+        monkeypatch.delenv("ASYNC_DATABASE_URL", raising=False)
+        assert async_database_url(url) == expected
+
+    def test_explicit_override_wins(self, monkeypatch):
+        from app.database import async_database_url
+
+        monkeypatch.setenv("ASYNC_DATABASE_URL", "postgresql+asyncpg://replica/sanctum")
+        assert async_database_url("postgresql://u:p@db/sanctum") == "postgresql+asyncpg://replica/sanctum"
+
+
+@asynccontextmanager
+async def _async_session(tmp_path):
+    """Throwaway aiosqlite database with just the tables auth touches."""
+    from app import models
+
+    eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with eng.begin() as conn:
+        await conn.run_sync(
+            models.Base.metadata.create_all,
+            tables=[models.Account.__table__, models.User.__table__, models.ApiToken.__table__],
+        )
+    factory = async_sessionmaker(eng, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+    await eng.dispose()
+
+
+async def _add_user(session, email="async@example.com"):
+    from app import models
+
+    user = models.User(id=uuid.uuid4(), email=email, role="admin", access_scope="global", is_active=True)
+    session.add(user)
+    await session.commit()
+    return user
+
+
+class TestResolvePrincipalAsync:
+    @pytest.mark.asyncio
+    async def test_hs256_resolves_on_async_session(self, tmp_path):
+        from app import auth
+
+        async with _async_session(tmp_path) as session:
+            user = await _add_user(session)
+            token = jwt.encode(
+                {"sub": user.email, "exp": int(time.time()) + 300},
+                auth.SECRET_KEY,
+                algorithm="HS256",
+            )
+
+            principal = await auth._resolve_principal(token, session)
+
+        assert principal.id == user.id
+        assert principal.email == "async@example.com"
+
+    @pytest.mark.asyncio
+    async def test_pat_resolves_with_user_eager_loaded(self, tmp_path, monkeypatch):
+        from app import auth, models
+
+        monkeypatch.setattr(auth.pwd_context, "verify", lambda t, h: True)
+        async with _async_session(tmp_path) as session:
+            user = await _add_user(session, email="pat@example.com")
+            raw = "sntm_" + "a" * 40
+            session.add(models.ApiToken(
+                id=uuid.uuid4(), user_id=user.id, name="t", token_hash="x",
+                token_prefix=raw[:12], is_active=True,
+            ))
+            await session.commit()
+            session.expunge_all()
+
+            principal = await auth._resolve_principal(raw, session)
+
+        # Attribute access after close must not trigger a lazy load.
+        assert principal.email == "pat@example.com"
@@ -0,0 +1,207 @@
+"""Unit tests for the engine pool configuration layer (app/db_pool.py).
+
+Covers:
+- Env parsing falls back to defaults on missing / malformed values
+- SQLite URLs get no pool kwargs (default pool retained)
+- Postgres URLs get sizing, pre-ping and statement_timeout connect args
+- Async engines get the instrumented async-adapted pool with their own metrics
+- The replica engine's pool reports into "replica" metrics, not the primary's
+- Wait histogram is cumulative and timeouts are counted; timeouts_recent
+  forgets timeouts older than the window
+- InstrumentedQueuePool records checkouts and timeouts end-to-end, and the
+  /system/pool status recovers from "degraded" once the window passes
+- The async pool reports into its own metrics, not the primary's
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+
+class TestPoolSettings:
+    def test_defaults_when_env_missing(self, monkeypatch):
+        from app.db_pool import PoolSettings
+
+        for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT",
+                     "DB_POOL_RECYCLE", "DB_POOL_PRE_PING", "DB_STATEMENT_TIMEOUT_MS"):
+            monkeypatch.delenv(name, raising=False)
+
+        assert PoolSettings.from_env() == PoolSettings()
+
+    def test_env_overrides_and_bad_values(self, monkeypatch):
+        from app.db_pool import PoolSettings
+
+        monkeypatch.setenv("DB_POOL_SIZE", "20")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "not-a-number")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+        monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "15000")
+
+        settings = PoolSettings.from_env()
+        assert settings.pool_size == 20
+        assert settings.max_overflow == PoolSettings.max_overflow
+        assert settings.pool_pre_ping is False
+        assert settings.statement_timeout_ms == 15000
+
+    def test_sqlite_gets_no_pool_kwargs(self):
+        from app.db_pool import PoolSettings
+
+        assert PoolSettings(pool_size=50).engine_kwargs("sqlite:///:memory:") == {}
+
+    def test_postgres_kwargs(self):
+        from app.db_pool import InstrumentedQueuePool, PoolSettings
+
+        kwargs = PoolSettings(pool_size=8, statement_timeout_ms=5000).engine_kwargs(
+            "postgresql://u:p@localhost/sanctum"
+        )
+        assert kwargs["poolclass"] is InstrumentedQueuePool
+        assert kwargs["pool_size"] == 8
+        assert kwargs["pool_pre_ping"] is True
+        assert kwargs["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    def test_async_kwargs_use_instrumented_async_pool(self):
+        from app.db_pool import InstrumentedAsyncQueuePool, PoolSettings, metrics_for, pool_metrics
+
+        kwargs = PoolSettings().engine_kwargs("postgresql+asyncpg://u:p@localhost/sanctum", async_engine=True)
+        assert issubclass(kwargs["poolclass"], InstrumentedAsyncQueuePool)
+        assert kwargs["poolclass"].metrics is metrics_for("async")
+        assert kwargs["poolclass"].metrics is not pool_metrics
+
+    def test_replica_kwargs_have_own_metrics(self, tmp_path):
+        from app.db_pool import PoolSettings, metrics_for, pool_metrics, pool_status
+
+        kwargs = PoolSettings().engine_kwargs("postgresql://u:p@replica/sanctum", engine_name="replica")
+        assert kwargs["poolclass"].metrics is metrics_for("replica")
+
+        pool_metrics.reset()
+        metrics_for("replica").reset()
+        eng = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", poolclass=kwargs["poolclass"])
+        try:
+            eng.connect().close()
+            assert pool_status(eng)["checkouts_total"] == 1
+            assert pool_metrics.snapshot()["checkouts_total"] == 0
+        finally:
+            eng.dispose()
+            metrics_for("replica").reset()
+
+    def test_statement_timeout_omitted_when_zero(self):
+        from app.db_pool import PoolSettings
+
+        kwargs = PoolSettings().engine_kwargs("postgresql://u:p@localhost/sanctum")
+        assert "connect_args" not in kwargs
+
+
+class TestPoolMetrics:
+    def test_histogram_is_cumulative(self):
+        from app.db_pool import PoolMetrics
+
+        metrics = PoolMetrics(buckets_ms=(1, 10, 100))
+        for wait in (0.5, 5, 50, 500):
+            metrics.observe_wait(wait)
+
+        assert metrics.wait_histogram() == {
+            "le_1ms": 1, "le_10ms": 2, "le_100ms": 3, "le_inf": 4,
+        }
+        snap = metrics.snapshot()
+        assert snap["checkouts_total"] == 4
+        assert snap["wait_ms"]["max"] == 500
+
+    def test_timeouts_counted_separately(self):
+        from app.db_pool import PoolMetrics
+
+        metrics = PoolMetrics(buckets_ms=(1, 10))
+        metrics.observe_timeout(30_000)
+
+        snap = metrics.snapshot()
+        assert snap["timeouts_total"] == 1
+        assert snap["checkouts_total"] == 0
+        assert snap["wait_ms"]["histogram"]["le_inf"] == 1
+
+    def test_recent_timeouts_expire(self, monkeypatch):
+        from app import db_pool
+
+        metrics = db_pool.PoolMetrics()
+        metrics.observe_timeout(30_000)
+        assert metrics.snapshot()["timeouts_recent"] == 1
+
+        now = db_pool.time.monotonic()
+        monkeypatch.setattr(db_pool.time, "monotonic", lambda: now + db_pool.RECENT_WINDOW_S + 1)
+        snap = metrics.snapshot()
+        assert snap["timeouts_recent"] == 0
+        assert snap["timeouts_total"] == 1
+
+
+class TestInstrumentedQueuePool:
+    def test_checkout_and_timeout_recorded(self, tmp_path):
+        from app.db_pool import InstrumentedQueuePool, pool_metrics, pool_status
+
+        pool_metrics.reset()
+        eng = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        try:
+            held = eng.connect()
+            status = pool_status(eng)
+            assert status["checked_out"] == 1
+            assert status["checkouts_total"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                eng.connect()
+            assert pool_status(eng)["timeouts_total"] == 1
+            held.close()
+        finally:
+            eng.dispose()
+            pool_metrics.reset()
+
+    def test_degraded_clears_after_window(self, tmp_path, monkeypatch):
+        from app import db_pool
+        from app.routers.system import _pool_report
+
+        eng = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=db_pool.instrumented_pool_class("test-degraded"),
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05,
+        )
+        try:
+            with eng.connect(), eng.connect():
+                with pytest.raises(exc.TimeoutError):
+                    eng.connect()
+            assert _pool_report(eng)["status"] == "degraded"
+
+            now = db_pool.time.monotonic()
+            monkeypatch.setattr(db_pool.time, "monotonic", lambda: now + db_pool.RECENT_WINDOW_S + 1)
+            report = _pool_report(eng)
+            assert report["status"] == "ok"
+            assert report["timeouts_total"] == 1
+        finally:
+            eng.dispose()
+
+    def test_async_pool_has_its_own_metrics(self, tmp_path):
+        import asyncio
+
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from app.db_pool import instrumented_pool_class, pool_metrics, pool_status
+
+        pool_metrics.reset()
+        eng = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=instrumented_pool_class("test-async", async_engine=True),
+            pool_size=1,
+            max_overflow=0,
+        )
+
+        async def checkout():
+            async with eng.connect():
+                pass
+            await eng.dispose()
+
+        asyncio.run(checkout())
+        assert pool_status(eng.sync_engine)["checkouts_total"] == 1
+        assert pool_metrics.snapshot()["checkouts_total"] == 0
@@ -0,0 +1,154 @@
+"""Unit tests for read-replica routing (app/db_replica.py, get_read_db).
+
+Covers:
+- No replica configured -> primary
+- Healthy replica -> replica; X-Read-Your-Writes header -> primary
+- A caller's successful write pins its reads to the primary until the sticky window expires
+- Failed writes (4xx) don't pin
+- Lagging or unreachable replica -> primary; the lag probe is cached between checks
+- get_read_db / get_async_read_db hand out sessions on the chosen engine
+"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    yield eng
+    eng.dispose()
+
+
+def _router(engine, **kwargs):
+    from app.db_replica import ReplicaRouter
+
+    clock = kwargs.pop("clock", FakeClock())
+    return ReplicaRouter(engine, clock=clock, **kwargs), clock
+
+
+class TestReplicaRouter:
+    def test_no_replica_routes_to_primary(self):
+        router, _ = _router(None)
+        assert router.choose({}) == ("primary", "no_replica")
+
+    def test_healthy_replica(self, replica_engine):
+        router, _ = _router(replica_engine)
+        assert router.choose({}) == ("replica", "ok")
+
+    def test_header_forces_primary(self, replica_engine):
+        router, _ = _router(replica_engine)
+        assert router.choose({"x-read-your-writes": "1"}) == ("primary", "requested")
+
+    def test_recent_write_is_sticky_until_window_expires(self, replica_engine):
+        from app.db_replica import caller_key
+
+        router, clock = _router(replica_engine, sticky_seconds=5)
+        router.record_write(caller_key("Bearer abc"))
+
+        assert router.choose({"authorization": "Bearer abc"}) == ("primary", "recent_write")
+        assert router.choose({"authorization": "Bearer other"}) == ("replica", "ok")
+        clock.now += 6
+        assert router.choose({"authorization": "Bearer abc"}) == ("replica", "ok")
+
+    def test_lagging_replica(self, replica_engine, monkeypatch):
+        router, _ = _router(replica_engine, max_lag_seconds=10)
+        monkeypatch.setattr(router, "_probe", lambda: 30.0)
+        assert router.choose({}) == ("primary", "replica_lagging")
+
+    def test_unreachable_replica(self, replica_engine, monkeypatch):
+        router, _ = _router(replica_engine)
+        monkeypatch.setattr(router, "_probe", lambda: None)
+        assert router.choose({}) == ("primary", "replica_unavailable")
+
+    def test_lag_probe_cached(self, replica_engine, monkeypatch):
+        router, clock = _router(replica_engine, lag_check_seconds=5)
+        calls = []
+        monkeypatch.setattr(router, "_probe", lambda: calls.append(1) or 0.0)
+
+        for _ in range(3):
+            router.choose({})
+        assert len(calls) == 1
+        clock.now += 5
+        router.choose({})
+        assert len(calls) == 2
+
+
+class TestReadYourWritesMiddleware:
+    def test_only_successful_writes_pin(self, replica_engine):
+        from app.db_replica import ReadYourWritesMiddleware, caller_key
+
+        router, _ = _router(replica_engine)
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware, router=router)
+
+        @app.post("/ok")
+        def ok():
+            return {}
+
+        @app.post("/bad", status_code=422)
+        def bad():
+            return {}
+
+        client = TestClient(app)
+        client.post("/bad", headers={"Authorization": "Bearer bad"})
+        client.post("/ok", headers={"Authorization": "Bearer good"})
+
+        assert not router.wrote_recently(caller_key("Bearer bad"))
+        assert router.wrote_recently(caller_key("Bearer good"))
+
+
+class TestReadDependencies:
+    @pytest.fixture
+    def routed(self, replica_engine, tmp_path, monkeypatch):
+        from app import database
+
+        primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+        router, _ = _router(replica_engine)
+        monkeypatch.setattr(database, "replica_router", router)
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=primary))
+        monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(bind=replica_engine))
+        yield database
+        primary.dispose()
+
+    def test_get_read_db_uses_chosen_engine(self, routed):
+        app = FastAPI()
+
+        @app.get("/which")
+        def which(db=Depends(routed.get_read_db)):
+            return {"db": db.execute(text("PRAGMA database_list")).fetchone()[2].rsplit("/", 1)[-1]}
+
+        client = TestClient(app)
+        assert client.get("/which").json() == {"db": "replica.db"}
+        assert client.get("/which", headers={"X-Read-Your-Writes": "true"}).json() == {"db": "primary.db"}
+
+    def test_async_read_db_uses_chosen_engine(self, routed, tmp_path, monkeypatch):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+        monkeypatch.setattr(routed, "AsyncSessionLocal", async_sessionmaker(primary))
+        monkeypatch.setattr(routed, "_async_replica_session", async_sessionmaker(replica))
+        app = FastAPI()
+
+        @app.get("/which")
+        async def which(db=Depends(routed.get_async_read_db)):
+            row = (await db.execute(text("PRAGMA database_list"))).fetchone()
+            return {"db": row[2].rsplit("/", 1)[-1]}
+
+        client = TestClient(app)
+        assert client.get("/which").json() == {"db": "replica.db"}
+        assert client.get("/which", headers={"X-Read-Your-Writes": "1"}).json() == {"db": "primary.db"}
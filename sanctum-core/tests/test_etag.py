@@ -0,0 +1,96 @@
+"""Tests for ETag / If-None-Match on ticket, project and article detail (app/services/etag.py).
+
+Covers:
+- Detail responses carry a strong ETag; a matching If-None-Match is a bodyless 304
+- A 304 costs the version query (plus auth), not the response graph
+- Child-table changes (a new comment) and different ?expand= values change the tag
+- resolve_embeds responses are not tagged
+- etag_matches handles lists, weak prefixes and *
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="etag.db") as harness:
+        project_id, milestone_id, article_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        with harness.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Tag Co", email="admin@tag.test")
+            db.add(models.Project(id=project_id, account_id=account_id, name="Tagged", status="active"))
+            db.add(models.Milestone(id=milestone_id, project_id=project_id, name="M1"))
+            db.add(models.Article(id=article_id, title="Runbook", slug="runbook", content="Body",
+                                  author_id=admin_id))
+            db.flush()
+            ticket = models.Ticket(account_id=account_id, subject="Tagged ticket", status="new",
+                                   priority="normal", ticket_type="task", milestone_id=milestone_id)
+            db.add(ticket)
+            db.flush()
+            ticket_id = ticket.id
+        harness.login_as(admin_id)
+        yield harness, {"ticket": f"/tickets/{ticket_id}", "project": f"/projects/{project_id}",
+                        "article": "/articles/runbook", "ticket_id": ticket_id, "admin_id": admin_id}
+
+
+@pytest.mark.parametrize("entity", ["ticket", "project", "article"])
+def test_conditional_get_round_trip(seeded, entity):
+    harness, paths = seeded
+    first = harness.client.get(paths[entity])
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    counter = harness.count("GET", paths[entity], expected_status=304, headers={"If-None-Match": etag})
+    assert counter.response.content == b""
+    assert counter.response.headers["ETag"] == etag
+    assert counter.count <= 4, counter.report()
+
+
+def test_child_change_and_expand_change_the_tag(seeded):
+    from app import models
+
+    harness, paths = seeded
+    etag = harness.client.get(paths["ticket"]).headers["ETag"]
+    assert harness.client.get(paths["ticket"], params={"expand": "none"}).headers["ETag"] != etag
+
+    with harness.session() as db:
+        db.add(models.Comment(id=uuid.uuid4(), author_id=paths["admin_id"], body="new",
+                              ticket_id=paths["ticket_id"]))
+
+    changed = harness.client.get(paths["ticket"], headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_resolved_embeds_are_not_tagged(seeded):
+    harness, paths = seeded
+    assert "ETag" not in harness.client.get(paths["ticket"], params={"resolve_embeds": "true"}).headers
+
+
+def test_missing_ticket_is_404(seeded):
+    harness, _ = seeded
+    assert harness.client.get("/tickets/999999").status_code == 404
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"abc"', True),
+    ('"x", "abc"', True),
+    ('W/"abc"', True),
+    ("*", True),
+    ('"other"', False),
+    (None, False),
+])
+def test_etag_matches(header, expected):
+    from app.services.etag import etag_matches
+
+    headers = [(b"if-none-match", header.encode())] if header else []
+    request = Request({"type": "http", "headers": headers, "query_string": b""})
+    assert etag_matches(request, '"abc"') is expected
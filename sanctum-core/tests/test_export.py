@@ -0,0 +1,147 @@
+"""Tests for the streaming exports (app/services/export.py).
+
+Covers:
+- GET /tickets/export streams NDJSON / CSV with the GET /tickets filters,
+  client scoping and SQL-computed total_hours
+- GET /tickets/time_entries/export carries names and duration_minutes and
+  honours user_id / since / until
+- GET /invoices/export is admin-only and derives overdue in SQL
+- iter_export yields one chunk per yield_per partition
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+START = datetime(2026, 6, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="export.db") as harness:
+        other, client_id = uuid.uuid4(), uuid.uuid4()
+        with harness.session() as db:
+            acme, admin_id = seed_account_admin(db, name="Acme", email="admin@export.test")
+            db.add(models.Account(id=other, name="Other", type="client", brand_affinity="ds", status="active"))
+            db.add(models.User(id=client_id, email="client@export.test", full_name="Client", role="client",
+                               account_id=acme, access_scope="global", is_active=True, user_type="human"))
+            db.flush()
+            tickets = [
+                models.Ticket(account_id=acme, subject="Acme open", status="open", priority="normal",
+                              ticket_type="task"),
+                models.Ticket(account_id=acme, subject="Acme, resolved", status="resolved", priority="normal",
+                              ticket_type="bug"),
+                models.Ticket(account_id=other, subject="Other open", status="open", priority="normal",
+                              ticket_type="task"),
+            ]
+            db.add_all(tickets)
+            db.flush()
+            ids = [t.id for t in tickets]
+            db.add_all([
+                models.TicketTimeEntry(ticket_id=ids[0], user_id=admin_id, start_time=START,
+                                       end_time=START + timedelta(minutes=90), description="setup"),
+                models.TicketTimeEntry(ticket_id=ids[2], user_id=admin_id, start_time=START + timedelta(days=2),
+                                       end_time=START + timedelta(days=2, minutes=30)),
+            ])
+            db.add_all([
+                models.Invoice(account_id=acme, status="sent", total_amount=100,
+                               due_date=date.today() - timedelta(days=3)),
+                models.Invoice(account_id=acme, status="sent", total_amount=200,
+                               due_date=date.today() + timedelta(days=10)),
+                models.Invoice(account_id=other, status="paid", total_amount=300),
+            ])
+        harness.login_as(admin_id)
+        yield harness, {"ids": ids, "acme": acme, "admin_id": admin_id, "client_id": client_id}
+
+
+def test_ticket_export_ndjson_filters_and_scope(seeded):
+    harness, data = seeded
+    response = harness.client.get("/tickets/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == 'attachment; filename="tickets.ndjson"'
+    rows = _ndjson(response)
+    assert [r["id"] for r in rows] == data["ids"]
+    assert rows[0]["account_name"] == "Acme"
+    assert rows[0]["total_hours"] == 1.5
+    assert "description" not in rows[0]
+
+    rows = _ndjson(harness.client.get("/tickets/export", params={"status": "open"}))
+    assert [r["subject"] for r in rows] == ["Acme open", "Other open"]
+    rows = _ndjson(harness.client.get("/tickets/export", params={"account_id": str(data["acme"])}))
+    assert [r["id"] for r in rows] == data["ids"][:2]
+
+    # Clients stay scoped to their own account, as on GET /tickets
+    harness.login_as(data["client_id"])
+    rows = _ndjson(harness.client.get("/tickets/export"))
+    assert {r["account_name"] for r in rows} == {"Acme"}
+
+
+def test_ticket_export_csv(seeded):
+    harness, data = seeded
+    response = harness.client.get("/tickets/export", params={"format": "csv", "account_id": str(data["acme"])})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["subject"] for r in rows] == ["Acme open", "Acme, resolved"]
+    assert rows[1]["milestone_name"] == ""
+
+    assert harness.client.get("/tickets/export", params={"format": "xml"}).status_code == 422
+
+
+def test_time_entry_export(seeded):
+    harness, data = seeded
+    rows = _ndjson(harness.client.get("/tickets/time_entries/export"))
+    assert [(r["ticket_id"], r["duration_minutes"]) for r in rows] == [(data["ids"][0], 90), (data["ids"][2], 30)]
+    assert rows[0]["user_name"] == "Admin"
+    assert rows[0]["account_name"] == "Acme"
+
+    rows = _ndjson(harness.client.get("/tickets/time_entries/export",
+                                      params={"since": (START + timedelta(days=1)).isoformat()}))
+    assert [r["ticket_id"] for r in rows] == [data["ids"][2]]
+    rows = _ndjson(harness.client.get("/tickets/time_entries/export", params={"user_id": str(uuid.uuid4())}))
+    assert rows == []
+
+
+def test_invoice_export(seeded):
+    harness, data = seeded
+    rows = _ndjson(harness.client.get("/invoices/export"))
+    assert sorted((r["total_amount"], r["status"]) for r in rows) == [
+        (100, "overdue"), (200, "sent"), (300, "paid"),
+    ]
+    rows = _ndjson(harness.client.get("/invoices/export", params={"status": "overdue"}))
+    assert [r["total_amount"] for r in rows] == [100]
+    rows = _ndjson(harness.client.get("/invoices/export", params={"account_id": str(data["acme"])}))
+    assert {r["account_name"] for r in rows} == {"Acme"}
+
+    harness.login_as(data["client_id"])
+    assert harness.client.get("/invoices/export").status_code == 403
+
+
+def test_iter_export_streams_in_partitions(seeded):
+    from app import models
+    from app.services.export import iter_export
+
+    harness, data = seeded
+    stmt = select(models.Ticket.id, models.Ticket.subject).order_by(models.Ticket.id)
+    with harness.session() as db:
+        chunks = list(iter_export(db, stmt, "ndjson", batch_size=2))
+        assert [chunk.count("\n") for chunk in chunks] == [2, 1]
+        chunks = list(iter_export(db, stmt, "csv", batch_size=2))
+        assert chunks[0] == "id,subject\r\n"
+        assert len(chunks) == 3
@@ -0,0 +1,46 @@
+"""Tests for lazy heavy imports and scripts/import_report.py.
+
+Covers:
+- parse_importtime reads -X importtime lines and nesting depth, skipping noise
+- summarise aggregates self time per package and flags eager deferred deps
+- Importing app.main does not load fpdf / resend / jinja2 / playwright / bs4 / dns
+"""
+
+from __future__ import annotations
+
+from scripts.import_report import DEFERRED_PACKAGES, parse_importtime, summarise, trace_import
+
+TRACE = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     fpdf.fonts
+import time:       300 |        400 |   fpdf
+import time:        50 |         50 |   app.services.email_service
+WARNING:sanctum.email:RESEND_API_KEY not found in env. Email disabled.
+import time:      1000 |       1450 | app.main
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(TRACE)
+
+    assert [r.module for r in records] == ["fpdf.fonts", "fpdf", "app.services.email_service", "app.main"]
+    assert [r.depth for r in records] == [2, 1, 1, 0]
+    assert records[-1].cumulative_us == 1450
+
+
+def test_summarise_groups_packages_and_flags_deferred():
+    summary = summarise(parse_importtime(TRACE), top=5)
+
+    assert summary["modules"] == 4
+    assert summary["total_ms"] == 1.4
+    assert summary["packages_by_self_time"][0] == {"package": "app", "self_ms": 1.1}
+    assert {"package": "fpdf", "self_ms": 0.4} in summary["packages_by_self_time"]
+    assert summary["eager_deferred"] == ["fpdf"]
+
+
+def test_app_main_defers_heavy_dependencies():
+    records = parse_importtime(trace_import("app.main"))
+    loaded = {r.package for r in records}
+
+    assert "app" in loaded
+    assert loaded.isdisjoint(DEFERRED_PACKAGES), sorted(loaded & set(DEFERRED_PACKAGES))
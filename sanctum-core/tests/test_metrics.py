@@ -0,0 +1,186 @@
+"""Unit tests for Prometheus metrics (app/metrics.py) and GET /metrics.
+
+Covers:
+- Counter / gauge / histogram text exposition (cumulative buckets, +Inf, escaping)
+- Middleware labels by route template; unmatched paths share one label
+- In-flight gauge returns to zero; BackgroundTasks time is split out of latency
+- track_task records duration and failures
+- Event bus in-flight gauge counts only running jobs and drains even when
+  the job raises
+- GET /metrics on the app serves text/plain with HTTP, pool and queue series
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+
+
+def _fresh(monkeypatch):
+    """Swap in an empty registry and re-create the HTTP metrics on it."""
+    from app import metrics
+
+    reg = metrics.Registry()
+    monkeypatch.setattr(metrics, "registry", reg)
+    for attr, factory, args in (
+        ("http_requests_total", metrics.counter, ("sanctum_http_requests_total", "", ("method", "route", "status"))),
+        ("http_request_duration", metrics.histogram, ("sanctum_http_request_duration_seconds", "", ("method", "route"))),
+        ("http_requests_in_flight", metrics.gauge, ("sanctum_http_requests_in_flight", "")),
+        ("http_background_duration", metrics.histogram, ("sanctum_http_background_seconds", "", ("method", "route"))),
+    ):
+        monkeypatch.setattr(metrics, attr, factory(*args))
+    return metrics
+
+
+class TestExposition:
+    def test_counter_and_gauge(self):
+        from app.metrics import Counter, Gauge, Registry
+
+        reg = Registry()
+        c = reg.register(Counter("jobs_total", "Jobs.", ("kind",)))
+        g = reg.register(Gauge("depth", "Depth."))
+        c.inc(kind='a"b')
+        c.inc(2, kind='a"b')
+        g.set(4)
+
+        text = reg.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a\\"b"} 3' in text
+        assert "depth 4" in text
+
+    def test_counter_callback_read_at_scrape(self):
+        from app.metrics import Counter, Registry
+
+        total = {"n": 2}
+        reg = Registry()
+        reg.register(Counter("timeouts_total", "Timeouts.", callback=lambda: total["n"]))
+        total["n"] = 5
+        text = reg.render()
+        assert "# TYPE timeouts_total counter" in text
+        assert "timeouts_total 5" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        from app.metrics import Histogram
+
+        h = Histogram("lat_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 5.0):
+            h.observe(v, route="/x")
+
+        lines = h.samples()
+        assert 'lat_seconds_bucket{route="/x",le="0.1"} 1' in lines
+        assert 'lat_seconds_bucket{route="/x",le="1"} 2' in lines
+        assert 'lat_seconds_bucket{route="/x",le="+Inf"} 3' in lines
+        assert 'lat_seconds_count{route="/x"} 3' in lines
+
+    def test_wrong_labels_rejected(self):
+        from app.metrics import Counter
+
+        with pytest.raises(ValueError):
+            Counter("x_total", "X.", ("a",)).inc(b="1")
+
+    def test_failing_callback_skipped(self):
+        from app.metrics import Gauge, Registry
+
+        reg = Registry()
+        reg.register(Gauge("broken", "Broken.", callback=lambda: 1 / 0))
+        reg.register(Gauge("ok", "Ok.", callback=lambda: 1))
+        text = reg.render()
+        assert "broken" not in text
+        assert "ok 1" in text
+
+
+class TestMiddleware:
+    def _app(self, metrics):
+        app = FastAPI()
+        app.add_middleware(metrics.MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def item(item_id: int):
+            return {"id": item_id}
+
+        @app.get("/slow-bg")
+        def slow_bg(background_tasks: BackgroundTasks):
+            background_tasks.add_task(time.sleep, 0.05)
+            return {}
+
+        return app
+
+    def test_route_template_labels(self, monkeypatch):
+        metrics = _fresh(monkeypatch)
+        client = TestClient(self._app(metrics))
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/nope/123")
+
+        assert metrics.http_requests_total.value(method="GET", route="/items/{item_id}", status="200") == 2
+        assert metrics.http_requests_total.value(method="GET", route="<unmatched>", status="404") == 1
+        assert "/items/1" not in metrics.registry.render()
+        assert metrics.http_requests_in_flight.value() == 0
+
+    def test_background_time_excluded_from_latency(self, monkeypatch):
+        metrics = _fresh(monkeypatch)
+        TestClient(self._app(metrics)).get("/slow-bg")
+
+        text = metrics.registry.render()
+        bg_sum = float(next(l for l in text.splitlines()
+                            if l.startswith('sanctum_http_background_seconds_sum{method="GET",route="/slow-bg"}')).split()[-1])
+        lat_sum = float(next(l for l in text.splitlines()
+                             if l.startswith('sanctum_http_request_duration_seconds_sum{method="GET",route="/slow-bg"}')).split()[-1])
+        assert bg_sum >= 0.05
+        assert lat_sum < bg_sum
+
+
+class TestBackgroundTasks:
+    def test_track_task_records_failures(self):
+        from app.metrics import background_task_duration, background_task_failures, track_task
+
+        before = background_task_duration.count(task="unit_test_job")
+        with pytest.raises(RuntimeError):
+            with track_task("unit_test_job"):
+                raise RuntimeError("boom")
+
+        assert background_task_duration.count(task="unit_test_job") == before + 1
+        assert background_task_failures.value(task="unit_test_job") >= 1
+
+    def test_event_bus_in_flight_drains(self, monkeypatch):
+        from app.services.event_bus import EventBus
+
+        bus = EventBus()
+        seen = []
+
+        def process(event_type, payload):
+            seen.append(bus.in_flight)
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(bus, "_process_dynamic_rules", process)
+        tasks = BackgroundTasks()
+        bus.emit("unit_test_event", object(), tasks)
+        # Queued but never run (e.g. the request failed) leaves nothing behind.
+        assert bus.in_flight == 0
+
+        with pytest.raises(RuntimeError):
+            tasks.tasks[0].func(*tasks.tasks[0].args)
+        assert seen == [1]
+        assert bus.in_flight == 0
+
+
+def test_metrics_endpoint_on_app():
+    from app.main import app
+
+    client = TestClient(app)
+    client.get("/")
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert 'sanctum_http_requests_total{method="GET",route="/",status="200"}' in body
+    assert "sanctum_http_requests_in_flight" in body
+    assert "# TYPE sanctum_db_pool_connections gauge" in body
+    assert "# TYPE sanctum_db_pool_checkout_timeouts_total counter" in body
+    assert 'sanctum_db_pool_checkout_timeouts_total{engine="sync"}' in body
+    assert "sanctum_event_bus_tasks_in_flight" in body
+    assert "sanctum_token_usage_pending" in body
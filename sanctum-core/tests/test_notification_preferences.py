@@ -0,0 +1,40 @@
+"""Tests for GET/PUT /notifications/preferences with a detached principal.
+
+Covers:
+- The authenticated user comes from the async auth session (or the principal
+  cache), so the handlers query the preference row through their own session
+  instead of the notification_preferences backref
+- GET returns defaults when no row exists; PUT creates, then updates, the row
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="notification_preferences.db") as h:
+        with h.session() as db:
+            _, admin_id = seed_account_admin(db, email="prefs@notify.test")
+        h.login_as(admin_id)
+        yield h
+
+
+def test_defaults_then_create_and_update(harness):
+    from app import models
+
+    assert harness.count("GET", "/notifications/preferences").response.json() == {
+        "email_frequency": "daily", "force_critical": True,
+    }
+
+    body = {"email_frequency": "hourly", "force_critical": False}
+    assert harness.count("PUT", "/notifications/preferences", json=body).response.json() == body
+    body = {"email_frequency": "realtime", "force_critical": True}
+    harness.count("PUT", "/notifications/preferences", json=body)
+    assert harness.count("GET", "/notifications/preferences").response.json() == body
+
+    with harness.session() as db:
+        assert db.query(models.UserNotificationPreference).count() == 1
@@ -0,0 +1,156 @@
+"""Unit tests for the JWT principal cache (app/auth.py).
+
+Covers:
+- HS256: second resolution is served from cache without a users lookup
+- RS256 user token: cached by sub; M2M tokens are never cached
+- Cached value is an immutable UserSnapshot without secrets
+- Expired tokens are still rejected on a cache hit (decode runs first)
+- Entries are capped at the presenting token's exp
+- admin_update_user / admin_delete_user evict the user's entries
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from tests.conftest import sign_rs256
+
+
+def _user(email="cached@example.com"):
+    return SimpleNamespace(
+        id=uuid4(), email=email, full_name="Cached User", role="tech",
+        access_scope="global", is_active=True, account_id=None,
+        user_type="human", has_2fa=False, password_hash="secret", totp_secret="secret",
+    )
+
+
+def _fake_db_returning(user):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = user
+    return db
+
+
+def _hs256(email, exp_delta=300):
+    from app import auth
+
+    return jwt.encode({"sub": email, "exp": int(time.time()) + exp_delta},
+                      auth.SECRET_KEY, algorithm="HS256")
+
+
+class TestHS256PrincipalCache:
+    @pytest.mark.asyncio
+    async def test_second_call_skips_db(self):
+        from app import auth
+        from app.principals import UserSnapshot
+
+        user = _user()
+        token = _hs256(user.email)
+        db = _fake_db_returning(user)
+
+        first = await auth._resolve_principal(token, db)
+        second = await auth._resolve_principal(token, db)
+
+        assert first is user
+        assert isinstance(second, UserSnapshot)
+        assert second.id == user.id and second.role == "tech"
+        assert db.query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_immutable_and_secret_free(self):
+        from app import auth
+
+        user = _user()
+        token = _hs256(user.email)
+        await auth._resolve_principal(token, _fake_db_returning(user))
+        snap = await auth._resolve_principal(token, _fake_db_returning(None))
+
+        assert not hasattr(snap, "password_hash")
+        assert not hasattr(snap, "totp_secret")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snap.role = "admin"
+
+    @pytest.mark.asyncio
+    async def test_expired_token_rejected_despite_cache(self):
+        from app import auth
+
+        user = _user()
+        await auth._resolve_principal(_hs256(user.email), _fake_db_returning(user))
+
+        with pytest.raises(HTTPException) as exc:
+            await auth._resolve_principal(_hs256(user.email, exp_delta=-10), _fake_db_returning(user))
+        assert exc.value.status_code == 401
+
+    def test_entry_capped_at_token_exp(self):
+        from app import auth
+
+        auth._remember_principal(("hs256", "soon@example.com"), _user(), time.time() + 0.05)
+        auth._remember_principal(("hs256", "gone@example.com"), _user(), time.time() - 1)
+
+        assert auth.principal_cache.get(("hs256", "soon@example.com")) is not None
+        time.sleep(0.06)
+        assert auth.principal_cache.get(("hs256", "soon@example.com")) is None
+        assert auth.principal_cache.get(("hs256", "gone@example.com")) is None
+
+
+class TestRS256PrincipalCache:
+    @pytest.mark.asyncio
+    async def test_user_token_cached_by_sub(self, oidc_rs256_keys):
+        from app import auth
+
+        user = _user()
+        now = int(time.time())
+        token = sign_rs256({
+            "iss": oidc_rs256_keys.issuer, "aud": oidc_rs256_keys.audience,
+            "sub": str(user.id), "email": user.email, "iat": now, "exp": now + 300,
+        }, oidc_rs256_keys)
+        db = _fake_db_returning(user)
+
+        await auth._resolve_principal(token, db)
+        snap = await auth._resolve_principal(token, db)
+
+        assert snap.id == user.id
+        assert db.query.call_count == 1
+        assert ("rs256", str(user.id)) in auth.principal_cache._data
+
+    @pytest.mark.asyncio
+    async def test_m2m_token_not_cached(self, oidc_rs256_keys):
+        from app import auth
+
+        now = int(time.time())
+        token = sign_rs256({
+            "iss": oidc_rs256_keys.issuer, "aud": "sanctum-core-api",
+            "sub": "svc-1", "client_id": "svc-1", "grant_type": "client_credentials",
+            "scope": "tickets:read", "iat": now, "exp": now + 300,
+        }, oidc_rs256_keys)
+
+        await auth._resolve_principal(token, _fake_db_returning(None))
+        assert len(auth.principal_cache) == 0
+
+
+class TestAdminInvalidation:
+    @pytest.mark.asyncio
+    async def test_update_and_delete_evict(self, monkeypatch):
+        from app import auth
+        from app.routers import admin
+
+        user = _user()
+        token = _hs256(user.email)
+        await auth._resolve_principal(token, _fake_db_returning(user))
+        assert len(auth.principal_cache) == 1
+
+        monkeypatch.setattr(admin, "get_or_404", lambda *a, **k: user)
+        admin.admin_update_user(str(user.id), admin.UserUpdate(full_name="Renamed"),
+                                current_user=_user("admin@example.com"), db=MagicMock())
+        assert len(auth.principal_cache) == 0
+
+        await auth._resolve_principal(token, _fake_db_returning(user))
+        admin.admin_delete_user(str(user.id), current_user=_user("admin@example.com"), db=MagicMock())
+        assert len(auth.principal_cache) == 0
@@ -0,0 +1,216 @@
+"""Table-driven query-budget suite for Core's hot list and detail endpoints.
+
+Each case seeds the same fixture graph at two sizes (``SMALL`` and ``LARGE``
+related rows per parent) in a private SQLite database via
+:class:`tests.helpers.query_budget.QueryBudgetHarness`, issues one request per
+size and asserts the statement count does not grow with N — i.e. no N+1.
+Some cases also carry an absolute ceiling.
+
+On failure the message lists both runs' statements grouped by template, so the
+repeated query is obvious.
+
+Covers:
+- GET /tickets, /tickets/{id}
+- GET /projects, /projects/{id}, /milestones/{id}
+- GET /artefacts
+- GET /workbench
+- GET /portal/dashboard (client user)
+- GET /analytics/*
+- GET /search
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+SMALL = 2
+LARGE = 5  # Workbench caps pins at 5.
+
+T0 = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+
+@dataclass
+class Seeded:
+    admin: object
+    client: object
+    account_id: uuid.UUID
+    project_id: uuid.UUID
+    milestone_id: uuid.UUID
+    ticket_id: int
+
+
+def seed(db, n: int) -> Seeded:
+    """Build one account graph where every collection has ``n`` members."""
+    from app import models
+
+    account_id, admin_id = seed_account_admin(db, name="Budget Corp", email="admin@budget.test")
+    admin = db.get(models.User, admin_id)
+    client = models.User(id=uuid.uuid4(), email="client@budget.test", full_name="Client",
+                         role="client", access_scope="restricted", is_active=True,
+                         user_type="human", account_id=account_id)
+    db.add(client)
+    product = models.Product(id=uuid.uuid4(), name="Labour", type="service", unit_price=150)
+    db.add(product)
+    db.flush()
+
+    contacts = [
+        models.Contact(id=uuid.uuid4(), account_id=account_id, first_name=f"C{i}",
+                       last_name="Budget", email="client@budget.test" if i == 0 else f"c{i}@budget.test")
+        for i in range(n)
+    ]
+    db.add_all(contacts)
+    db.add_all([
+        models.Deal(id=uuid.uuid4(), account_id=account_id, title=f"Deal {i}",
+                    amount=1000 * (i + 1), stage="Proposal", probability=50,
+                    expected_close_date=(T0 + timedelta(days=30 * i)).date())
+        for i in range(n)
+    ])
+
+    projects = [
+        models.Project(id=uuid.uuid4(), account_id=account_id, name=f"Budget Project {i}",
+                       status="active", budget=5000, created_at=T0 + timedelta(minutes=i))
+        for i in range(n)
+    ]
+    db.add_all(projects)
+    db.flush()
+    project = projects[0]
+
+    milestones = [
+        models.Milestone(id=uuid.uuid4(), project_id=project.id, name=f"Phase {i}",
+                         status="active", sequence=i + 1, billable_amount=100)
+        for i in range(n)
+    ]
+    db.add_all(milestones)
+    db.flush()
+    milestone = milestones[0]
+
+    tickets = []
+    for i in range(n):
+        ticket = models.Ticket(
+            account_id=account_id, subject=f"Budget ticket {i}", description="Budget body",
+            status="open", priority="normal", ticket_type="task",
+            milestone_id=milestone.id, contact_id=contacts[0].id,
+            created_at=T0 + timedelta(hours=i),
+        )
+        ticket.contacts = list(contacts)
+        tickets.append(ticket)
+    db.add_all(tickets)
+    db.flush()
+
+    for ticket in tickets:
+        for j in range(n):
+            db.add(models.TicketTimeEntry(
+                ticket_id=ticket.id, user_id=admin.id, product_id=product.id,
+                start_time=T0 + timedelta(hours=j), end_time=T0 + timedelta(hours=j, minutes=30),
+            ))
+            db.add(models.TicketMaterial(ticket_id=ticket.id, product_id=product.id, quantity=1))
+            db.add(models.Comment(ticket_id=ticket.id, author_id=admin.id, body=f"note {j}",
+                                  visibility="public"))
+    for other in tickets[1:]:
+        db.execute(models.ticket_relations.insert().values(
+            ticket_id=tickets[0].id, related_id=other.id,
+            relation_type="relates_to", visibility="internal",
+        ))
+
+    for i in range(n):
+        artefact = models.Artefact(id=uuid.uuid4(), name=f"Budget artefact {i}",
+                                   artefact_type="document", account_id=account_id,
+                                   created_by=admin.id, status="draft", sensitivity="internal",
+                                   artefact_metadata={})
+        db.add(artefact)
+        db.flush()
+        for entity_type, entity_id in (("ticket", tickets[0].id), ("project", project.id),
+                                       ("milestone", milestone.id)):
+            db.add(models.ArtefactLink(artefact_id=artefact.id, linked_entity_type=entity_type,
+                                       linked_entity_id=str(entity_id)))
+
+    for i, p in enumerate(projects):
+        db.add(models.WorkbenchPin(user_id=admin.id, project_id=p.id, position=i))
+
+    for i in range(n):
+        invoice = models.Invoice(id=uuid.uuid4(), account_id=account_id, status="sent",
+                                 total_amount=100 * (i + 1), generated_at=T0 - timedelta(days=i),
+                                 due_date=(T0 + timedelta(days=14)).date())
+        db.add(invoice)
+        db.flush()
+        db.add(models.InvoiceItem(invoice_id=invoice.id, description="Labour", quantity=1,
+                                  unit_price=100, total=100, ticket_id=tickets[0].id))
+        db.add(models.Asset(account_id=account_id, name=f"Asset {i}", asset_type="hardware"))
+
+    db.flush()
+    return Seeded(admin=admin, client=client, account_id=account_id, project_id=project.id,
+                  milestone_id=milestone.id, ticket_id=tickets[0].id)
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    path: Callable[[Seeded], str]
+    as_client: bool = False
+    ceiling: Optional[int] = None
+
+
+CASES = [
+    Case("tickets", lambda s: "/tickets?limit=50"),
+    Case("ticket_detail", lambda s: f"/tickets/{s.ticket_id}"),
+    Case("projects", lambda s: "/projects?expand=milestones"),
+    Case("project_detail", lambda s: f"/projects/{s.project_id}"),
+    Case("milestone_detail", lambda s: f"/milestones/{s.milestone_id}"),
+    Case("artefacts", lambda s: "/artefacts"),
+    Case("workbench", lambda s: "/workbench", ceiling=10),
+    Case("portal_dashboard", lambda s: "/portal/dashboard", as_client=True),
+    Case("analytics_revenue_trend", lambda s: "/analytics/revenue-trend", ceiling=3),
+    Case("analytics_asset_reliability", lambda s: "/analytics/asset-reliability", ceiling=3),
+    Case("analytics_cash_position", lambda s: "/analytics/cash-position", ceiling=6),
+    Case("analytics_pipeline_forecast", lambda s: "/analytics/pipeline-forecast", ceiling=3),
+    Case("analytics_recurring_revenue", lambda s: "/analytics/recurring-revenue", ceiling=3),
+    Case("analytics_budget_vs_actual", lambda s: "/analytics/budget-vs-actual"),
+    Case("search", lambda s: "/search?q=budget"),
+]
+
+
+def _run(tmp_path, case: Case, n: int):
+    with QueryBudgetHarness(tmp_path, name=f"{case.name}_{n}.db") as harness:
+        with harness.session() as db:
+            seeded = seed(db, n)
+            db.commit()
+            harness.login(seeded.client if case.as_client else seeded.admin)
+        # Warm process-level caches (governance transitions etc.) so only the
+        # request's own queries are counted.
+        harness.client.get(case.path(seeded))
+        # ...but not result caches, or the counted request wouldn't query at all.
+        harness.reset_result_caches()
+        return harness.count("GET", case.path(seeded))
+
+
+# case name -> reason; listed cases are strict xfails until fixed.
+KNOWN_N_PLUS_ONE: dict[str, str] = {}
+
+
+def _params():
+    for case in CASES:
+        marks = []
+        if case.name in KNOWN_N_PLUS_ONE:
+            marks.append(pytest.mark.xfail(reason=KNOWN_N_PLUS_ONE[case.name], strict=True))
+        yield pytest.param(case, id=case.name, marks=marks)
+
+
+@pytest.mark.parametrize("case", list(_params()))
+def test_query_count_constant_in_n(tmp_path, case):
+    small = _run(tmp_path, case, SMALL)
+    large = _run(tmp_path, case, LARGE)
+
+    assert large.count == small.count, (
+        f"{case.name}: statement count grew with N "
+        f"({small.count} at N={SMALL} -> {large.count} at N={LARGE}).\n"
+        f"N={SMALL}: {small.report()}\nN={LARGE}: {large.report()}"
+    )
+    if case.ceiling is not None:
+        assert large.count <= case.ceiling, f"{case.name}: {large.report()}"
@@ -0,0 +1,125 @@
+"""Unit tests for per-request DB query stats (app/query_stats.py).
+
+Covers:
+- X-DB-Queries / X-DB-Time-Ms headers count statements from sync handlers
+- Async handlers on an AsyncSession are attributed to the request too
+- Statements outside a tracked request are ignored
+- sample_rate=0 disables tracking and headers
+- Slow requests log at WARNING with the route template and slowest statement
+- A statement that raises keeps its start time on its own (discarded)
+  execution context, so only the statements that completed are counted and timed
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+@pytest.fixture
+def hooks():
+    from app import query_stats
+
+    query_stats.install_query_hooks()
+    yield query_stats
+    query_stats.uninstall_query_hooks()
+
+
+def _app(tmp_path, **middleware_kwargs):
+    from app.query_stats import QueryStatsMiddleware
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    aeng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, **middleware_kwargs)
+
+    @app.get("/items/{item_id}")
+    def sync_items(item_id: int):
+        with eng.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    @app.get("/async")
+    async def async_items():
+        async with aeng.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {}
+
+    @app.get("/fails")
+    def failing_statement():
+        with eng.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                conn.rollback()
+            conn.execute(text("SELECT 1"))
+        return {}
+
+    return app, eng
+
+
+class TestQueryStatsMiddleware:
+    def test_headers_count_sync_statements(self, hooks, tmp_path):
+        app, _ = _app(tmp_path)
+        resp = TestClient(app).get("/items/7")
+
+        assert resp.status_code == 200
+        assert resp.headers["x-db-queries"] == "3"
+        assert float(resp.headers["x-db-time-ms"]) >= 0
+
+    def test_async_statements_attributed(self, hooks, tmp_path):
+        app, _ = _app(tmp_path)
+        resp = TestClient(app).get("/async")
+
+        assert resp.headers["x-db-queries"] == "2"
+
+    def test_untracked_statements_ignored(self, hooks, tmp_path):
+        app, eng = _app(tmp_path)
+        with eng.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert hooks.current_stats() is None
+
+    def test_sampling_off_emits_nothing(self, hooks, tmp_path):
+        app, _ = _app(tmp_path, sample_rate=0.0)
+        resp = TestClient(app).get("/items/1")
+
+        assert "x-db-queries" not in resp.headers
+
+    def test_slow_request_logged_with_template(self, hooks, tmp_path, caplog):
+        app, _ = _app(tmp_path, slow_request_ms=0)
+        with caplog.at_level(logging.INFO, logger="sanctum.db"):
+            TestClient(app).get("/items/42")
+
+        slow = [r for r in caplog.records if r.getMessage().startswith("db_slow_request")]
+        assert len(slow) == 1
+        record = json.loads(slow[0].getMessage().split(" ", 1)[1])
+        assert record["route"] == "/items/{item_id}"
+        assert record["queries"] == 3
+        assert record["slowest_statement"] == "SELECT 1"
+        assert slow[0].levelno == logging.WARNING
+
+    def test_failed_statement_leaves_no_state(self, hooks, tmp_path, caplog):
+        app, eng = _app(tmp_path, slow_request_ms=0)
+        failed = []
+        event.listen(eng, "handle_error", lambda ctx: failed.append(ctx.execution_context))
+        with caplog.at_level(logging.INFO, logger="sanctum.db"):
+            resp = TestClient(app).get("/fails")
+
+        assert resp.headers["x-db-queries"] == "1"
+        # The failed statement's start time stayed on its own context...
+        assert len(failed) == 1
+        assert hasattr(failed[0], hooks._START_ATTR)
+        # ...so the statement after it was timed on its own.
+        slow = [r for r in caplog.records if r.getMessage().startswith("db_slow_request")]
+        record = json.loads(slow[0].getMessage().split(" ", 1)[1])
+        assert record["queries"] == 1
+        assert record["slowest_statement"] == "SELECT 1"
+        assert record["db_ms"] == record["slowest_ms"]
@@ -0,0 +1,107 @@
+"""Tests for the search benchmark harness (scripts/search_benchmark.py).
+
+Covers:
+- Nearest-rank percentiles and recall@k
+- The synthetic corpus is deterministic per seed, sized as asked and carries the needles
+- run_benchmark replays queries through the real /search handler and reports
+  latency percentiles and recall for labelled queries (small corpus, SQLite)
+- Calls answered with X-Search-Partial are counted per query and overall; the
+  benchmark lifts the search deadline unless one is asked for
+- The reset guard refuses the application's database however its URL is spelled
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from scripts import search_benchmark as bench
+from tests.helpers.query_budget import QueryBudgetHarness
+
+SMALL = {"accounts": 20, "tickets": 200, "articles": 30, "contacts": 40}
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert bench.percentile(values, 50) == 50
+    assert bench.percentile(values, 95) == 95
+    assert bench.percentile(values, 99) == 99
+    assert bench.percentile([7.0], 99) == 7.0
+    assert bench.percentile([], 50) == 0.0
+
+
+def test_recall_at_k():
+    results = [{"type": "ticket", "title": "#12 Kestrel scanner"}, {"type": "client", "title": "Zephyr"}]
+    assert bench.recall_at_k(results, [("ticket", "Kestrel scanner"), ("client", "Zephyr")], k=2) == 1.0
+    assert bench.recall_at_k(results, [("ticket", "Kestrel scanner"), ("client", "Zephyr")], k=1) == 0.5
+    assert bench.recall_at_k(results, [], k=1) == 1.0
+
+
+def test_corpus_is_deterministic_and_sized():
+    a = bench.generate_corpus(SMALL, seed=7)
+    b = bench.generate_corpus(SMALL, seed=7)
+    assert a == b
+    assert len(a["tickets"]) == SMALL["tickets"] + len(bench.NEEDLES["ticket"])
+    assert len(a["accounts"]) == SMALL["accounts"]
+    assert any(t["subject"] == "Kestrel scanner jams on duplex" for t in a["tickets"])
+    assert bench.generate_corpus(SMALL, seed=8)["tickets"] != a["tickets"]
+
+
+@pytest.mark.parametrize("path", ["index", "entities"])
+def test_run_benchmark_end_to_end(tmp_path, monkeypatch, path):
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+
+    from app import models
+    from app.routers import search
+    from app.services import search_index
+
+    monkeypatch.setattr(search, "SEARCH_INDEX_ENABLED", search.SEARCH_INDEX_ENABLED)
+    monkeypatch.setattr(search.search_cache, "maxsize", search.search_cache.maxsize)
+    monkeypatch.setattr(search, "SEARCH_TIMEOUT_SECONDS", search.SEARCH_TIMEOUT_SECONDS)
+
+    with QueryBudgetHarness(tmp_path, name="bench.db") as harness:
+        corpus = bench.generate_corpus(SMALL)
+        with harness.engine.begin() as conn:
+            for name, model in (("accounts", models.Account), ("contacts", models.Contact),
+                                ("tickets", models.Ticket), ("articles", models.Article)):
+                conn.execute(insert(model), corpus[name])
+        with Session(harness.engine) as db:
+            search_index.rebuild(db)
+            db.commit()
+
+        # The typo query needs real pg_trgm similarity; the SQLite stand-in is only rough.
+        labelled = [q for q in bench.QUERIES if q.expected and q.q != "firewal audit"]
+        runner = bench.make_search(harness.async_engine, path)
+        summary = asyncio.run(bench.run_benchmark(runner, labelled + [bench.BenchQuery("printer")],
+                                                  repeat=3, warmup=1))
+
+    overall = summary["overall"]
+    assert overall["calls"] == 3 * (len(labelled) + 1)
+    assert 0 < overall["p50_ms"] <= overall["p95_ms"] <= overall["p99_ms"]
+    assert overall["recall_at_5"] == 1.0, summary["queries"]
+    assert summary["queries"][-1]["recall"] is None and summary["queries"][-1]["results"] > 0
+    assert overall["partial_calls"] == 0
+    assert search.SEARCH_TIMEOUT_SECONDS == bench.NO_DEADLINE_SECONDS
+
+
+def test_partial_calls_reported():
+    async def search(q):
+        if q == "slow":
+            search.partial_calls += 1
+        return []
+
+    search.partial_calls = 0
+    summary = asyncio.run(bench.run_benchmark(search, [bench.BenchQuery("fast"), bench.BenchQuery("slow")],
+                                              repeat=3, warmup=1))
+    assert [row["partial"] for row in summary["queries"]] == [0, 3]
+    assert summary["overall"]["partial_calls"] == 3
+
+
+def test_reset_guard_refuses_app_database(monkeypatch):
+    monkeypatch.setattr(bench, "APP_DATABASE_URL", "postgresql://sanctum@localhost/sanctum_core")
+    with pytest.raises(SystemExit):
+        bench.main(["--database-url", "postgresql+psycopg2://other@LOCALHOST/sanctum_core", "--reset"])
+    assert not bench._same_database("postgresql://localhost/sanctum_bench",
+                                    "postgresql://localhost/sanctum_core")
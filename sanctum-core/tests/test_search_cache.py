@@ -0,0 +1,122 @@
+"""Tests for the global-search result cache (app/routers/search.py).
+
+Covers:
+- A repeated query is served from the cache without touching the database
+- Keys are scoped by role / account: a client never sees an admin's cached answer
+- Committing a write to an entity type drops entries whose scope includes it, and only those
+- A rolled-back write invalidates nothing
+- A longer term is never answered from a cached prefix, so body-text and fuzzy
+  matches are the same as on a cold cache
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="search_cache.db") as h:
+        yield h
+
+
+@pytest.fixture
+def seeded(harness):
+    from app import models
+
+    ids = {"other": uuid.uuid4(), "client": uuid.uuid4()}
+    with harness.session() as db:
+        ids["acme"], ids["admin"] = seed_account_admin(db, name="Acme Widgets", email="admin@cache.test")
+        db.add(models.Account(id=ids["other"], name="Other Co", type="client", brand_affinity="ds", status="active"))
+        db.flush()
+        db.add_all([
+            models.Ticket(account_id=ids["acme"], subject="Widget fault", status="new", priority="normal"),
+            models.Ticket(account_id=ids["other"], subject="Widget outage", status="new", priority="normal"),
+            models.User(id=ids["client"], email="client@cache.test", full_name="Client", role="client",
+                        access_scope="restricted", is_active=True, user_type="human", account_id=ids["acme"]),
+        ])
+    return ids
+
+
+def _titles(counter):
+    return sorted(r["title"].split(" ", 1)[1] if r["type"] == "ticket" else r["title"]
+                  for r in counter.response.json())
+
+
+def test_repeat_query_is_a_cache_hit(harness, seeded):
+    from app.routers.search import search_cache
+
+    harness.login_as(seeded["admin"])
+    first = harness.count("GET", "/search?q=widget")
+    second = harness.count("GET", "/search?q=widget")
+    assert first.count >= 1 and second.count == 0
+    assert second.response.json() == first.response.json()
+    assert search_cache.stats()["hits"] >= 1
+
+
+def test_keys_are_scoped_by_user(harness, seeded):
+    harness.login_as(seeded["admin"])
+    assert _titles(harness.count("GET", "/search?q=widget")) == ["Acme Widgets", "Widget fault", "Widget outage"]
+
+    harness.login_as(seeded["client"])
+    client = harness.count("GET", "/search?q=widget")
+    assert client.count >= 1
+    assert "Widget outage" not in _titles(client)
+
+
+def test_write_invalidates_only_affected_types(harness, seeded):
+    from app import models
+
+    harness.login_as(seeded["admin"])
+    harness.count("GET", "/search?q=t: widget")
+    harness.count("GET", "/search?q=c: widget")
+
+    with harness.session() as db:
+        db.add(models.Ticket(account_id=seeded["acme"], subject="Widget recall", status="new", priority="normal"))
+
+    tickets = harness.count("GET", "/search?q=t: widget")
+    assert tickets.count >= 1 and "Widget recall" in _titles(tickets)
+    assert harness.count("GET", "/search?q=c: widget").count == 0
+
+
+def test_rollback_invalidates_nothing(harness, seeded):
+    from sqlalchemy.orm import Session
+
+    from app import models
+
+    harness.login_as(seeded["admin"])
+    harness.count("GET", "/search?q=widget")
+    with Session(harness.engine) as db:
+        db.add(models.Ticket(account_id=seeded["acme"], subject="Widget ghost", status="new", priority="normal"))
+        db.flush()
+        db.rollback()
+    assert harness.count("GET", "/search?q=widget").count == 0
+
+
+def test_cached_prefix_does_not_answer_longer_term(harness, seeded):
+    from app import models
+    from app.routers.search import search_cache
+
+    with harness.session() as db:
+        db.add_all([
+            models.Ticket(account_id=seeded["acme"], subject="Printer jam", status="new", priority="normal"),
+            models.Ticket(account_id=seeded["acme"], subject="Tray fault", status="new", priority="normal",
+                          description="The printer reports an empty tray"),
+        ])
+    harness.login_as(seeded["admin"])
+    assert "Tray fault" in _titles(harness.count("GET", "/search?q=t: print"))
+
+    # The prefix is cached, but the longer term still goes to the database and
+    # keeps its description-only match.
+    extended = harness.count("GET", "/search?q=t: printer")
+    assert extended.count >= 1
+    assert _titles(extended) == ["Printer jam", "Tray fault"]
+
+    search_cache.clear()
+    fresh = harness.count("GET", "/search?q=t: printer")
+    assert fresh.response.json() == extended.response.json()
+
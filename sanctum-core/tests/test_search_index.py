@@ -0,0 +1,148 @@
+"""Tests for the unified global-search index (app/services/search_index.py).
+
+Covers:
+- Inserting and updating indexed entities writes their search_documents rows
+- Soft-deleting a project drops its document and its milestones' documents
+- Inactive products and deleted contacts leave the index
+- rebuild() repopulates an emptied index
+- GET /search runs one statement, honours the per-type limit, and scopes client users
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="search_index.db") as h:
+        yield h
+
+
+def _docs(harness, entity_type=None):
+    from app import models
+
+    SD = models.SearchDocument
+    stmt = select(SD.entity_type, SD.entity_id, SD.title, SD.account_id)
+    if entity_type:
+        stmt = stmt.where(SD.entity_type == entity_type)
+    with harness.session() as db:
+        return {(r.entity_type, r.entity_id): r for r in db.execute(stmt)}
+
+
+def _seed(harness, login="admin"):
+    from app import models
+
+    ids = {"other": uuid.uuid4(), "project": uuid.uuid4(), "milestone": uuid.uuid4()}
+    with harness.session() as db:
+        ids["acme"], admin_id = seed_account_admin(db, name="Acme Widgets", email="admin@search.test")
+        db.add(models.Account(id=ids["other"], name="Other Widgets", type="client", brand_affinity="ds",
+                              status="active"))
+        db.flush()
+        db.add(models.Project(id=ids["project"], account_id=ids["acme"], name="Widget Rollout", status="Active"))
+        db.flush()
+        db.add(models.Milestone(id=ids["milestone"], project_id=ids["project"], name="Widget Phase 1",
+                                status="pending", sequence=1))
+        db.add_all([
+            models.Ticket(account_id=ids["acme"], subject=f"Widget fault {i}", status="new", priority="normal")
+            for i in range(3)
+        ])
+        db.add(models.Ticket(account_id=ids["other"], subject="Widget fault elsewhere", status="new",
+                             priority="normal"))
+        client = models.User(id=uuid.uuid4(), email="client@search.test", full_name="Client", role="client",
+                             access_scope="restricted", is_active=True, user_type="human", account_id=ids["acme"])
+        db.add(client)
+        user_id = admin_id if login == "admin" else client.id
+    harness.login_as(user_id)
+    return ids
+
+
+class TestMaintenance:
+    def test_insert_and_update_write_documents(self, harness):
+        from app import models
+
+        ids = _seed(harness)
+        docs = _docs(harness)
+        assert docs[("client", str(ids["acme"]))].title == "Acme Widgets"
+        assert docs[("milestone", str(ids["milestone"]))].account_id == ids["acme"]
+        assert len(_docs(harness, "ticket")) == 4
+
+        with harness.session() as db:
+            db.get(models.Account, ids["acme"]).name = "Acme Gadgets"
+        assert _docs(harness)[("client", str(ids["acme"]))].title == "Acme Gadgets"
+
+    def test_project_soft_delete_drops_project_and_milestones(self, harness):
+        from app import models
+
+        ids = _seed(harness)
+        with harness.session() as db:
+            db.get(models.Project, ids["project"]).is_deleted = True
+        docs = _docs(harness)
+        assert ("project", str(ids["project"])) not in docs
+        assert ("milestone", str(ids["milestone"])) not in docs
+
+    def test_inactive_product_and_deleted_contact_leave_index(self, harness):
+        from app import models
+
+        ids = _seed(harness)
+        product_id, contact_id = uuid.uuid4(), uuid.uuid4()
+        with harness.session() as db:
+            db.add(models.Product(id=product_id, name="Widget Licence", type="service", unit_price=10))
+            db.add(models.Contact(id=contact_id, account_id=ids["acme"], first_name="Wendy", last_name="Widget"))
+        assert {("product", str(product_id)), ("contact", str(contact_id))} <= set(_docs(harness))
+
+        with harness.session() as db:
+            db.get(models.Product, product_id).is_active = False
+            db.delete(db.get(models.Contact, contact_id))
+        docs = _docs(harness)
+        assert ("product", str(product_id)) not in docs
+        assert ("contact", str(contact_id)) not in docs
+
+    def test_rebuild_repopulates(self, harness):
+        from sqlalchemy import delete
+
+        from app import models
+        from app.services import search_index
+
+        _seed(harness)
+        before = _docs(harness)
+        with harness.session() as db:
+            db.execute(delete(models.SearchDocument))
+        assert _docs(harness) == {}
+
+        with harness.session() as db:
+            counts = search_index.rebuild(db)
+        assert counts["ticket"] == 4 and counts["milestone"] == 1
+        assert set(_docs(harness)) == set(before)
+
+
+class TestSearchEndpoint:
+    def test_single_statement_and_per_type_limit(self, harness):
+        _seed(harness)
+
+        counter = harness.count("GET", "/search?q=widget&limit=2")
+        results = counter.response.json()
+        assert counter.count == 1, counter.report()
+        assert sum(r["type"] == "ticket" for r in results) == 2
+        assert {r["type"] for r in results} >= {"client", "project", "milestone"}
+
+    def test_exact_ticket_number(self, harness):
+        _seed(harness)
+        ticket_id = next(int(k[1]) for k in _docs(harness, "ticket"))
+
+        results = harness.client.get(f"/search?q=t: {ticket_id}").json()
+        assert results[0]["id"] == ticket_id and results[0]["score"] == 0.95
+
+    def test_client_user_sees_own_account_only(self, harness):
+        _seed(harness, login="client")
+
+        results = harness.client.get("/search?q=widget&limit=10").json()
+        tickets = [r for r in results if r["type"] == "ticket"]
+        assert len(tickets) == 3
+        assert all("elsewhere" not in r["title"] for r in tickets)
+        assert not any(r["type"] in ("contact", "wiki", "asset", "product") for r in results)
@@ -0,0 +1,74 @@
+"""Tests for SQL-side relevance ranking in global search.
+
+Covers:
+- Tier scores come from SQL: exact title 0.95, title contains 0.8, content 0.6,
+  exact wiki identifier 0.95 — on both the index and the per-entity path
+- Top-K per type keeps the best tier even when the limit is 1
+- The merged response is best-first across types; _merge_ranked is a k-way merge
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture(params=[True, False], ids=["index", "per_entity"])
+def harness(request, tmp_path, monkeypatch):
+    from app import models
+    from app.routers import search
+
+    monkeypatch.setattr(search, "SEARCH_INDEX_ENABLED", request.param)
+    with QueryBudgetHarness(tmp_path, name="search_ranking.db") as h:
+        with h.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Gizmo Works", email="admin@rank.test")
+            db.add_all([
+                # Inserted first so id/insertion order can't explain the ranking.
+                models.Ticket(account_id=account_id, subject="Printer jam", description="the gizmo broke",
+                              status="new", priority="normal"),
+                models.Ticket(account_id=account_id, subject="Gizmo", status="new", priority="normal"),
+                models.Article(id=uuid.uuid4(), title="Runbook", slug="runbook", identifier="DOC-007",
+                               category="ops", content="gizmo restart steps"),
+            ])
+        h.login_as(admin_id)
+        yield h
+
+
+def _scores(results):
+    return {(r["type"], r["title"].split(" ", 1)[1] if r["type"] == "ticket" else r["title"]): r["score"]
+            for r in results}
+
+
+def test_tiers_scored_in_sql(harness):
+    results = harness.client.get("/search?q=gizmo&limit=5").json()
+    scores = _scores(results)
+    assert scores[("ticket", "Gizmo")] == 0.95
+    assert scores[("client", "Gizmo Works")] == 0.8
+    assert scores[("ticket", "Printer jam")] == 0.6
+    assert scores[("wiki", "Runbook")] == 0.6
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+def test_exact_identifier_boost(harness):
+    results = harness.client.get("/search?q=doc 7").json()
+    assert _scores(results)[("wiki", "Runbook")] == 0.95
+
+
+def test_top_k_keeps_best_tier(harness):
+    results = harness.client.get("/search?q=t: gizmo&limit=1").json()
+    # Prefix mode doubles the limit; the exact-title ticket must lead.
+    assert results[0]["title"].endswith(" Gizmo") and results[0]["score"] == 0.95
+
+
+def test_merge_ranked_is_k_way():
+    from app.routers.search import _merge_ranked
+
+    rows = [
+        {"type": "ticket", "score": 0.95}, {"type": "ticket", "score": 0.6},
+        {"type": "client", "score": 0.8}, {"type": "client", "score": 0.3},
+        {"type": "wiki", "score": 0.9},
+    ]
+    assert [r["score"] for r in _merge_ranked(rows)] == [0.95, 0.9, 0.8, 0.6, 0.3]
@@ -0,0 +1,123 @@
+"""Tests for concurrent, deadline-bound global search (app/routers/search.py).
+
+Covers:
+- Per-entity fallback runs every entity search concurrently on its own session
+- An entity that misses SEARCH_TIMEOUT_SECONDS is dropped and named in X-Search-Partial
+- A timed-out index query reports every in-scope type as partial
+- The partial scope for a client user leaves out staff-only types
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def harness(tmp_path, monkeypatch):
+    from app.routers import search
+
+    monkeypatch.setattr(search, "SEARCH_INDEX_ENABLED", False)
+    # Generous, so real SQLite queries never race the clock; deadline tests
+    # shorten it and stub every search that is meant to finish.
+    monkeypatch.setattr(search, "SEARCH_TIMEOUT_SECONDS", 30)
+    with QueryBudgetHarness(tmp_path, name="search_timeouts.db") as h:
+        yield h
+
+
+def _login(harness, role="admin"):
+    from app import models
+
+    with harness.session() as db:
+        account_id, user_id = seed_account_admin(db, name="Acme Widgets", email="admin@search.test")
+        db.add(models.Ticket(account_id=account_id, subject="Widget fault", status="new", priority="normal"))
+        if role == "client":
+            user_id = uuid.uuid4()
+            db.add(models.User(id=user_id, email="client@search.test", full_name="Client", role="client",
+                               access_scope="global", is_active=True, user_type="human", account_id=account_id))
+    harness.login_as(user_id)
+
+
+def _replace(monkeypatch, **fakes):
+    from app.routers import search
+
+    monkeypatch.setattr(search, "_ENTITY_SEARCHES", tuple(
+        (entity_type, fakes.get(entity_type, fn), client_visible)
+        for entity_type, fn, client_visible in search._ENTITY_SEARCHES
+    ))
+
+
+async def _never(db, *args):
+    await asyncio.Event().wait()
+
+
+def _short_deadline(monkeypatch):
+    from app.routers import search
+
+    monkeypatch.setattr(search, "SEARCH_TIMEOUT_SECONDS", 0.2)
+
+
+def test_fallback_finds_results_without_partial_flag(harness):
+    _login(harness)
+    response = harness.client.get("/search?q=widget")
+    assert {r["type"] for r in response.json()} >= {"client", "ticket"}
+    assert "X-Search-Partial" not in response.headers
+
+
+def test_entity_searches_run_concurrently(harness, monkeypatch):
+    from app.routers import search
+
+    _login(harness)
+    expected = len(search._ENTITY_SEARCHES)
+    started, sessions = [], set()
+    all_started = asyncio.Event()
+
+    async def barrier(db, *args):
+        # Only returns once every search is in flight; sequential execution would time out.
+        started.append(1)
+        sessions.add(id(db))
+        if len(started) == expected:
+            all_started.set()
+        await all_started.wait()
+        return []
+
+    _replace(monkeypatch, **{t: barrier for t, _, _ in search._ENTITY_SEARCHES})
+    response = harness.client.get("/search?q=widget")
+    assert response.status_code == 200
+    assert "X-Search-Partial" not in response.headers
+    assert len(sessions) == expected
+
+
+def test_slow_entity_degrades_to_partial(harness, monkeypatch):
+    from app.routers import search
+
+    _login(harness)
+
+    async def instant(db, *args):
+        return [{"id": 1, "type": "ticket", "title": "#1 Widget fault", "subtitle": "new",
+                 "link": "/tickets/1", "score": 0.8}]
+
+    fakes = {t: instant for t, _, _ in search._ENTITY_SEARCHES}
+    fakes["wiki"] = _never
+    _replace(monkeypatch, **fakes)
+    _short_deadline(monkeypatch)
+    response = harness.client.get("/search?q=widget")
+    assert response.headers["X-Search-Partial"] == "wiki"
+    assert any(r["type"] == "ticket" for r in response.json())
+
+
+def test_index_timeout_marks_scope_partial(harness, monkeypatch):
+    from app.routers import search
+
+    _login(harness, role="client")
+
+    monkeypatch.setattr(search, "SEARCH_INDEX_ENABLED", True)
+    monkeypatch.setattr(search, "_search_index", _never)
+    _short_deadline(monkeypatch)
+    response = harness.client.get("/search?q=widget")
+    assert response.status_code == 200 and response.json() == []
+    assert response.headers["X-Search-Partial"] == "client,ticket,project,milestone"
@@ -0,0 +1,102 @@
+"""Tests for POST /tickets/bulk.
+
+Covers:
+- Valid items apply in one commit; missing tickets (404) and failed gates (422)
+  are reported per item and skipped
+- Status transitions are recorded for every changed ticket
+- Each affected milestone (old and new, for re-milestoned tickets) and project
+  cascades exactly once
+- atomic=true rolls the whole batch back when any item fails
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="ticket_bulk.db") as harness:
+        project_id, m1, m2 = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        with harness.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Bulk Co", email="admin@bulk.test")
+            db.add(models.Project(id=project_id, account_id=account_id, name="Bulk", status="planning"))
+            db.add(models.Milestone(id=m1, project_id=project_id, name="M1", status="pending"))
+            db.add(models.Milestone(id=m2, project_id=project_id, name="M2", status="pending"))
+            db.flush()
+            tickets = [models.Ticket(account_id=account_id, subject=f"Bulk {i}", status="new",
+                                     priority="normal", ticket_type="support", milestone_id=m1)
+                       for i in range(4)]
+            db.add_all(tickets)
+            db.flush()
+            ids = [t.id for t in tickets]
+        harness.login_as(admin_id)
+        yield harness, {"ids": ids, "m1": m1, "m2": m2, "project_id": project_id}
+
+
+def test_partial_success_records_transitions_and_cascades_once(seeded, monkeypatch):
+    from app import models
+    from app.services import cascade
+
+    harness, data = seeded
+    t1, t2, t3, t4 = data["ids"]
+    computed = []
+    original = cascade.compute_milestone_status
+    monkeypatch.setattr(cascade, "compute_milestone_status",
+                        lambda milestone, db: computed.append(milestone.id) or original(milestone, db))
+
+    response = harness.client.post("/tickets/bulk", json={"items": [
+        {"id": t1, "status": "open"},
+        {"id": t2, "status": "open"},
+        {"id": t3, "milestone_id": str(data["m2"])},
+        {"id": 999999, "status": "open"},
+        {"id": t4, "status": "resolved"},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["applied"], body["failed"]) == (3, 2)
+    assert [(r["id"], r["ok"], r.get("status_code")) for r in body["results"]] == [
+        (t1, True, None), (t2, True, None), (t3, True, None), (999999, False, 404), (t4, False, 422),
+    ]
+    assert sorted(computed, key=str) == sorted([data["m1"], data["m2"]], key=str)
+
+    with harness.session() as db:
+        assert db.get(models.Ticket, t1).status == "open"
+        assert db.get(models.Ticket, t3).milestone_id == data["m2"]
+        assert db.get(models.Ticket, t4).status == "new"
+        assert db.get(models.Milestone, data["m1"]).status == "active"
+        assert db.get(models.Project, data["project_id"]).status == "active"
+        transitions = db.query(models.TicketStatusTransition).order_by(models.TicketStatusTransition.ticket_id).all()
+        # t3's milestone move is substantive, so it auto-transitions new -> open as PUT would
+        assert [(t.ticket_id, t.from_status, t.to_status) for t in transitions] == [
+            (t1, "new", "open"), (t2, "new", "open"), (t3, "new", "open"),
+        ]
+
+
+def test_atomic_rolls_back_everything(seeded):
+    from app import models
+
+    harness, data = seeded
+    t1, t2 = data["ids"][:2]
+    response = harness.client.post("/tickets/bulk", json={"atomic": True, "items": [
+        {"id": t1, "status": "open"},
+        {"id": t2, "status": "resolved"},
+    ]})
+    assert response.status_code == 422
+    assert response.json()["applied"] == 0
+
+    with harness.session() as db:
+        assert db.get(models.Ticket, t1).status == "new"
+        assert db.query(models.TicketStatusTransition).count() == 0
+        assert db.get(models.Milestone, data["m1"]).status == "pending"
+
+
+def test_empty_batch_is_rejected(seeded):
+    harness, _ = seeded
+    assert harness.client.post("/tickets/bulk", json={"items": []}).status_code == 422
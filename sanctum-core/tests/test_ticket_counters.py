@@ -0,0 +1,175 @@
+"""Tests for the denormalised ticket effort counters (app/services/ticket_counters.py).
+
+Covers:
+- Adding, editing, moving and deleting comments / time entries / materials keeps
+  comment_count, time_entry_count, material_count and total_minutes in step
+- Ticket.total_hours reads total_minutes without loading time entries
+- The list projection reads the counters from the ticket row
+- drift() reports counters changed behind the ORM's back; recount() and
+  scripts/ticket_counters.py --fix repair them
+- Counter writes and recount() leave tickets.updated_at alone
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from scripts import ticket_counters as cli
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+START = datetime(2026, 6, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="ticket_counters.db") as harness:
+        product_id = uuid.uuid4()
+        with harness.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Count Co", email="admin@count.test")
+            db.add(models.Product(id=product_id, name="Cable", type="hardware", unit_price=10))
+            db.flush()
+            tickets = [models.Ticket(account_id=account_id, subject=f"Counted {i}", status="open",
+                                     priority="normal", ticket_type="task") for i in range(2)]
+            db.add_all(tickets)
+            db.flush()
+            ids = [t.id for t in tickets]
+        harness.login_as(admin_id)
+        yield harness, {"ids": ids, "admin_id": admin_id, "product_id": product_id}
+
+
+def _counters(harness, ticket_id) -> dict:
+    from app import models
+    from app.services.ticket_counters import COUNTER_COLUMNS
+
+    with harness.session() as db:
+        ticket = db.get(models.Ticket, ticket_id)
+        return {name: getattr(ticket, name) for name in COUNTER_COLUMNS}
+
+
+def _entry(data, ticket_id, minutes):
+    from app import models
+
+    return models.TicketTimeEntry(id=uuid.uuid4(), ticket_id=ticket_id, user_id=data["admin_id"],
+                                  start_time=START, end_time=START + timedelta(minutes=minutes))
+
+
+def test_counters_follow_child_writes(seeded):
+    from app import models
+
+    harness, data = seeded
+    a, b = data["ids"]
+    entry = _entry(data, a, 90)
+    entry_id, comment_id, material_id = entry.id, uuid.uuid4(), uuid.uuid4()
+    with harness.session() as db:
+        db.add_all([
+            entry, _entry(data, a, 30),
+            models.Comment(id=comment_id, author_id=data["admin_id"], body="one", ticket_id=a),
+            models.TicketMaterial(id=material_id, ticket_id=a, product_id=data["product_id"], quantity=2),
+        ])
+    assert _counters(harness, a) == {"comment_count": 1, "time_entry_count": 2, "material_count": 1,
+                                     "total_minutes": 120}
+
+    # Editing a time entry moves total_minutes; moving it re-homes both counters
+    with harness.session() as db:
+        db.get(models.TicketTimeEntry, entry_id).end_time = START + timedelta(minutes=45)
+    assert _counters(harness, a)["total_minutes"] == 75
+    with harness.session() as db:
+        db.get(models.TicketTimeEntry, entry_id).ticket_id = b
+    assert _counters(harness, a)["total_minutes"] == 30
+    assert _counters(harness, b) == {"comment_count": 0, "time_entry_count": 1, "material_count": 0,
+                                     "total_minutes": 45}
+
+    with harness.session() as db:
+        db.delete(db.get(models.Comment, comment_id))
+        db.delete(db.get(models.TicketMaterial, material_id))
+        # A non-counted edit changes nothing
+        db.get(models.TicketTimeEntry, entry_id).description = "renamed"
+    assert _counters(harness, a) == {"comment_count": 0, "time_entry_count": 1, "material_count": 0,
+                                     "total_minutes": 30}
+    assert _counters(harness, b)["total_minutes"] == 45
+
+
+def test_counters_visible_in_session_and_total_hours(seeded):
+    from app import models
+
+    harness, data = seeded
+    ticket_id = data["ids"][0]
+    with harness.session() as db:
+        ticket = db.get(models.Ticket, ticket_id)
+        assert ticket.total_hours == 0
+        db.add(_entry(data, ticket_id, 90))
+        db.flush()
+        assert ticket.time_entry_count == 1
+        assert ticket.total_hours == 1.5
+        assert "time_entries" not in ticket.__dict__
+
+
+def test_list_reads_counters(seeded):
+    from app import models
+
+    harness, data = seeded
+    ticket_id = data["ids"][0]
+    with harness.session() as db:
+        db.add(_entry(data, ticket_id, 60))
+        db.add(models.Comment(id=uuid.uuid4(), author_id=data["admin_id"], body="c", ticket_id=ticket_id))
+
+    row = next(t for t in harness.client.get("/tickets").json() if t["id"] == ticket_id)
+    assert (row["comment_count"], row["time_entry_count"], row["total_hours"]) == (1, 1, 1.0)
+
+
+def test_drift_and_recount(seeded, monkeypatch, capsys):
+    from app.services import ticket_counters
+
+    harness, data = seeded
+    a, b = data["ids"]
+    with harness.session() as db:
+        db.add(_entry(data, a, 60))
+    with harness.session() as db:
+        db.execute(text("UPDATE tickets SET total_minutes = 5, comment_count = 3 WHERE id = :id"), {"id": a})
+
+    with harness.session() as db:
+        assert ticket_counters.drift(db) == [{"id": a, "comment_count": (3, 0), "total_minutes": (5, 60)}]
+
+    monkeypatch.setattr(cli, "SessionLocal", lambda: Session(harness.engine))
+    assert cli.main([]) == 1
+    assert cli.main(["--fix"]) == 0
+    assert "#" + str(a) in capsys.readouterr().out
+    assert cli.main([]) == 0
+    assert _counters(harness, a)["total_minutes"] == 60
+
+    with harness.session() as db:
+        assert ticket_counters.recount(db) == 2
+
+
+def test_counter_writes_keep_updated_at(seeded):
+    from app import models
+    from app.services import ticket_counters
+
+    harness, data = seeded
+    a, b = data["ids"]
+    stamp = "2026-01-01 00:00:00"
+
+    def updated_at(ticket_id):
+        with harness.session() as db:
+            return db.execute(text("SELECT updated_at FROM tickets WHERE id = :id"), {"id": ticket_id}).scalar()
+
+    with harness.session() as db:
+        db.execute(text("UPDATE tickets SET updated_at = :stamp"), {"stamp": stamp})
+    before = updated_at(a)
+
+    with harness.session() as db:
+        db.add(_entry(data, a, 30))
+        db.add(models.Comment(id=uuid.uuid4(), author_id=data["admin_id"], body="c", ticket_id=a))
+    assert _counters(harness, a)["total_minutes"] == 30
+    assert updated_at(a) == before
+
+    with harness.session() as db:
+        assert ticket_counters.recount(db) == 2
+    assert (updated_at(a), updated_at(b)) == (before, before)
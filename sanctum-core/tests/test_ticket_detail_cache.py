@@ -0,0 +1,170 @@
+"""Tests for the ticket detail response cache (app/services/ticket_cache.py).
+
+Covers:
+- A repeat GET /tickets/{id} is served from the cache without touching the database
+- A cached ETag still answers If-None-Match with 304
+- Comments, PUT updates, relation links and artefact links invalidate the affected tickets
+- Writes to a related ticket or a displayed entity (account) invalidate too
+- Expand / resolve_embeds variants are cached separately
+- A pluggable backend receives the entries; hit / miss metrics are recorded
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="ticket_cache.db") as harness:
+        with harness.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Cache Co", email="admin@cache.test")
+            tickets = [models.Ticket(account_id=account_id, subject=f"Cached {i}", status="open",
+                                     priority="normal", ticket_type="task") for i in range(2)]
+            db.add_all(tickets)
+            db.flush()
+            ids = [t.id for t in tickets]
+        harness.login_as(admin_id)
+        yield harness, {"ids": ids, "admin_id": admin_id, "account_id": account_id}
+
+
+def _warm(harness, ticket_id, **params):
+    harness.client.get(f"/tickets/{ticket_id}", params=params)
+    return harness.count("GET", f"/tickets/{ticket_id}", params=params)
+
+
+def test_repeat_get_is_served_from_cache(seeded):
+    harness, data = seeded
+    first = harness.count("GET", f"/tickets/{data['ids'][0]}")
+    again = harness.count("GET", f"/tickets/{data['ids'][0]}")
+
+    assert again.response.json() == first.response.json()
+    assert again.response.headers["ETag"] == first.response.headers["ETag"]
+    assert again.count < first.count, again.report()
+
+    revalidate = harness.count("GET", f"/tickets/{data['ids'][0]}", expected_status=304,
+                               headers={"If-None-Match": first.response.headers["ETag"]})
+    assert revalidate.response.content == b""
+
+
+def test_comment_and_update_invalidate(seeded):
+    from app import models
+
+    harness, data = seeded
+    ticket_id = data["ids"][0]
+    _warm(harness, ticket_id)
+
+    with harness.session() as db:
+        db.add(models.Comment(id=uuid.uuid4(), author_id=data["admin_id"], body="fresh",
+                              ticket_id=ticket_id))
+    assert harness.client.get(f"/tickets/{ticket_id}").json()["comment_count"] == 1
+
+    harness.client.put(f"/tickets/{ticket_id}", json={"subject": "Renamed"})
+    assert harness.client.get(f"/tickets/{ticket_id}").json()["subject"] == "Renamed"
+
+
+def test_relations_invalidate_both_sides(seeded):
+    harness, data = seeded
+    a, b = data["ids"]
+    _warm(harness, a)
+    _warm(harness, b)
+
+    harness.client.post(f"/tickets/{a}/relations", json={"related_id": b})
+    assert len(harness.client.get(f"/tickets/{a}").json()["related_tickets"]) == 1
+    assert len(harness.client.get(f"/tickets/{b}").json()["related_tickets"]) == 1
+
+    # A related ticket's subject shows in the other ticket's detail
+    harness.client.put(f"/tickets/{b}", json={"subject": "Other side"})
+    assert harness.client.get(f"/tickets/{a}").json()["related_tickets"][0]["subject"] == "Other side"
+
+    harness.client.delete(f"/tickets/{a}/relations/{b}")
+    assert harness.client.get(f"/tickets/{b}").json()["related_tickets"] == []
+
+
+def test_artefact_link_and_account_rename_invalidate(seeded):
+    from app import models
+
+    harness, data = seeded
+    ticket_id = data["ids"][0]
+    _warm(harness, ticket_id)
+
+    with harness.session() as db:
+        artefact = models.Artefact(id=uuid.uuid4(), name="Runbook", artefact_type="url")
+        db.add(artefact)
+        db.flush()
+        db.add(models.ArtefactLink(id=uuid.uuid4(), artefact_id=artefact.id,
+                                   linked_entity_type="ticket", linked_entity_id=str(ticket_id)))
+    assert harness.client.get(f"/tickets/{ticket_id}").json()["artefact_count"] == 1
+
+    with harness.session() as db:
+        db.get(models.Account, data["account_id"]).name = "Renamed Co"
+    assert harness.client.get(f"/tickets/{ticket_id}").json()["account_name"] == "Renamed Co"
+
+
+def test_variants_are_cached_separately(seeded):
+    harness, data = seeded
+    ticket_id = data["ids"][0]
+    full = harness.client.get(f"/tickets/{ticket_id}")
+    slim = harness.client.get(f"/tickets/{ticket_id}", params={"expand": "none"})
+    resolved = harness.client.get(f"/tickets/{ticket_id}", params={"resolve_embeds": "true"})
+
+    assert "ETag" not in resolved.headers
+    assert slim.headers["ETag"] != full.headers["ETag"]
+    assert harness.client.get(f"/tickets/{ticket_id}").json() == full.json()
+    assert harness.client.get(f"/tickets/{ticket_id}", params={"expand": "none"}).json() == slim.json()
+
+
+class DictBackend:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_pluggable_backend_and_metrics(seeded):
+    from app.services import ticket_cache
+
+    harness, data = seeded
+    backend = DictBackend()
+    previous = ticket_cache.set_backend(backend)
+    hits = ticket_cache.ticket_cache_lookups_total.value(outcome="hit")
+    try:
+        _warm(harness, data["ids"][0])
+        assert any(key.startswith("tickets.detail:") and key.endswith("|0|human") for key in backend.data)
+        assert ticket_cache.ticket_cache_lookups_total.value(outcome="hit") == hits + 1
+
+        ticket_cache.invalidate(data["ids"][0])
+        miss = harness.count("GET", f"/tickets/{data['ids'][0]}")
+        assert miss.count > 0
+    finally:
+        ticket_cache.set_backend(previous)
+
+
+def test_backend_errors_fall_through(seeded):
+    from app.services import ticket_cache
+
+    class Broken:
+        def get(self, *args):
+            raise ConnectionError("down")
+
+        set = delete = get
+
+    harness, data = seeded
+    previous = ticket_cache.set_backend(Broken())
+    try:
+        assert harness.client.get(f"/tickets/{data['ids'][0]}").status_code == 200
+    finally:
+        ticket_cache.set_backend(previous)
@@ -0,0 +1,84 @@
+"""Tests for expand-aware loading on GET /tickets/{id} (ticket_query.ticket_detail_options).
+
+Covers:
+- expand=none returns the same counts and total_hours as expand=all
+- expand=comments loads only comments; other collections stay counted
+- expand=none statement count does not grow with the number of comments / time entries
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+START = datetime(2026, 5, 4, 9, 0, tzinfo=timezone.utc)
+COUNT_FIELDS = ("comment_count", "time_entry_count", "material_count", "transition_count",
+                "article_count", "total_hours")
+
+
+def _seed(harness, children: int) -> int:
+    from app import models
+
+    product_id = uuid.uuid4()
+    with harness.session() as db:
+        account_id, admin_id = seed_account_admin(db, name="Expand Co", email="admin@expand.test")
+        db.add(models.Product(id=product_id, name="Labour", type="service", unit_price=100))
+        db.flush()
+        ticket = models.Ticket(account_id=account_id, subject="Expand me", status="new",
+                               priority="normal", ticket_type="task")
+        db.add(ticket)
+        db.flush()
+        for i in range(children):
+            db.add(models.Comment(id=uuid.uuid4(), author_id=admin_id, body=f"c{i}", ticket_id=ticket.id))
+            db.add(models.TicketTimeEntry(id=uuid.uuid4(), ticket_id=ticket.id, user_id=admin_id,
+                                          product_id=product_id, start_time=START,
+                                          end_time=START + timedelta(minutes=30)))
+            db.add(models.TicketMaterial(id=uuid.uuid4(), ticket_id=ticket.id, product_id=product_id))
+            db.add(models.TicketStatusTransition(id=uuid.uuid4(), ticket_id=ticket.id, to_status="new"))
+        ticket_id = ticket.id
+    harness.login_as(admin_id)
+    return ticket_id
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="ticket_detail_expand.db") as h:
+        yield h
+
+
+def test_lean_counts_match_full(harness):
+    ticket_id = _seed(harness, children=3)
+
+    full = harness.client.get(f"/tickets/{ticket_id}", params={"expand": "all"}).json()
+    lean = harness.client.get(f"/tickets/{ticket_id}", params={"expand": "none"}).json()
+
+    assert len(full["comments"]) == 3 and "comments" not in lean
+    assert {f: lean[f] for f in COUNT_FIELDS} == {f: full[f] for f in COUNT_FIELDS}
+    assert lean["total_hours"] == 1.5
+
+
+def test_partial_expand(harness):
+    ticket_id = _seed(harness, children=2)
+
+    body = harness.client.get(f"/tickets/{ticket_id}", params={"expand": "comments"}).json()
+
+    assert [c["author_name"] for c in body["comments"]] == ["Admin", "Admin"]
+    assert "time_entries" not in body
+    assert (body["comment_count"], body["time_entry_count"], body["total_hours"]) == (2, 2, 1.0)
+
+
+def test_lean_query_count_independent_of_children(tmp_path):
+    counts = []
+    for children in (1, 6):
+        with QueryBudgetHarness(tmp_path, name=f"detail_expand_{children}.db") as harness:
+            ticket_id = _seed(harness, children)
+            path = f"/tickets/{ticket_id}?expand=none"
+            harness.client.get(path)  # warm auth / config caches
+            counter = harness.count("GET", path)
+            assert counter.response.status_code == 200
+            counts.append(counter.count)
+    assert counts[0] == counts[1], counts
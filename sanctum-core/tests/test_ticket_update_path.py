@@ -0,0 +1,88 @@
+"""Tests for the PUT /tickets/{id} write path.
+
+Covers:
+- ?return=minimal returns id/status/updated_at only; the default still returns the full ticket
+- A minimal update's statement count does not grow with the ticket's comments / time entries
+- Billable-item gate uses EXISTS checks: no items -> 422, a material alone is enough
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+START = datetime(2026, 6, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _seed(harness, children: int = 0) -> tuple[int, uuid.UUID]:
+    from app import models
+
+    product_id = uuid.uuid4()
+    with harness.session() as db:
+        account_id, admin_id = seed_account_admin(db, name="Write Co", email="admin@write.test")
+        db.add(models.Product(id=product_id, name="Cable", type="hardware", unit_price=10))
+        db.flush()
+        ticket = models.Ticket(account_id=account_id, subject="Write me", status="open",
+                               priority="normal", ticket_type="task")
+        db.add(ticket)
+        db.flush()
+        for i in range(children):
+            db.add(models.Comment(id=uuid.uuid4(), author_id=admin_id, body=f"c{i}", ticket_id=ticket.id))
+            db.add(models.TicketTimeEntry(id=uuid.uuid4(), ticket_id=ticket.id, user_id=admin_id,
+                                          product_id=product_id, start_time=START,
+                                          end_time=START + timedelta(minutes=30)))
+        ticket_id = ticket.id
+    harness.login_as(admin_id)
+    return ticket_id, product_id
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="ticket_update.db") as h:
+        yield h
+
+
+def test_minimal_and_full_responses(harness):
+    ticket_id, _ = _seed(harness, children=2)
+    payload = {"subject": "Renamed", "skip_validation": True}
+
+    minimal = harness.client.put(f"/tickets/{ticket_id}", params={"return": "minimal"}, json=payload)
+    assert minimal.status_code == 200
+    assert set(minimal.json()) == {"id", "status", "previous_status", "updated_at"}
+
+    full = harness.client.put(f"/tickets/{ticket_id}", json=payload).json()
+    assert full["subject"] == "Renamed"
+    assert len(full["time_entries"]) == 2
+
+
+def test_minimal_update_query_count_independent_of_children(tmp_path):
+    counts = []
+    for children in (1, 6):
+        with QueryBudgetHarness(tmp_path, name=f"ticket_update_{children}.db") as harness:
+            ticket_id, _ = _seed(harness, children)
+            path = f"/tickets/{ticket_id}?return=minimal"
+            harness.client.put(path, json={"subject": "warm", "skip_validation": True})
+            counter = harness.count("PUT", path, json={"subject": "counted", "skip_validation": True})
+            counts.append(counter.count)
+    assert counts[0] == counts[1], counts
+
+
+def test_billable_gate_uses_exists(harness):
+    from app import models
+
+    ticket_id, product_id = _seed(harness)
+    resolve = {"status": "resolved", "skip_validation": True}
+
+    blocked = harness.client.put(f"/tickets/{ticket_id}", params={"return": "minimal"}, json=resolve)
+    assert blocked.status_code == 422
+    assert blocked.json()["detail"]["error_code"] == "billable_item_required"
+
+    with harness.session() as db:
+        db.add(models.TicketMaterial(id=uuid.uuid4(), ticket_id=ticket_id, product_id=product_id))
+    resolved = harness.client.put(f"/tickets/{ticket_id}", params={"return": "minimal"}, json=resolve)
+    assert resolved.status_code == 200
+    assert resolved.json()["status"] == "resolved"
@@ -185,7 +185,7 @@ class TestFilterOrdering:
 
         from app.routers import tickets
 
-        src = inspect.getsource(tickets.get_tickets)
+        src = inspect.getsource(tickets._ticket_filters)
         client_scope_idx = src.find(
             "current_user.account_id",
         )
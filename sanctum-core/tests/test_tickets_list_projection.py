@@ -0,0 +1,117 @@
+"""Tests for the GET /tickets list projection (services/ticket_query.ticket_list_query).
+
+Covers:
+- Rows carry joined names, per-ticket counts and total hours computed in SQL
+- total_hours matches Ticket.total_hours (whole minutes per entry)
+- description / resolution and the detail collections are not returned
+- project_id filter goes through the outer-joined milestone
+- Query count does not depend on how many comments / time entries a ticket has
+- Batch enrichment: one transitions lookup per distinct (status, type, previous_status)
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+START = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def _seed(db, *, children: int):
+    from app import models
+
+    project_id, milestone_id, product_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    account_id, admin_id = seed_account_admin(db, name="Projection Co", email="admin@projection.test")
+    db.add(models.Product(id=product_id, name="Labour", type="service", unit_price=100))
+    db.add(models.Project(id=project_id, account_id=account_id, name="Rollout"))
+    db.add(models.Milestone(id=milestone_id, project_id=project_id, name="Phase 1"))
+    db.flush()
+
+    planned = models.Ticket(account_id=account_id, subject="Planned", description="Long body",
+                            resolution="Done", status="new", priority="normal", ticket_type="task",
+                            milestone_id=milestone_id)
+    loose = models.Ticket(account_id=account_id, subject="Loose", status="new", priority="high")
+    db.add_all([planned, loose])
+    db.flush()
+
+    for i in range(children):
+        db.add(models.Comment(id=uuid.uuid4(), author_id=admin_id, body=f"c{i}", ticket_id=planned.id))
+        # 61s past the minute: truncated to whole minutes like duration_minutes
+        db.add(models.TicketTimeEntry(id=uuid.uuid4(), ticket_id=planned.id, user_id=admin_id,
+                                      product_id=product_id, start_time=START,
+                                      end_time=START + timedelta(minutes=45, seconds=61)))
+        db.add(models.TicketMaterial(id=uuid.uuid4(), ticket_id=planned.id, product_id=product_id))
+        db.add(models.TicketStatusTransition(id=uuid.uuid4(), ticket_id=planned.id, to_status="new"))
+    db.flush()
+    return admin_id, project_id, planned.id, loose.id
+
+
+@pytest.fixture
+def harness(tmp_path):
+    with QueryBudgetHarness(tmp_path, name="tickets_projection.db") as h:
+        yield h
+
+
+def test_row_shape(harness):
+    from app import models
+
+    with harness.session() as db:
+        admin_id, project_id, planned_id, loose_id = _seed(db, children=2)
+    harness.login_as(admin_id)
+
+    rows = {t["id"]: t for t in harness.client.get("/tickets").json()}
+    planned, loose = rows[planned_id], rows[loose_id]
+
+    assert planned["account_name"] == "Projection Co"
+    assert planned["milestone_name"] == "Phase 1"
+    assert planned["project_id"] == str(project_id)
+    assert planned["project_name"] == "Rollout"
+    assert (planned["comment_count"], planned["time_entry_count"], planned["material_count"],
+            planned["transition_count"], planned["article_count"]) == (2, 2, 2, 2, 0)
+    with harness.session() as db:
+        assert planned["total_hours"] == db.get(models.Ticket, planned_id).total_hours == 1.53
+
+    assert loose["milestone_name"] is None and loose["project_id"] is None
+    assert loose["total_hours"] == 0
+    for dropped in ("description", "resolution", "comments", "time_entries", "materials"):
+        assert dropped not in planned
+
+
+def test_project_filter(harness):
+    with harness.session() as db:
+        admin_id, project_id, planned_id, _ = _seed(db, children=1)
+    harness.login_as(admin_id)
+
+    response = harness.client.get("/tickets", params={"project_id": str(project_id)})
+    assert [t["id"] for t in response.json()] == [planned_id]
+
+
+def test_query_count_independent_of_children(tmp_path):
+    counts = []
+    for children in (1, 6):
+        with QueryBudgetHarness(tmp_path, name=f"projection_{children}.db") as harness:
+            with harness.session() as db:
+                admin_id = _seed(db, children=children)[0]
+            harness.login_as(admin_id)
+            harness.client.get("/tickets")  # warm auth / config caches
+            counter = harness.count("GET", "/tickets")
+            assert counter.response.status_code == 200
+            counts.append(counter.count)
+    assert counts[0] == counts[1], counts
+
+
+def test_transitions_resolved_once_per_state(monkeypatch):
+    from app.services import ticket_query
+
+    calls = []
+    monkeypatch.setattr(ticket_query, "get_available_transitions",
+                        lambda status, db, **kw: calls.append(status) or [f"after-{status}"])
+    states = [("new", "task", None), ("open", "task", "new"), ("new", "task", None)]
+
+    resolved = ticket_query.available_transitions_by_state(states, db=None)
+    assert sorted(calls) == ["new", "open"]
+    assert resolved[("open", "task", "new")] == ["after-open"]
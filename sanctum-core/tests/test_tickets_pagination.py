@@ -0,0 +1,88 @@
+"""Tests for keyset pagination and count modes on GET /tickets.
+
+Covers:
+- Following X-Next-Cursor walks every ticket exactly once, newest first
+- after_id is the plain form of the cursor; the last page has no cursor
+- count=none drops X-Total-Count and its query; count=estimate falls back to exact off Postgres
+- CORS exposes the pagination headers to cross-origin browser clients
+- Bad cursors and cursor+offset are 400s
+- encode_cursor / decode_cursor round-trip
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.helpers.query_budget import QueryBudgetHarness, seed_account_admin
+
+TICKETS = 7
+
+
+@pytest.fixture
+def harness(tmp_path):
+    from app import models
+
+    with QueryBudgetHarness(tmp_path, name="tickets_pagination.db") as h:
+        with h.session() as db:
+            account_id, admin_id = seed_account_admin(db, name="Paged Co", email="admin@paged.test")
+            db.add_all([models.Ticket(account_id=account_id, subject=f"Ticket {i}", status="new",
+                                      priority="normal") for i in range(TICKETS)])
+        h.login_as(admin_id)
+        yield h
+
+
+def test_cursor_walks_every_ticket_once(harness):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = harness.client.get("/tickets", params=params)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == str(TICKETS)
+        seen += [t["id"] for t in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == 3
+    assert seen == sorted(seen, reverse=True) and len(set(seen)) == TICKETS
+
+
+def test_after_id(harness):
+    first = harness.client.get("/tickets", params={"limit": 2}).json()
+    rest = harness.client.get("/tickets", params={"after_id": first[-1]["id"], "limit": 50})
+    assert [t["id"] for t in rest.json()] == list(range(first[-1]["id"] - 1, 0, -1))
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_count_modes(harness):
+    exact = harness.count("GET", "/tickets?limit=2")
+    skipped = harness.count("GET", "/tickets?limit=2&count=none")
+    assert "X-Total-Count" not in skipped.response.headers
+    assert skipped.count == exact.count - 1
+
+    estimate = harness.client.get("/tickets", params={"limit": 2, "count": "estimate"})
+    assert estimate.headers["X-Total-Count"] == str(TICKETS)
+    assert "X-Total-Count-Estimated" not in estimate.headers  # SQLite counts exactly
+
+    assert harness.client.get("/tickets", params={"count": "guess"}).status_code == 422
+
+
+def test_pagination_headers_exposed_to_browsers(harness):
+    response = harness.client.get("/tickets", params={"limit": 2}, headers={"Origin": "http://localhost:5173"})
+    exposed = {h.strip() for h in response.headers["Access-Control-Expose-Headers"].split(",")}
+    assert {"X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated"} <= exposed
+
+
+def test_invalid_requests(harness):
+    assert harness.client.get("/tickets", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert harness.client.get("/tickets", params={"after_id": 3, "offset": 2}).status_code == 400
+
+
+def test_cursor_round_trip():
+    from fastapi import HTTPException
+
+    from app.services.pagination import decode_cursor, encode_cursor
+
+    assert decode_cursor(encode_cursor(12345)) == 12345
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(-1))
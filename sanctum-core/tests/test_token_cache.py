@@ -0,0 +1,158 @@
+"""Unit tests for the verified API-token cache (app/auth.py, app/utils/ttl_cache.py).
+
+Covers:
+- TTLCache LRU eviction, TTL expiry and hit/miss counters
+- Per-entry TTL is capped at the cache TTL; maxsize=0 disables the cache
+- _verify_api_token skips bcrypt on a repeat presentation
+- A rotated token hash (same plaintext digest) is re-verified, not trusted
+- Cache entries never outlive the token's own expires_at
+- revoke_api_token / invalidate_api_token evict cached verifications
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_lru_eviction_and_stats(self):
+        from app.utils.ttl_cache import TTLCache
+
+        cache = TTLCache("test.lru", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "a" is now most recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.6667)
+
+    def test_ttl_expiry_and_per_entry_cap(self):
+        from app.utils.ttl_cache import TTLCache
+
+        clock = _Clock()
+        cache = TTLCache("test.ttl", maxsize=10, ttl=30, clock=clock)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2, ttl=999)  # capped at the cache TTL
+
+        clock.now += 10
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        clock.now += 25
+        assert cache.get("long") is None
+
+    def test_disabled_when_size_zero(self):
+        from app.utils.ttl_cache import TTLCache
+
+        cache = TTLCache("test.disabled", maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_registry_reports_named_caches(self):
+        from app.utils.ttl_cache import TTLCache, cache_stats
+
+        TTLCache("test.registry", maxsize=1, ttl=1)
+        assert "test.registry" in cache_stats()
+        assert "api_tokens.verified" in cache_stats()
+
+
+def _token(expires_at=None):
+    return SimpleNamespace(
+        id=uuid4(), user_id=uuid4(), token_hash="$2b$12$hash", expires_at=expires_at,
+    )
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    from app import auth
+
+    auth.verified_token_cache.clear()
+    auth.verified_token_cache.reset_stats()
+    verify = MagicMock(return_value=True)
+    monkeypatch.setattr(auth.pwd_context, "verify", verify)
+    yield auth, verify
+    auth.verified_token_cache.clear()
+
+
+class TestVerifiedTokenCache:
+    def test_repeat_verification_skips_bcrypt(self, token_cache):
+        auth, verify = token_cache
+        row = _token()
+
+        assert auth._verify_api_token("sntm_abc", row) is True
+        assert auth._verify_api_token("sntm_abc", row) is True
+        assert verify.call_count == 1
+        assert auth.verified_token_cache.stats()["hits"] == 1
+
+    def test_failed_verification_not_cached(self, token_cache):
+        auth, verify = token_cache
+        verify.return_value = False
+        row = _token()
+
+        assert auth._verify_api_token("sntm_bad", row) is False
+        assert auth._verify_api_token("sntm_bad", row) is False
+        assert verify.call_count == 2
+        assert len(auth.verified_token_cache) == 0
+
+    def test_changed_hash_forces_reverify(self, token_cache):
+        auth, verify = token_cache
+        row = _token()
+        auth._verify_api_token("sntm_abc", row)
+
+        row.token_hash = "$2b$12$rotated"
+        auth._verify_api_token("sntm_abc", row)
+        assert verify.call_count == 2
+
+    def test_expired_token_not_cached(self, token_cache):
+        auth, _ = token_cache
+        row = _token(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+
+        auth._verify_api_token("sntm_old", row)
+        assert len(auth.verified_token_cache) == 0
+
+    def test_invalidate_by_token_and_user(self, token_cache):
+        auth, verify = token_cache
+        first, second = _token(), _token()
+        auth._verify_api_token("sntm_one", first)
+        auth._verify_api_token("sntm_two", second)
+
+        assert auth.invalidate_api_token(token_id=first.id) == 1
+        assert auth.invalidate_api_token(user_id=second.user_id) == 1
+        assert auth.invalidate_api_token() == 0
+        assert len(auth.verified_token_cache) == 0
+
+    def test_revoke_endpoint_evicts_cache(self, token_cache):
+        auth, verify = token_cache
+        from app.routers.api_tokens import revoke_api_token
+
+        row = _token()
+        auth._verify_api_token("sntm_live", row)
+        owner = SimpleNamespace(id=row.user_id)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+            id=row.id, user_id=row.user_id, is_active=True, token_prefix="sntm_liv",
+        )
+
+        revoke_api_token(str(row.id), current_user=owner, db=db)
+
+        auth._verify_api_token("sntm_live", row)
+        assert verify.call_count == 2
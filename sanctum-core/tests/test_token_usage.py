@@ -0,0 +1,145 @@
+"""Unit tests for the ApiToken.last_used_at write-behind buffer (app/services/token_usage.py).
+
+Covers:
+- record() coalesces repeated stamps to the newest per token
+- flush() writes every pending token in one executemany UPDATE and clears
+- flush() never moves a stored last_used_at backwards
+- A failed flush keeps the batch pending for the next interval
+- PAT resolution records usage instead of committing
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tests.helpers.query_counter import QueryCounter
+
+T0 = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def token_db(tmp_path):
+    from app import models
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    models.Base.metadata.create_all(
+        eng, tables=[models.Account.__table__, models.User.__table__, models.ApiToken.__table__],
+    )
+    factory = sessionmaker(bind=eng)
+    with factory() as db:
+        user = models.User(id=uuid.uuid4(), email="u@example.com", role="admin",
+                           access_scope="global", is_active=True)
+        db.add(user)
+        tokens = [
+            models.ApiToken(id=uuid.uuid4(), user_id=user.id, name=f"t{i}", token_hash="x",
+                            token_prefix=f"sntm_{i:07d}", is_active=True)
+            for i in range(3)
+        ]
+        db.add_all(tokens)
+        db.commit()
+        ids = [t.id for t in tokens]
+    yield eng, factory, ids
+    eng.dispose()
+
+
+def _stamps(factory):
+    from app import models
+
+    with factory() as db:
+        return {t.id: t.last_used_at for t in db.query(models.ApiToken).all()}
+
+
+def _same_instant(a, b):
+    # SQLite drops tzinfo on round trip.
+    return a.replace(tzinfo=None) == b.replace(tzinfo=None)
+
+
+class TestTokenUsageBuffer:
+    def test_record_coalesces_to_newest(self):
+        from app.services.token_usage import TokenUsageBuffer
+
+        buf = TokenUsageBuffer(session_factory=MagicMock())
+        token_id = uuid.uuid4()
+        buf.record(token_id, T0 + timedelta(seconds=5))
+        buf.record(token_id, T0)
+        buf.record(token_id, T0 + timedelta(seconds=2))
+
+        assert buf.pending() == 1
+        assert buf._pending[token_id] == T0 + timedelta(seconds=5)
+
+    def test_flush_is_one_round_trip(self, token_db):
+        from app.services.token_usage import TokenUsageBuffer
+
+        eng, factory, ids = token_db
+        buf = TokenUsageBuffer(session_factory=factory)
+        for i, token_id in enumerate(ids):
+            for _ in range(10):
+                buf.record(token_id, T0 + timedelta(minutes=i))
+
+        counter = QueryCounter(eng)
+        with counter:
+            assert buf.flush() == 3
+        updates = [s for s in counter.statements if s.lstrip().upper().startswith("UPDATE")]
+        assert len(updates) == 1
+
+        stamps = _stamps(factory)
+        for i, token_id in enumerate(ids):
+            assert _same_instant(stamps[token_id], T0 + timedelta(minutes=i))
+        assert buf.pending() == 0
+        assert buf.flush() == 0
+
+    def test_flush_never_moves_stamp_backwards(self, token_db):
+        from app.services.token_usage import TokenUsageBuffer
+
+        _, factory, ids = token_db
+        buf = TokenUsageBuffer(session_factory=factory)
+        buf.record(ids[0], T0 + timedelta(hours=1))
+        buf.flush()
+        buf.record(ids[0], T0)
+        buf.flush()
+
+        assert _same_instant(_stamps(factory)[ids[0]], T0 + timedelta(hours=1))
+
+    def test_failed_flush_keeps_batch(self):
+        from app.services.token_usage import TokenUsageBuffer
+
+        db = MagicMock()
+        db.execute.side_effect = RuntimeError("db down")
+        buf = TokenUsageBuffer(session_factory=lambda: db)
+        buf.record("tok", T0)
+
+        assert buf.flush() == 0
+        assert buf.pending() == 1
+        assert buf.stats()["failures"] == 1
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
+
+
+class TestPatResolutionRecordsUsage:
+    @pytest.mark.asyncio
+    async def test_pat_does_not_commit(self, monkeypatch):
+        from app import auth
+        from app.services.token_usage import TokenUsageBuffer
+
+        buf = TokenUsageBuffer(session_factory=MagicMock())
+        monkeypatch.setattr(auth, "token_usage_buffer", buf)
+        monkeypatch.setattr(auth.pwd_context, "verify", lambda t, h: True)
+        auth.verified_token_cache.clear()
+
+        token_row = MagicMock()
+        token_row.expires_at = None
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = token_row
+
+        result = await auth._resolve_principal("sntm_usage000000", db)
+
+        assert result is token_row.user
+        db.commit.assert_not_called()
+        assert buf._pending.keys() == {token_row.id}
+        auth.verified_token_cache.clear()
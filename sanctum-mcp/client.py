@@ -4,13 +4,18 @@ Uses a shared httpx.AsyncClient with connection pooling to avoid
 per-request TCP/TLS overhead. Includes retry with backoff for
 transient errors (connection resets, 502/503/504).
 
+GETs are conditional: responses carrying an ETag are kept (per token, path
+and params) and re-requested with If-None-Match; a 304 replays the kept body.
+
 Authenticates to the core API using the SANCTUM_API_TOKEN env var.
 """
 
 import asyncio
+import copy
 import logging
 import os
 import time
+from collections import OrderedDict
 from contextvars import ContextVar
 
 import httpx
@@ -114,13 +119,38 @@ def _check_upstream(r: httpx.Response, method: str, path: str) -> None:
 # Stash last GET response headers so tools can read X-Total-Count etc.
 _last_headers: dict = {}
 
+# (token, path, params) -> (etag, headers, body) for conditional GETs, LRU-bounded
+_ETAG_CACHE_SIZE = _env_int("MCP_ETAG_CACHE_SIZE", 256)
+_etag_cache: OrderedDict[tuple, tuple[str, dict, dict | list]] = OrderedDict()
+
+
+def _etag_key(path: str, params: dict | None) -> tuple:
+    items = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+    return CURRENT_API_TOKEN.get(), path, items
+
 
 async def get(path: str, params: dict | None = None) -> dict | list:
     global _last_headers
-    r = await _request("GET", path, params=params)
+    key = _etag_key(path, params)
+    cached = _etag_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    r = await _request("GET", path, params=params, headers=headers)
+    if r.status_code == 304 and cached:
+        _etag_cache.move_to_end(key)
+        _last_headers = cached[1]
+        return copy.deepcopy(cached[2])
     _check_upstream(r, "GET", path)
     _last_headers = dict(r.headers)
-    return r.json()
+    body = r.json()
+    etag = r.headers.get("etag")
+    if etag:
+        _etag_cache[key] = (etag, _last_headers, copy.deepcopy(body))
+        _etag_cache.move_to_end(key)
+        while len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    elif cached:
+        del _etag_cache[key]
+    return body
 
 
 async def post(path: str, json: dict | None = None) -> dict:
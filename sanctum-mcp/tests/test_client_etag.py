@@ -0,0 +1,77 @@
+"""Tests for conditional GETs in client.py against a mocked Core upstream.
+
+Covers:
+- A response with an ETag is re-requested with If-None-Match; a 304 replays the cached body
+- Cached bodies are copies — callers mutating a result do not corrupt the cache
+- The cache is keyed by token and params, and bounded (LRU)
+"""
+
+import os
+import sys
+
+import httpx
+import pytest
+
+# Ensure sanctum-mcp root is on sys.path for bare imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import client  # noqa: E402
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Install a MockTransport that serves one versioned ticket and records If-None-Match."""
+    seen = []
+    state = {"etag": '"v1"', "body": {"id": 7, "subject": "First"}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == state["etag"]:
+            return httpx.Response(304, headers={"ETag": state["etag"]})
+        return httpx.Response(200, json=state["body"], headers={"ETag": state["etag"]})
+
+    monkeypatch.setattr(client, "_client", httpx.AsyncClient(
+        base_url="http://core.test", transport=httpx.MockTransport(handler),
+    ))
+    monkeypatch.setattr(client, "_etag_cache", client.OrderedDict())
+    return seen, state
+
+
+@pytest.mark.asyncio
+async def test_304_replays_cached_body(upstream):
+    seen, state = upstream
+
+    first = await client.get("/tickets/7")
+    first["subject"] = "mutated by caller"
+    again = await client.get("/tickets/7")
+
+    assert seen == [None, '"v1"']
+    assert again == {"id": 7, "subject": "First"}
+
+    state.update(etag='"v2"', body={"id": 7, "subject": "Second"})
+    assert (await client.get("/tickets/7"))["subject"] == "Second"
+
+
+@pytest.mark.asyncio
+async def test_cache_keyed_by_token_and_params(upstream):
+    seen, _ = upstream
+
+    await client.get("/tickets/7", params={"expand": "none"})
+    await client.get("/tickets/7", params={"expand": "all"})
+    token = client.CURRENT_API_TOKEN.set("other-agent")
+    try:
+        await client.get("/tickets/7", params={"expand": "none"})
+    finally:
+        client.CURRENT_API_TOKEN.reset(token)
+
+    assert seen == [None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded(upstream, monkeypatch):
+    monkeypatch.setattr(client, "_ETAG_CACHE_SIZE", 2)
+
+    for ticket_id in range(3):
+        await client.get(f"/tickets/{ticket_id}")
+
+    assert [key[1] for key in client._etag_cache] == ["/tickets/1", "/tickets/2"]
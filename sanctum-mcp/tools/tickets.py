@@ -55,20 +55,26 @@ async def ticket_list(
     milestone: str | None = None,
     status: str | None = None,
     limit: int = 50,
+    cursor: str | None = None,
 ) -> str:
-    """List tickets, optionally filtered by project, milestone, or status.
+    """List tickets, newest first, optionally filtered by project, milestone, or status.
 
     Args:
         project: Filter by project name (substring match).
         milestone: Filter by milestone name (substring match).
         status: Filter by status: new, recon, proposal, implementation, verification, review, documented, open, pending, resolved.
         limit: Max results to return (default 50).
+        cursor: next_cursor from a previous call, to fetch the following page. Paged calls skip the total count.
     """
     params: dict = {"limit": limit}
     if status:
         params["status"] = status
+    if cursor:
+        params["cursor"] = cursor
+        params["count"] = "none"
     result = await client.get("/tickets", params=params)
     total = client._last_headers.get("x-total-count")
+    next_cursor = client._last_headers.get("x-next-cursor")
     tickets = result if isinstance(result, list) else []
 
     # Client-side filtering for project/milestone name substring matches
@@ -94,7 +100,15 @@ async def ticket_list(
             "account_name": t.get("account_name"),
             "created_at": t.get("created_at"),
         })
-    result_obj = {"tickets": summary, "total": int(total) if total else len(summary)}
+    if total:
+        result_total = int(total)
+    elif cursor:
+        result_total = None  # paged calls ask for no count
+    else:
+        result_total = len(summary)
+    result_obj = {"tickets": summary, "total": result_total}
+    if next_cursor:
+        result_obj["next_cursor"] = next_cursor
     return json.dumps(result_obj, indent=2)
 
 
@@ -94,16 +94,34 @@ def api_request(base_url, token, method, path, body=None):
 
 
 def fetch_all_tickets(base_url, token):
-    """Fetch all tickets from GET /api/tickets."""
-    print("Fetching all tickets from API...")
-    tickets = api_request(base_url, token, "GET", "/tickets")
+    """Stream every resolved ticket from GET /api/tickets/export (NDJSON, one request)."""
+    print("Fetching resolved tickets from API...")
+    path = "/tickets/export?status=resolved&format=ndjson"
+    req = Request(f"{base_url}/api{path}", headers={"Authorization": f"Bearer {token}"})
+    try:
+        with urlopen(req) as resp:
+            tickets = [json.loads(line) for line in resp if line.strip()]
+    except HTTPError as e:
+        error_body = e.read().decode("utf-8", errors="replace")
+        print(f"  API error {e.code} on GET {path}: {error_body}", file=sys.stderr)
+        raise
     print(f"  Received {len(tickets)} tickets total.")
     return tickets
 
 
-def fetch_ticket(base_url, token, ticket_id):
-    """Fetch a single ticket for idempotency re-check."""
-    return api_request(base_url, token, "GET", f"/tickets/{ticket_id}")
+def fetch_ticket(base_url, token, ticket_id, expand=None):
+    """Fetch a single ticket (idempotency re-check, or ?expand= for its comments)."""
+    path = f"/tickets/{ticket_id}"
+    if expand:
+        path += f"?expand={expand}"
+    return api_request(base_url, token, "GET", path)
+
+
+def fetch_comments(base_url, token, ticket):
+    """Comments (with author_name) for one ticket; list rows only carry comment_count."""
+    if not ticket.get("comment_count"):
+        return []
+    return fetch_ticket(base_url, token, ticket["id"], expand="comments").get("comments") or []
 
 
 def create_time_entry(base_url, token, ticket_id, start_time, end_time, description):
@@ -192,7 +210,7 @@ def main():
     mode_label = "COMMIT" if is_commit else "DRY RUN"
     print(f"=== Backfill Time Entries [{mode_label}] ===\n")
 
-    # Fetch all tickets in one call
+    # Fetch all resolved tickets in one call; comments only for the candidates
     all_tickets = fetch_all_tickets(base_url, token)
     candidates = filter_backfill_candidates(all_tickets)
     print(f"  Found {len(candidates)} candidates for backfill.\n")
@@ -209,7 +227,7 @@ def main():
         project_id = t["project_id"]
         project_name = TARGET_PROJECTS.get(project_id, project_id)
 
-        comments = t.get("comments", [])
+        comments = fetch_comments(base_url, token, t)
         human_comments = count_human_comments(comments)
         ticket_type = t.get("ticket_type", "task")
         minutes = estimate_minutes(ticket_type, human_comments)